@@ -0,0 +1 @@
+"""Micro-benchmarks for IntelliDbgKit hot paths."""
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+from time import perf_counter
+from time import sleep
+from typing import Any
+
+from src.core.agent_dispatcher import AgentDispatcher
+from src.core.agent_dispatcher import DispatchMode
+from src.core.agent_dispatcher import is_agent_failure
+
+
+def _sleeping_agent(delay_s: float, claim: str) -> Any:
+    def handler(context: dict[str, Any]) -> dict[str, Any]:
+        _ = context
+        sleep(delay_s)
+        return {"claim": claim, "confidence": 0.7, "evidence_refs": ["trace.captured"]}
+
+    return handler
+
+
+def _async_agent(delay_s: float, claim: str) -> Any:
+    async def handler(context: dict[str, Any]) -> dict[str, Any]:
+        _ = context
+        await asyncio.sleep(delay_s)
+        return {"claim": claim, "confidence": 0.7, "evidence_refs": ["trace.captured"]}
+
+    return handler
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Serial vs concurrent agent fan-out with sleep-based fake agents")
+    parser.add_argument("--agents", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per fake agent")
+    parser.add_argument("--timeout", type=float, default=0.2, help="per-agent timeout for concurrent modes")
+    args = parser.parse_args(argv)
+
+    dispatcher = AgentDispatcher(max_workers=args.agents)
+    agent_ids = [f"agent-{index}" for index in range(args.agents)]
+    for index, agent_id in enumerate(agent_ids):
+        dispatcher.register(agent_id, _sleeping_agent(args.latency, f"claim-{index % 2}"))
+    dispatcher.register("agent-hung", _sleeping_agent(args.timeout * 3, "claim-hung"))
+    dispatcher.register("agent-async", _async_agent(args.latency, "claim-0"))
+
+    print("mode\tagents\tseconds\tfailures")
+    started = perf_counter()
+    results = dispatcher.dispatch(agent_ids, {"topic": "root-cause"}, mode=DispatchMode.SERIAL)
+    print(f"serial\t{len(results)}\t{perf_counter() - started:.3f}\t0")
+
+    panel = agent_ids + ["agent-hung", "agent-async"]
+    for mode in (DispatchMode.THREAD, DispatchMode.ASYNC):
+        started = perf_counter()
+        results = dispatcher.dispatch(panel, {"topic": "root-cause"}, mode=mode, agent_timeout_s=args.timeout)
+        failures = sum(1 for item in results if is_agent_failure(item))
+        print(f"{mode.value}+timeout\t{len(results)}\t{perf_counter() - started:.3f}\t{failures}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+from pathlib import Path
+import tempfile
+from time import perf_counter
+from typing import Any
+
+from src.core.async_event_bus import AsyncEventBus
+from src.core.event_writer import EventWriter
+
+
+def _percentile(samples: list[float], ratio: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(len(ordered) * ratio))
+    return ordered[index]
+
+
+async def _run(root: Path, collectors: int, events_per_collector: int, queue_size: int) -> tuple[float, list[float]]:
+    writer = EventWriter(root / "events.raw.jsonl", root / "event-seq.json", "run-bench")
+    latencies: list[float] = []
+
+    async def collector(tool: str) -> None:
+        for index in range(events_per_collector):
+            event: dict[str, Any] = {
+                "event_id": bus.next_event_id(),
+                "run_id": "run-bench",
+                "ts_ns": index,
+                "phase": "MONITOR",
+                "source": "target",
+                "tool": tool,
+                "target_id": "board-01",
+                "severity": "info",
+                "payload": {"seq": index},
+            }
+            started = perf_counter()
+            await bus.publish(event)
+            latencies.append(perf_counter() - started)
+            if index % 64 == 0:
+                await asyncio.sleep(0)
+
+    bus = AsyncEventBus(writer=writer, queue_size=queue_size)
+    started = perf_counter()
+    async with bus:
+        await asyncio.gather(*(collector(f"collector-{item}") for item in range(collectors)))
+    elapsed = perf_counter() - started
+    writer.close()
+    return elapsed, latencies
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="AsyncEventBus throughput and publish latency")
+    parser.add_argument("--collectors", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--events", type=int, default=5000, help="events per collector")
+    parser.add_argument("--queue-size", type=int, default=1024)
+    args = parser.parse_args(argv)
+
+    print("collectors\tevents\tevents_per_sec\tp50_publish_us\tp99_publish_us")
+    for collectors in args.collectors:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            elapsed, latencies = asyncio.run(_run(Path(tmp_dir), collectors, args.events, args.queue_size))
+        total = collectors * args.events
+        p50 = _percentile(latencies, 0.50) * 1_000_000
+        p99 = _percentile(latencies, 0.99) * 1_000_000
+        print(f"{collectors}\t{total}\t{total / elapsed:.0f}\t{p50:.1f}\t{p99:.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import argparse
+import random
+from time import perf_counter
+
+from src.core import consensus_engine
+from src.core.consensus_engine import ConsensusEngine
+from src.core.consensus_engine import ConsensusTopic
+
+
+def _topics(count: int, agents: int, claims: int, seed: int) -> list[ConsensusTopic]:
+    rng = random.Random(seed)
+    return [
+        ConsensusTopic(
+            topic=f"topic-{index}",
+            agent_results=[
+                {
+                    "agent_id": f"agent-{agent}",
+                    "claim": f"claim-{rng.randrange(claims)}",
+                    "confidence": rng.random(),
+                    "evidence_refs": ["trace.captured"],
+                }
+                for agent in range(agents)
+            ],
+            required_evidence=frozenset({"trace.captured"}),
+        )
+        for index in range(count)
+    ]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Consensus scoring: evaluate per topic vs evaluate_many")
+    parser.add_argument("--topics", type=int, default=500)
+    parser.add_argument("--agents", type=int, default=32)
+    parser.add_argument("--claims", type=int, default=6)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+    topics = _topics(args.topics, args.agents, args.claims, args.seed)
+    engine = ConsensusEngine()
+
+    started = perf_counter()
+    scalar = [
+        engine.evaluate("run-bench", item.topic, item.agent_results, set(item.required_evidence), item.min_quorum)
+        for item in topics
+    ]
+    scalar_s = perf_counter() - started
+
+    started = perf_counter()
+    batched = engine.evaluate_many("run-bench", topics)
+    batched_s = perf_counter() - started
+
+    identical = all(
+        (left["winning_claim"], left["weighted_score"], left["dissenting_claims"])
+        == (right["winning_claim"], right["weighted_score"], right["dissenting_claims"])
+        for left, right in zip(scalar, batched)
+    )
+    backend = "numpy" if consensus_engine.numpy is not None else "python"
+    print("mode\tbackend\ttopics\tagents\tms_total\tidentical")
+    print(f"evaluate\t-\t{args.topics}\t{args.agents}\t{scalar_s * 1000:.1f}\t-")
+    print(f"evaluate_many\t{backend}\t{args.topics}\t{args.agents}\t{batched_s * 1000:.1f}\t{identical}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
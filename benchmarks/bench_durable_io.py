@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import tempfile
+from time import perf_counter
+from typing import Any
+
+from src.core.durable_io import AtomicBatch
+from src.core.durable_io import Durability
+from src.core.durable_io import atomic_write_json
+
+
+def _run_payload(index: int) -> dict[str, Any]:
+    return {
+        "run_id": "run-bench",
+        "project_name": "IntelliDbgKit",
+        "target_id": "board-01",
+        "state": "MONITOR",
+        "trigger": "manual",
+        "core_state": {"phase": "MONITOR", "transition_count": index},
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Cost of each durability level for small index files")
+    parser.add_argument("--writes", type=int, default=500)
+    parser.add_argument("--batch-files", type=int, default=3, help="files per AtomicBatch commit")
+    args = parser.parse_args(argv)
+
+    print("mode\twrites\tus_per_write")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        root = Path(tmp_dir)
+        for durability in Durability:
+            target = root / durability.value / "run.json"
+            started = perf_counter()
+            for index in range(args.writes):
+                atomic_write_json(target, _run_payload(index), durability)
+            elapsed = perf_counter() - started
+            print(f"single/{durability.value}\t{args.writes}\t{elapsed / args.writes * 1_000_000:.1f}")
+
+        for durability in (Durability.FSYNC, Durability.FSYNC_DIR):
+            target_dir = root / f"batch-{durability.value}"
+            commits = max(1, args.writes // args.batch_files)
+            started = perf_counter()
+            for index in range(commits):
+                with AtomicBatch(durability) as batch:
+                    for file_index in range(args.batch_files):
+                        batch.stage_json(target_dir / f"index-{file_index}.json", _run_payload(index))
+            elapsed = perf_counter() - started
+            writes = commits * args.batch_files
+            print(f"batch{args.batch_files}/{durability.value}\t{writes}\t{elapsed / writes * 1_000_000:.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
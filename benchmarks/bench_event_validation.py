@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+from time import perf_counter
+from typing import Any
+
+from src.core.event_bus import EventBus
+from src.core.event_bus import EventValidationError
+
+
+def _event(index: int) -> dict[str, Any]:
+    return {
+        "event_id": f"run-bench-e{index}",
+        "run_id": "run-bench",
+        "ts_ns": index,
+        "phase": "MONITOR",
+        "source": "target",
+        "tool": "tracezone",
+        "target_id": "board-01",
+        "address": "0x8000abcd",
+        "severity": "info",
+        "payload": {"func": "wl_cfg80211_scan"},
+        "compression_refs": [{"tier": "semantic", "token": "[tc_ndev_ev]", "lexicon_id": "lex-1"}],
+        "links": [{"type": "workflow", "target": "trace-capture-flow"}],
+    }
+
+
+def _legacy_fields() -> tuple[set[str], set[str]]:
+    schema_path = Path(__file__).resolve().parents[1] / "specs" / "001-debug-loop" / "contracts" / "event-schema.json"
+    schema = json.loads(schema_path.read_text(encoding="utf-8"))
+    return set(schema["required"]), set(schema["properties"].keys())
+
+
+def _legacy_validate(event: dict[str, Any], required_fields: set[str], allowed_fields: set[str]) -> None:
+    """Pre-compilation behaviour: key-name checks only."""
+    if required_fields - set(event.keys()):
+        raise EventValidationError("missing fields")
+    if set(event.keys()) - allowed_fields:
+        raise EventValidationError("unknown fields")
+
+
+def _per_event_us(elapsed: float, count: int) -> float:
+    return elapsed / count * 1_000_000
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Per-event validation cost before/after schema compilation")
+    parser.add_argument("--events", type=int, default=20000)
+    args = parser.parse_args(argv)
+    events = [_event(index) for index in range(args.events)]
+
+    rows: list[tuple[str, float]] = []
+
+    started = perf_counter()
+    for event in events:
+        _legacy_validate(event, *_legacy_fields())
+    rows.append(("legacy: new bus per event (schema read)", perf_counter() - started))
+
+    required_fields, allowed_fields = _legacy_fields()
+    started = perf_counter()
+    for event in events:
+        _legacy_validate(event, required_fields, allowed_fields)
+    rows.append(("legacy: reused bus (key names only)", perf_counter() - started))
+
+    started = perf_counter()
+    for event in events:
+        EventBus().validate(event)
+    rows.append(("compiled: new bus per event", perf_counter() - started))
+
+    bus = EventBus()
+    started = perf_counter()
+    for event in events:
+        bus.validate(event)
+    rows.append(("compiled: validate (full schema)", perf_counter() - started))
+
+    started = perf_counter()
+    bus.validate_batch(events)
+    rows.append(("compiled: validate_batch (full schema)", perf_counter() - started))
+
+    print("mode\tevents\tus_per_event")
+    for mode, elapsed in rows:
+        print(f"{mode}\t{args.events}\t{_per_event_us(elapsed, args.events):.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
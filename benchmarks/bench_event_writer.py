@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import tempfile
+from time import perf_counter
+from typing import Any
+
+from src.core.event_writer import EventWriter
+from src.core.event_writer import FsyncPolicy
+
+
+def _event(index: int) -> dict[str, Any]:
+    return {
+        "event_id": f"run-bench-e{index}",
+        "run_id": "run-bench",
+        "ts_ns": index,
+        "phase": "MONITOR",
+        "source": "target",
+        "tool": "tracezone",
+        "target_id": "board-01",
+        "severity": "info",
+        "payload": {"func": "wl_cfg80211_scan", "seq": index},
+    }
+
+
+def _bench_open_per_event(path: Path, count: int) -> float:
+    started = perf_counter()
+    for index in range(count):
+        with path.open("a", encoding="utf-8") as file:
+            file.write(json.dumps(_event(index), ensure_ascii=False))
+            file.write("\n")
+    return perf_counter() - started
+
+
+def _bench_writer(root: Path, policy: FsyncPolicy, count: int, batch: int) -> float:
+    started = perf_counter()
+    with EventWriter(
+        events_path=root / "events.raw.jsonl",
+        seq_path=root / "event-seq.json",
+        run_id="run-bench",
+        fsync_policy=policy,
+        max_batch_events=batch,
+    ) as writer:
+        for index in range(count):
+            writer.write(_event(index))
+    return perf_counter() - started
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="EventWriter throughput per fsync policy")
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--batch", type=int, default=256)
+    parser.add_argument("--fsync-events", type=int, default=500, help="event count for the per-event fsync policy")
+    args = parser.parse_args(argv)
+
+    rows: list[tuple[str, int, float]] = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        legacy_dir = Path(tmp_dir) / "legacy"
+        legacy_dir.mkdir()
+        rows.append(("open-per-event", args.events, _bench_open_per_event(legacy_dir / "events.raw.jsonl", args.events)))
+        for policy in FsyncPolicy:
+            count = args.fsync_events if policy == FsyncPolicy.EVENT else args.events
+            policy_dir = Path(tmp_dir) / policy.value
+            policy_dir.mkdir()
+            rows.append((f"writer/{policy.value}", count, _bench_writer(policy_dir, policy, count, args.batch)))
+
+    print("mode\tevents\tseconds\tevents_per_sec")
+    for mode, count, elapsed in rows:
+        print(f"{mode}\t{count}\t{elapsed:.4f}\t{count / elapsed:.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import argparse
+import random
+from time import perf_counter
+
+from src.memory.lexicon import CompressionLexicon
+from src.memory.lexicon import CompressionLexiconEntry
+
+_WORDS = ("trace", "symbol", "uart", "gdb", "captured", "mapped", "timeout", "reset", "panic", "retry", "driver")
+
+
+def _entries(count: int, rng: random.Random) -> list[CompressionLexiconEntry]:
+    entries: list[CompressionLexiconEntry] = []
+    seen: set[str] = set()
+    while len(entries) < count:
+        pattern = " ".join(rng.choice(_WORDS) for _ in range(rng.randint(2, 4))) + f" #{len(entries)}"
+        if pattern in seen:
+            continue
+        seen.add(pattern)
+        entries.append(
+            CompressionLexiconEntry(
+                lexicon_id=f"lex-{len(entries):05d}",
+                token=f"[t{len(entries)}]",
+                original_pattern=pattern,
+                reverse_rule="token-replace",
+                tier="semantic",
+                created_at="2026-01-01T00:00:00+00:00",
+            )
+        )
+    return entries
+
+
+def _sequential_encode(entries: list[CompressionLexiconEntry], text: str) -> str:
+    for entry in entries:
+        text = text.replace(entry.original_pattern, entry.token)
+    return text
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Lexicon encode cost: per-entry str.replace vs compiled trie regex")
+    parser.add_argument("--entries", type=int, default=10000)
+    parser.add_argument("--lines", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+    rng = random.Random(args.seed)
+    entries = _entries(args.entries, rng)
+    lines = [
+        " ".join(rng.choice(entries).original_pattern for _ in range(3)) + " x " + str(index)
+        for index in range(args.lines)
+    ]
+
+    lexicon = CompressionLexicon(entries=entries)
+    started = perf_counter()
+    lexicon.encode_line("")
+    compile_ms = (perf_counter() - started) * 1000
+
+    started = perf_counter()
+    for line in lines:
+        _sequential_encode(entries, line)
+    sequential_s = perf_counter() - started
+
+    started = perf_counter()
+    compiled = [lexicon.encode_line(line) for line in lines]
+    compiled_s = perf_counter() - started
+
+    started = perf_counter()
+    decoded = [lexicon.decode_line(line) for line in compiled]
+    decode_s = perf_counter() - started
+
+    print("mode\tentries\tlines\tus_per_line\tcompile_ms\troundtrip_ok")
+    print(f"sequential-replace\t{args.entries}\t{args.lines}\t{sequential_s / args.lines * 1_000_000:.1f}\t-\t-")
+    print(
+        f"compiled-encode\t{args.entries}\t{args.lines}\t{compiled_s / args.lines * 1_000_000:.1f}"
+        f"\t{compile_ms:.1f}\t{decoded == lines}"
+    )
+    print(f"compiled-decode\t{args.entries}\t{args.lines}\t{decode_s / args.lines * 1_000_000:.1f}\t-\t-")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import random
+import tempfile
+from time import perf_counter
+
+from src.memory.long_memory_index import LongMemoryIndex
+from src.memory.memory_store import MemoryRecord
+
+_WORDS = (
+    "uart", "timeout", "watchdog", "reset", "dma", "overrun", "spi", "flash", "erase", "panic",
+    "null", "pointer", "stack", "overflow", "irq", "storm", "clock", "gating", "brownout", "deadlock",
+)
+_REFS = ("trace.captured", "symbol.mapped", "gdb.core", "perf.sampled", "uart.log")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Long-memory index: append, load, query and near-duplicate cost")
+    parser.add_argument("--runs", type=int, default=2000)
+    parser.add_argument("--per-run", type=int, default=3)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args(argv)
+    rng = random.Random(args.seed)
+    records = [
+        MemoryRecord(
+            memory_id=f"mem-long-{run:05d}-{item}",
+            run_id=f"run-{run:05d}",
+            memory_tier="long",
+            content=" ".join(rng.choice(_WORDS) for _ in range(8)),
+            evidence_refs=tuple(rng.sample(_REFS, 2)),
+            created_at=f"2026-01-01T00:00:{run % 60:02d}+00:00",
+        )
+        for run in range(args.runs)
+        for item in range(args.per_run)
+    ]
+
+    print("stage\tdocuments\tms")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        index = LongMemoryIndex(Path(tmp_dir) / "long-memory")
+        started = perf_counter()
+        for record in records[:200]:
+            index.add(record)
+        append_ms = (perf_counter() - started) * 1000 / 200
+        index.add_many(records[200:])
+        print(f"append-per-promotion\t{len(records)}\t{append_ms:.3f}")
+
+        started = perf_counter()
+        index.compact()
+        print(f"replay-log+compact\t{len(records)}\t{(perf_counter() - started) * 1000:.1f}")
+
+        cold = LongMemoryIndex(Path(tmp_dir) / "long-memory")
+        started = perf_counter()
+        cold.search("uart")
+        print(f"cold-load-snapshot\t{len(records)}\t{(perf_counter() - started) * 1000:.1f}")
+
+        queries = [(" ".join(rng.sample(_WORDS, 2)), [rng.choice(_REFS)]) for _ in range(args.queries)]
+        started = perf_counter()
+        for text, refs in queries:
+            cold.search(text, evidence_refs=refs)
+        print(f"warm-query\t{len(records)}\t{(perf_counter() - started) * 1000 / args.queries:.3f}")
+
+        probes = [record.content for record in rng.sample(records, min(args.queries, len(records)))]
+        started = perf_counter()
+        for content in probes:
+            cold.find_near_duplicate(content)
+        print(f"near-duplicate-lookup\t{len(records)}\t{(perf_counter() - started) * 1000 / len(probes):.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
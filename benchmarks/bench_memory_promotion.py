@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import tempfile
+from time import perf_counter
+
+from src.memory.memory_store import MemoryStore
+from src.memory.promotion_engine import MemoryPromotionEngine
+from src.memory.promotion_engine import PromotionCandidate
+
+
+def _seed(store: MemoryStore, count: int) -> list[PromotionCandidate]:
+    requests: list[PromotionCandidate] = []
+    for index in range(count):
+        memory_id = f"cand-{index:05d}"
+        content = f"root cause {index} in module m{index % 97}"
+        store.create_record("candidate", content, [f"e-{index}"], memory_id=memory_id)
+        score = 0.6 + (index % 4) / 10
+        requests.append(PromotionCandidate(memory_id, repro_count=2 + index % 2, consensus_score=score))
+    return requests
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Promotion cost: per-candidate evaluate_and_apply vs batch")
+    parser.add_argument("--candidates", type=int, default=500)
+    parser.add_argument("--dedup", action="store_true", help="Keep the near-duplicate check enabled")
+    args = parser.parse_args(argv)
+    dedup_threshold = 0.8 if args.dedup else None
+    engine = MemoryPromotionEngine(threshold=0.7, dedup_threshold=dedup_threshold)
+
+    print("mode\tcandidates\tapproved\ttotal_ms\tus_per_candidate")
+    for mode in ("per-candidate", "batch"):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = MemoryStore(run_root=Path(tmp_dir) / "runs", run_id="run-bench")
+            requests = _seed(store, args.candidates)
+            started = perf_counter()
+            if mode == "batch":
+                results = engine.evaluate_and_apply_batch(store, requests)
+            else:
+                results = [
+                    engine.evaluate_and_apply(
+                        store,
+                        item.candidate_memory_id,
+                        repro_count=item.repro_count,
+                        consensus_score=item.consensus_score,
+                    )
+                    for item in requests
+                ]
+            elapsed = perf_counter() - started
+            approved = sum(1 for _, record in results if record is not None)
+            print(
+                f"{mode}\t{args.candidates}\t{approved}\t{elapsed * 1000:.1f}"
+                f"\t{elapsed / args.candidates * 1_000_000:.1f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import argparse
+from time import perf_counter
+from typing import Any
+
+from src.core.state_machine import CorePhase
+from src.core.state_machine import TransitionAudit
+from src.core.state_machine import replay_transitions
+
+_LOOP = (CorePhase.MONITOR, CorePhase.DETECT, CorePhase.REPRODUCE)
+
+
+def _run_log(transitions: int) -> list[dict[str, Any]]:
+    records: list[dict[str, Any]] = []
+    current = CorePhase.BOOTSTRAP
+    for index in range(transitions):
+        target = _LOOP[index % len(_LOOP)]
+        records.append(
+            {
+                "from_phase": current.value,
+                "to_phase": target.value,
+                "reason": "bench",
+                "at": "2026-01-01T00:00:00+00:00",
+            }
+        )
+        current = target
+    return records
+
+
+def _legacy_replay(records: list[dict[str, Any]]) -> CorePhase:
+    """Pre-table behaviour: rebuild every audit object, no edge checks."""
+    audits = [TransitionAudit.from_dict(item) for item in records]
+    return audits[-1].to_phase if audits else CorePhase.BOOTSTRAP
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay archived transition logs")
+    parser.add_argument("--runs", type=int, default=2000)
+    parser.add_argument("--transitions", type=int, default=200)
+    args = parser.parse_args(argv)
+    logs = [_run_log(args.transitions) for _ in range(args.runs)]
+    total = args.runs * args.transitions
+
+    rows: list[tuple[str, float]] = []
+    started = perf_counter()
+    for records in logs:
+        _legacy_replay(records)
+    rows.append(("legacy: TransitionAudit.from_dict (unchecked)", perf_counter() - started))
+
+    started = perf_counter()
+    for records in logs:
+        result = replay_transitions(records)
+        if not result.valid:
+            raise SystemExit(result.error)
+    rows.append(("table: replay_transitions (checked)", perf_counter() - started))
+
+    print("mode\truns\ttransitions\ttotal_s\tns_per_transition")
+    for mode, elapsed in rows:
+        print(f"{mode}\t{args.runs}\t{total}\t{elapsed:.3f}\t{elapsed / total * 1_000_000_000:.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
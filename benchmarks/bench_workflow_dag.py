@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import argparse
+from time import perf_counter
+from time import sleep
+from typing import Any
+
+from src.core.workflow_runtime import run_workflow
+
+
+def _definition(steps: int, lanes: int, chained: bool) -> dict[str, Any]:
+    """Synthetic workflow: ``lanes`` independent collector chains plus a final merge."""
+    items: list[dict[str, Any]] = []
+    for index in range(steps - 1):
+        item: dict[str, Any] = {
+            "step_id": f"s{index}",
+            "name": f"step {index}",
+            "plugin_ref": "collector.synthetic",
+            "action": "capture",
+        }
+        if not chained:
+            item["depends_on"] = [f"s{index - lanes}"] if index >= lanes else []
+        items.append(item)
+    merge: dict[str, Any] = {"step_id": "merge", "name": "merge", "plugin_ref": "analyzer.merge", "action": "merge"}
+    if not chained:
+        merge["depends_on"] = [f"s{index}" for index in range(max(0, steps - 1 - lanes), steps - 1)]
+    items.append(merge)
+    return {"workflow_id": "bench-flow", "steps": items, "guards": []}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Serial vs DAG workflow execution on a synthetic workflow")
+    parser.add_argument("--steps", type=int, default=50)
+    parser.add_argument("--lanes", type=int, default=7)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--step-ms", type=float, default=5.0)
+    args = parser.parse_args(argv)
+
+    def runner(step: dict[str, Any], context: dict[str, Any]) -> None:
+        sleep(args.step_ms / 1000)
+
+    rows: list[tuple[str, int, float]] = []
+    for mode, definition, workers in (
+        ("serial (no depends_on)", _definition(args.steps, args.lanes, chained=True), 1),
+        ("dag, 1 worker", _definition(args.steps, args.lanes, chained=False), 1),
+        (f"dag, {args.workers} workers", _definition(args.steps, args.lanes, chained=False), args.workers),
+    ):
+        started = perf_counter()
+        output = run_workflow(definition, "run-bench", step_runner=runner, max_workers=workers)
+        elapsed = perf_counter() - started
+        if output["status"] != "success":
+            raise SystemExit(f"{mode}: {output['blocked_reason']}")
+        rows.append((mode, len(output["steps"]), elapsed))
+
+    print("mode\tsteps\telapsed_ms")
+    for mode, steps, elapsed in rows:
+        print(f"{mode}\t{steps}\t{elapsed * 1000:.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import argparse
+from time import perf_counter
+
+from src.core.workflow_guards import GuardContext
+from src.core.workflow_guards import compile_guard
+
+_EXPRESSIONS = (
+    "has_evidence:trace.captured",
+    "has_evidence:trace.captured and count_evidence >= 2",
+    "phase in (DETECT, ANALYZE, REPRODUCE) and (event_seen(tool=uart, severity=error) or not has_evidence:gdb.core)",
+)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Guard evaluation cost: parse per evaluation vs compiled once")
+    parser.add_argument("--evaluations", type=int, default=20000)
+    args = parser.parse_args(argv)
+    context = GuardContext.from_events(
+        [{"tool": "uart", "severity": "error"}],
+        evidence={"trace.captured", "trace.normalized"},
+        phase="ANALYZE",
+    )
+
+    print("expression\tmode\tus_per_eval")
+    for expression in _EXPRESSIONS:
+        started = perf_counter()
+        for _ in range(args.evaluations):
+            compile_guard("g-bench", expression).evaluate(context)
+        parsed = perf_counter() - started
+
+        guard = compile_guard("g-bench", expression)
+        started = perf_counter()
+        for _ in range(args.evaluations):
+            guard.evaluate(context)
+        compiled = perf_counter() - started
+
+        label = expression if len(expression) <= 40 else expression[:37] + "..."
+        print(f"{label}\tparse-per-eval\t{parsed / args.evaluations * 1_000_000:.2f}")
+        print(f"{label}\tcompiled\t{compiled / args.evaluations * 1_000_000:.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,32 +1,59 @@
 from __future__ import annotations
 
 import argparse
+from collections.abc import Iterator
+from dataclasses import replace
 import json
 from pathlib import Path
 import subprocess
 import sys
+from time import perf_counter
 from typing import Any
 
 from src.cli.command_registry import ToolRegistryError
 from src.cli.command_registry import build_default_registry
 from src.core.agent_dispatcher import AgentDispatcher
 from src.core.agent_dispatcher import AgentDispatcherError
+from src.core.agent_dispatcher import DispatchMode
 from src.core.consensus_engine import ConsensusEngine
+from src.core.durable_io import Durability
+from src.core.durable_io import atomic_write_json
+from src.core.durable_io import atomic_write_text
 from src.core.run_store import RunStoreError
 from src.core.run_store import append_consensus_record
+from src.core.run_store import append_workflow_checkpoint
 from src.core.run_store import append_workflow_record
 from src.core.run_store import create_run
 from src.core.run_store import default_run_root
 from src.core.run_store import load_run
+from src.core.run_store import load_workflow_checkpoint
+from src.core.run_store import load_workflow_records
+from src.core.run_store import parse_workflow_run_id
 from src.core.run_store import run_event_count
 from src.core.run_store import run_events_path
 from src.core.run_store import transition_run
 from src.core.state_machine import CorePhase
+from src.core.state_machine import InvalidTransitionError
+from src.core.workflow_guards import GuardSyntaxError
+from src.core.workflow_guards import guards_use_events
+from src.core.workflow_profile import P1_LOOP_BUDGET_MS
+from src.core.workflow_profile import StepProfile
+from src.core.workflow_profile import folded_stacks
+from src.core.workflow_profile import profile_steps
+from src.core.workflow_profile import workflow_wall_ms
 from src.core.workflow_runtime import WorkflowError
-from src.core.workflow_runtime import list_workflows
-from src.core.workflow_runtime import load_workflow_definition
+from src.core.workflow_runtime import WorkflowRegistry
 from src.core.workflow_runtime import run_workflow
 from src.memory.compression_codec import CompressionCodec
+from src.memory.compression_codec import iter_raw_lines
+from src.memory.lifecycle import DEFAULT_RETENTION
+from src.memory.lifecycle import GcReport
+from src.memory.lifecycle import MANAGED_TIERS
+from src.memory.lifecycle import MemoryLifecycleManager
+from src.memory.lifecycle import RetentionPolicy
+from src.memory.lifecycle import memory_run_ids
+from src.memory.long_memory_index import LongMemoryIndex
+from src.memory.memory_store import MemoryStore
 from src.report.evidence_bundle import build_evidence_bundle
 from src.report.evidence_bundle import write_evidence_bundle
 from src.report.patch_proposal import build_patch_proposal
@@ -70,10 +97,14 @@ def build_parser() -> argparse.ArgumentParser:
 
     workflow_list = workflow_subcommands.add_parser("list", help="List workflows")
     workflow_list.add_argument("--format", choices=("text", "json"), default="text")
+    workflow_list.add_argument("--workflow-dir", action="append", default=[])
+    workflow_list.add_argument("--workflow-cache", default="")
 
     workflow_show = workflow_subcommands.add_parser("show", help="Show workflow definition")
     workflow_show.add_argument("workflow_id")
     workflow_show.add_argument("--format", choices=("text", "json"), default="text")
+    workflow_show.add_argument("--workflow-dir", action="append", default=[])
+    workflow_show.add_argument("--workflow-cache", default="")
 
     workflow_run = workflow_subcommands.add_parser("run", help="Run workflow skeleton")
     workflow_run.add_argument("workflow_id")
@@ -81,6 +112,23 @@ def build_parser() -> argparse.ArgumentParser:
     workflow_run.add_argument("--run-root", default="")
     workflow_run.add_argument("--evidence", action="append", default=[])
     workflow_run.add_argument("--format", choices=("text", "json"), default="text")
+    workflow_run.add_argument("--workflow-dir", action="append", default=[])
+    workflow_run.add_argument("--workflow-cache", default="")
+
+    workflow_resume = workflow_subcommands.add_parser("resume", help="Resume a workflow run from its checkpoints")
+    workflow_resume.add_argument("workflow_run_id")
+    workflow_resume.add_argument("--run-root", default="")
+    workflow_resume.add_argument("--evidence", action="append", default=[])
+    workflow_resume.add_argument("--format", choices=("text", "json"), default="text")
+    workflow_resume.add_argument("--workflow-dir", action="append", default=[])
+    workflow_resume.add_argument("--workflow-cache", default="")
+
+    workflow_profile = workflow_subcommands.add_parser("profile", help="Rank hot workflow steps across runs")
+    workflow_profile.add_argument("run_ids", nargs="+", metavar="run_id")
+    workflow_profile.add_argument("--run-root", default="")
+    workflow_profile.add_argument("--top", type=int, default=20)
+    workflow_profile.add_argument("--folded", default="", help="Write folded stacks for flamegraph.pl to this path")
+    workflow_profile.add_argument("--format", choices=("text", "json"), default="text")
 
     verify_parser = subcommands.add_parser("verify", help="Verification commands")
     verify_subcommands = verify_parser.add_subparsers(dest="verify_command", required=True)
@@ -91,6 +139,30 @@ def build_parser() -> argparse.ArgumentParser:
     verify_compression.add_argument("--roundtrip", action="store_true")
     verify_compression.add_argument("--format", choices=("text", "json"), default="text")
 
+    memory_parser = subcommands.add_parser("memory", help="Long memory")
+    memory_subcommands = memory_parser.add_subparsers(dest="memory_command", required=True)
+
+    memory_search = memory_subcommands.add_parser("search", help="Search long memory across runs")
+    memory_search.add_argument("query", nargs="?", default="")
+    memory_search.add_argument("--ref", action="append", default=[], help="Require this evidence ref")
+    memory_search.add_argument("--limit", type=int, default=20)
+    memory_search.add_argument("--run-root", default="")
+    memory_search.add_argument("--format", choices=("text", "json"), default="text")
+
+    memory_reindex = memory_subcommands.add_parser("reindex", help="Rebuild the cross-run long-memory index")
+    memory_reindex.add_argument("--run-root", default="")
+    memory_reindex.add_argument("--format", choices=("text", "json"), default="text")
+
+    memory_gc = memory_subcommands.add_parser("gc", help="Apply raw/working retention and compaction")
+    memory_gc.add_argument("--run-id", default="", help="Collect one run (default: every run with memory)")
+    memory_gc.add_argument("--run-root", default="")
+    memory_gc.add_argument("--dry-run", action="store_true", help="Report what would be reclaimed without deleting")
+    for tier in MANAGED_TIERS:
+        memory_gc.add_argument(f"--{tier}-max-age-days", type=float, default=None)
+        memory_gc.add_argument(f"--{tier}-max-count", type=int, default=None)
+        memory_gc.add_argument(f"--{tier}-max-bytes", type=int, default=None)
+    memory_gc.add_argument("--format", choices=("text", "json"), default="text")
+
     analyze_parser = subcommands.add_parser("analyze", help="Analysis commands")
     analyze_subcommands = analyze_parser.add_subparsers(dest="analyze_command", required=True)
 
@@ -100,6 +172,14 @@ def build_parser() -> argparse.ArgumentParser:
     analyze_consensus.add_argument("--topic", default="root-cause")
     analyze_consensus.add_argument("--agents", default="codex,copilot,gemini")
     analyze_consensus.add_argument("--required-evidence", action="append", default=["trace.captured"])
+    analyze_consensus.add_argument(
+        "--dispatch-mode",
+        choices=tuple(mode.value for mode in DispatchMode),
+        default=DispatchMode.SERIAL.value,
+    )
+    analyze_consensus.add_argument("--agent-timeout", type=float, default=None)
+    analyze_consensus.add_argument("--deadline", type=float, default=None)
+    analyze_consensus.add_argument("--min-quorum", type=int, default=1)
     analyze_consensus.add_argument("--format", choices=("text", "json"), default="text")
 
     report_parser = subcommands.add_parser("report", help="Report generation")
@@ -194,6 +274,11 @@ def _print_run_text(run_payload: dict[str, Any], event_count: int) -> None:
     print(f"event_count: {event_count}")
 
 
+def _workflow_registry(args: argparse.Namespace) -> WorkflowRegistry:
+    cache_path = Path(args.workflow_cache) if args.workflow_cache else None
+    return WorkflowRegistry(extra_dirs=[Path(item) for item in args.workflow_dir], cache_path=cache_path)
+
+
 def _print_workflow_list_text(workflow_ids: list[str]) -> None:
     for workflow_id in workflow_ids:
         print(workflow_id)
@@ -208,15 +293,57 @@ def _print_workflow_run_text(payload: dict[str, Any], output_file: Path) -> None
     print(f"output_file: {output_file}")
 
 
-def _load_jsonl_lines(path: Path) -> list[str]:
-    lines: list[str] = []
-    with path.open("r", encoding="utf-8") as file:
-        for line in file:
-            text = line.strip()
-            if not text:
-                continue
-            lines.append(text)
-    return lines
+def _print_workflow_profile_text(
+    profiles: list[StepProfile],
+    workflow_runs: int,
+    total_wall_ms: float,
+    folded_path: str,
+) -> None:
+    share = total_wall_ms / P1_LOOP_BUDGET_MS * 100
+    print(f"workflow_runs: {workflow_runs}")
+    print(f"total_wall_ms: {total_wall_ms:.1f} ({share:.1f}% of SC-001 budget)")
+    print("rank\tworkflow_id\tstep_id\truns\twall_ms\tmean_ms\tcpu_ms\tguard_ms\tio_ms\tcache_hits")
+    for rank, item in enumerate(profiles, start=1):
+        print(
+            f"{rank}\t{item.workflow_id}\t{item.step_id}\t{item.runs}\t{item.wall_ms:.1f}\t{item.mean_wall_ms:.1f}"
+            f"\t{item.cpu_ms:.1f}\t{item.guard_ms:.3f}\t{item.io_ms:.1f}\t{item.cache_hits}"
+        )
+    if folded_path:
+        print(f"folded_file: {folded_path}")
+
+
+def _iter_jsonl_records(path: Path) -> Iterator[dict[str, Any]]:
+    if not path.exists():
+        return
+    for line in iter_raw_lines(path):
+        yield json.loads(line)
+
+
+def _retention_policies(args: argparse.Namespace) -> dict[str, RetentionPolicy]:
+    policies = dict(DEFAULT_RETENTION)
+    for tier in MANAGED_TIERS:
+        overrides: dict[str, Any] = {}
+        max_age_days = getattr(args, f"{tier}_max_age_days")
+        if max_age_days is not None:
+            overrides["max_age_s"] = max_age_days * 86400
+        for name in ("max_count", "max_bytes"):
+            value = getattr(args, f"{tier}_{name}")
+            if value is not None:
+                overrides[name] = value
+        policies[tier] = replace(policies[tier], **overrides)
+    return policies
+
+
+def _print_gc_report_text(report: GcReport) -> None:
+    print(f"run_id: {report.run_id}{' (dry-run)' if report.dry_run else ''}")
+    for item in report.tiers:
+        print(
+            f"  {item.tier}: scanned={item.scanned} protected={item.protected} "
+            f"evicted={len(item.evicted)} bytes={item.bytes_reclaimed}"
+        )
+    if report.summary_bytes:
+        print(f"  working summary: {report.summary_memory_id or '(not written)'} bytes={report.summary_bytes}")
+    print(f"  bytes_reclaimed: {report.bytes_reclaimed}")
 
 
 def _register_mock_agents(dispatcher: AgentDispatcher) -> None:
@@ -324,7 +451,7 @@ def main(argv: list[str] | None = None) -> int:
                     to_phase=CorePhase.REPORT,
                     reason=args.reason,
                 )
-            except RunStoreError as error:
+            except (RunStoreError, InvalidTransitionError) as error:
                 print(str(error), file=sys.stderr)
                 return 2
             events = run_event_count(run_root, args.run_id)
@@ -344,8 +471,44 @@ def main(argv: list[str] | None = None) -> int:
         return 2
 
     if args.command == "workflow":
+        if args.workflow_command == "profile":
+            run_root = _resolve_run_root(args.run_root)
+            records: list[dict[str, Any]] = []
+            for run_id in args.run_ids:
+                try:
+                    load_run(run_root, run_id)
+                except RunStoreError as error:
+                    print(str(error), file=sys.stderr)
+                    return 2
+                records.extend(load_workflow_records(run_root, run_id))
+            profiles = profile_steps(records)[: max(0, args.top)]
+            total_wall_ms = workflow_wall_ms(records)
+            folded_path = ""
+            if args.folded:
+                folded_text = "".join(f"{line}\n" for line in folded_stacks(records))
+                folded_path = str(atomic_write_text(Path(args.folded), folded_text, Durability.ATOMIC))
+            if args.format == "json":
+                _print_json(
+                    {
+                        "run_ids": args.run_ids,
+                        "workflow_runs": len(records),
+                        "total_wall_ms": round(total_wall_ms, 3),
+                        "budget_ms": P1_LOOP_BUDGET_MS,
+                        "steps": [item.to_dict() for item in profiles],
+                        "folded_file": folded_path,
+                    }
+                )
+                return 0
+            _print_workflow_profile_text(profiles, len(records), total_wall_ms, folded_path)
+            return 0
+
+        registry = _workflow_registry(args)
         if args.workflow_command == "list":
-            workflow_ids = list_workflows()
+            try:
+                workflow_ids = registry.workflow_ids()
+            except WorkflowError as error:
+                print(str(error), file=sys.stderr)
+                return 2
             if args.format == "json":
                 _print_json({"workflows": workflow_ids})
                 return 0
@@ -354,7 +517,7 @@ def main(argv: list[str] | None = None) -> int:
 
         if args.workflow_command == "show":
             try:
-                definition = load_workflow_definition(args.workflow_id)
+                definition = registry.get(args.workflow_id)
             except WorkflowError as error:
                 print(str(error), file=sys.stderr)
                 return 2
@@ -367,26 +530,42 @@ def main(argv: list[str] | None = None) -> int:
             print(f"step_count: {len(definition.get('steps', []))}")
             return 0
 
-        if args.workflow_command == "run":
+        if args.workflow_command in ("run", "resume"):
             run_root = _resolve_run_root(args.run_root)
+            resume_from = None
             try:
-                load_run(run_root, args.run_id)
+                if args.workflow_command == "resume":
+                    run_id, workflow_id, _ = parse_workflow_run_id(args.workflow_run_id)
+                    run_payload = load_run(run_root, run_id)
+                    resume_from = load_workflow_checkpoint(run_root, args.workflow_run_id)
+                else:
+                    run_id, workflow_id = args.run_id, args.workflow_id
+                    run_payload = load_run(run_root, run_id)
             except RunStoreError as error:
                 print(str(error), file=sys.stderr)
                 return 2
             try:
-                definition = load_workflow_definition(args.workflow_id)
-            except WorkflowError as error:
+                definition = registry.get(workflow_id)
+                events = None
+                if guards_use_events(definition):
+                    events = _iter_jsonl_records(run_events_path(run_root, run_id))
+                workflow_run_payload = run_workflow(
+                    definition=definition,
+                    run_id=run_id,
+                    evidence=set(args.evidence),
+                    phase=str(run_payload.get("state", "")),
+                    events=events,
+                    on_step=lambda workflow_run, record: append_workflow_checkpoint(
+                        run_root, run_id, workflow_run, record
+                    ),
+                    resume_from=resume_from,
+                )
+            except (WorkflowError, GuardSyntaxError) as error:
                 print(str(error), file=sys.stderr)
                 return 2
-            workflow_run_payload = run_workflow(
-                definition=definition,
-                run_id=args.run_id,
-                evidence=set(args.evidence),
-            )
             output_file = append_workflow_record(
                 run_root=run_root,
-                run_id=args.run_id,
+                run_id=run_id,
                 workflow_run=workflow_run_payload,
             )
             if args.format == "json":
@@ -417,22 +596,33 @@ def main(argv: list[str] | None = None) -> int:
             if not events_file.exists():
                 print(f"events file not found: {events_file}", file=sys.stderr)
                 return 2
-            raw_lines = _load_jsonl_lines(events_file)
+            index_dir = run_root / args.run_id / "index"
             codec = CompressionCodec()
-            payload = codec.compress(run_id=args.run_id, raw_lines=raw_lines)
+            payload = codec.compress_stream(
+                run_id=args.run_id,
+                raw_lines=iter_raw_lines(events_file),
+                segments_path=index_dir / "compression.segments.jsonl",
+                archive_path=index_dir / "events.idka",
+                verify_roundtrip=args.roundtrip,
+            )
+            raw_count = int(payload["step_results"][0]["input_count"])
+            archive = payload["archive"]
             roundtrip_ok = True
             if args.roundtrip:
-                restored = codec.decompress(payload)
-                roundtrip_ok = restored == raw_lines
+                roundtrip_ok = all(item["roundtrip_ok"] for item in payload["step_results"]) and archive["roundtrip_ok"]
             payload["roundtrip_ok"] = roundtrip_ok
-            output_file = run_root / args.run_id / "index" / "compression.json"
-            output_file.parent.mkdir(parents=True, exist_ok=True)
-            output_file.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+            output_file = index_dir / "compression.json"
+            atomic_write_json(output_file, payload, Durability.ATOMIC)
             if args.format == "json":
                 _print_json({"compression": payload, "output_file": str(output_file)})
             else:
                 print(f"run_id: {args.run_id}")
-                print(f"raw_count: {len(raw_lines)}")
+                print(f"raw_count: {raw_count}")
+                print(
+                    f"archive: {archive['archive_bytes']}/{archive['raw_bytes']} bytes, "
+                    f"reduction {archive['reduction']:.1%} (SC-003 target {archive['target_reduction']:.0%}, "
+                    f"{'met' if archive['meets_target'] else 'not met'})"
+                )
                 print(f"roundtrip_ok: {roundtrip_ok}")
                 print(f"output_file: {output_file}")
             if args.roundtrip and not roundtrip_ok:
@@ -442,6 +632,73 @@ def main(argv: list[str] | None = None) -> int:
         parser.error("unsupported verify command")
         return 2
 
+    if args.command == "memory":
+        run_root = _resolve_run_root(args.run_root)
+        long_index = LongMemoryIndex.for_run_root(run_root)
+        if args.memory_command == "search":
+            if not args.query.strip() and not args.ref:
+                print("memory search needs a query or --ref", file=sys.stderr)
+                return 2
+            started = perf_counter()
+            records = long_index.search(args.query, evidence_refs=args.ref, limit=args.limit)
+            elapsed_ms = (perf_counter() - started) * 1000
+            if args.format == "json":
+                _print_json(
+                    {
+                        "query": args.query,
+                        "evidence_refs": args.ref,
+                        "elapsed_ms": round(elapsed_ms, 3),
+                        "records": [record.to_dict() for record in records],
+                    }
+                )
+                return 0
+            for record in records:
+                refs = ",".join(record.evidence_refs) or "-"
+                print(f"{record.run_id}/{record.memory_id}\t{record.content}\t[{refs}]")
+            print(f"matches: {len(records)} ({elapsed_ms:.1f} ms)")
+            return 0
+
+        if args.memory_command == "reindex":
+            document_count = long_index.rebuild(run_root)
+            if args.format == "json":
+                _print_json({"document_count": document_count, "index_dir": str(long_index.root)})
+            else:
+                print(f"document_count: {document_count}")
+                print(f"index_dir: {long_index.root}")
+            return 0
+
+        if args.memory_command == "gc":
+            run_ids = [args.run_id] if args.run_id else memory_run_ids(run_root)
+            manager = MemoryLifecycleManager(policies=_retention_policies(args))
+            reports = [
+                manager.collect(MemoryStore(run_root=run_root, run_id=run_id), dry_run=args.dry_run)
+                for run_id in run_ids
+            ]
+            if not args.dry_run:
+                # Queries never fold the shared long-memory log; gc is the periodic maintenance point.
+                LongMemoryIndex.for_run_root(run_root).compact()
+            total_reclaimed = sum(report.bytes_reclaimed for report in reports)
+            total_summary = sum(report.summary_bytes for report in reports)
+            if args.format == "json":
+                _print_json(
+                    {
+                        "dry_run": args.dry_run,
+                        "runs": [report.to_dict() for report in reports],
+                        "bytes_reclaimed": total_reclaimed,
+                        "summary_bytes": total_summary,
+                    }
+                )
+                return 0
+            for report in reports:
+                _print_gc_report_text(report)
+            suffix = " (dry-run)" if args.dry_run else ""
+            print(f"total_bytes_reclaimed: {total_reclaimed}{suffix}")
+            print(f"total_summary_bytes: {total_summary}{suffix}")
+            return 0
+
+        parser.error("unsupported memory command")
+        return 2
+
     if args.command == "analyze":
         if args.analyze_command == "consensus":
             run_root = _resolve_run_root(args.run_root)
@@ -457,6 +714,9 @@ def main(argv: list[str] | None = None) -> int:
                 results = dispatcher.dispatch(
                     agent_ids=agent_ids,
                     context={"run_id": args.run_id, "topic": args.topic},
+                    mode=args.dispatch_mode,
+                    agent_timeout_s=args.agent_timeout,
+                    deadline_s=args.deadline,
                 )
             except AgentDispatcherError as error:
                 print(str(error), file=sys.stderr)
@@ -467,6 +727,7 @@ def main(argv: list[str] | None = None) -> int:
                 topic=args.topic,
                 agent_results=results,
                 required_evidence=set(args.required_evidence),
+                min_quorum=args.min_quorum,
             )
             output_file = append_consensus_record(
                 run_root=run_root,
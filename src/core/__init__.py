@@ -1,20 +1,65 @@
 """PI core package."""
 from src.core.agent_dispatcher import AgentDispatcher
 from src.core.agent_dispatcher import AgentDispatcherError
+from src.core.agent_dispatcher import DispatchMode
+from src.core.async_event_bus import AsyncEventBus
+from src.core.async_event_bus import AsyncEventBusError
 from src.core.consensus_engine import ConsensusEngine
+from src.core.consensus_engine import ConsensusTopic
+from src.core.durable_io import AtomicBatch
+from src.core.durable_io import Durability
+from src.core.durable_io import DurableWriteError
+from src.core.durable_io import atomic_write_json
+from src.core.durable_io import atomic_write_text
+from src.core.event_bus import EventBus
+from src.core.event_bus import EventCursor
+from src.core.event_bus import EventValidationError
+from src.core.event_writer import EventWriter
+from src.core.event_writer import EventWriterError
+from src.core.event_writer import FsyncPolicy
 from src.core.run_store import RunStoreError
+from src.core.run_store import append_consensus_record
+from src.core.run_store import append_workflow_checkpoint
 from src.core.run_store import append_workflow_record
+from src.core.run_store import close_event_writer
+from src.core.run_store import close_event_writers
+from src.core.run_store import consensus_record_count
 from src.core.run_store import create_run
 from src.core.run_store import default_run_root
+from src.core.run_store import latest_consensus_record
+from src.core.run_store import load_consensus_records
 from src.core.run_store import load_run
+from src.core.run_store import load_transition_audits
+from src.core.run_store import load_workflow_checkpoint
+from src.core.run_store import load_workflow_records
+from src.core.run_store import open_event_writer
+from src.core.run_store import parse_workflow_run_id
+from src.core.run_store import replay_runs
 from src.core.run_store import run_event_count
 from src.core.run_store import run_events_path
 from src.core.run_store import transition_run
 from src.core.state_machine import CorePhase
 from src.core.state_machine import CoreStateMachine
+from src.core.state_machine import DEFAULT_TRANSITION_TABLE
+from src.core.state_machine import InvalidTransitionError
+from src.core.state_machine import ReplayResult
+from src.core.state_machine import TransitionTable
+from src.core.state_machine import replay_transitions
+from src.core.step_cache import StepCache
+from src.core.step_cache import step_cache_key
 from src.core.veto_gate import VetoDecision
 from src.core.veto_gate import VetoGate
+from src.core.workflow_guards import CompiledGuard
+from src.core.workflow_guards import GuardContext
+from src.core.workflow_guards import GuardSyntaxError
+from src.core.workflow_guards import compile_guard
+from src.core.workflow_guards import compile_guards
+from src.core.workflow_profile import StepProfile
+from src.core.workflow_profile import folded_stacks
+from src.core.workflow_profile import profile_steps
 from src.core.workflow_runtime import WorkflowError
+from src.core.workflow_runtime import WorkflowRegistry
+from src.core.workflow_runtime import default_workflow_registry
 from src.core.workflow_runtime import list_workflows
 from src.core.workflow_runtime import load_workflow_definition
 from src.core.workflow_runtime import run_workflow
@@ -22,20 +67,65 @@ from src.core.workflow_runtime import run_workflow
 __all__ = [
     "AgentDispatcher",
     "AgentDispatcherError",
+    "DispatchMode",
+    "AsyncEventBus",
+    "AsyncEventBusError",
     "ConsensusEngine",
+    "ConsensusTopic",
+    "AtomicBatch",
+    "Durability",
+    "DurableWriteError",
+    "atomic_write_json",
+    "atomic_write_text",
+    "EventBus",
+    "EventCursor",
+    "EventValidationError",
+    "EventWriter",
+    "EventWriterError",
+    "FsyncPolicy",
     "RunStoreError",
+    "append_consensus_record",
+    "append_workflow_checkpoint",
     "append_workflow_record",
+    "close_event_writer",
+    "close_event_writers",
+    "consensus_record_count",
     "create_run",
     "default_run_root",
+    "latest_consensus_record",
+    "load_consensus_records",
     "load_run",
+    "load_transition_audits",
+    "load_workflow_checkpoint",
+    "load_workflow_records",
+    "open_event_writer",
+    "parse_workflow_run_id",
+    "replay_runs",
     "run_event_count",
     "run_events_path",
     "transition_run",
     "CorePhase",
     "CoreStateMachine",
+    "DEFAULT_TRANSITION_TABLE",
+    "InvalidTransitionError",
+    "ReplayResult",
+    "TransitionTable",
+    "replay_transitions",
+    "StepCache",
+    "step_cache_key",
     "VetoDecision",
     "VetoGate",
+    "CompiledGuard",
+    "GuardContext",
+    "GuardSyntaxError",
+    "compile_guard",
+    "compile_guards",
+    "StepProfile",
+    "folded_stacks",
+    "profile_steps",
     "WorkflowError",
+    "WorkflowRegistry",
+    "default_workflow_registry",
     "list_workflows",
     "load_workflow_definition",
     "run_workflow",
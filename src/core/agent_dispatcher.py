@@ -1,6 +1,15 @@
 from __future__ import annotations
 
+import asyncio
 from collections.abc import Callable
+from concurrent.futures import CancelledError
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from enum import Enum
+import inspect
+import threading
+from time import monotonic
 from typing import Any
 
 
@@ -8,23 +17,236 @@ class AgentDispatcherError(ValueError):
     pass
 
 
+class DispatchMode(str, Enum):
+    SERIAL = "serial"
+    THREAD = "thread"
+    ASYNC = "async"
+
+
+def agent_failure(agent_id: str, code: str, message: str) -> dict[str, Any]:
+    return {
+        "agent_id": agent_id,
+        "failure": {
+            "code": code,
+            "message": message,
+        },
+    }
+
+
+def is_agent_failure(result: dict[str, Any]) -> bool:
+    return "failure" in result
+
+
+def _remaining_s(limit_at: float | None) -> float | None:
+    return None if limit_at is None else max(0.0, limit_at - monotonic())
+
+
+def _call_handler(handler: Callable[[dict[str, Any]], Any], context: dict[str, Any]) -> Any:
+    if inspect.iscoroutinefunction(handler):
+        return asyncio.run(handler(context))
+    return handler(context)
+
+
 class AgentDispatcher:
-    def __init__(self) -> None:
-        self._handlers: dict[str, Callable[[dict[str, Any]], dict[str, Any]]] = {}
+    """Dispatch a topic to registered agents and collect results in request order.
+
+    ``serial`` calls handlers one after another. ``thread`` and ``async`` fan
+    out concurrently. Every mode takes an optional per-agent timeout, counted
+    from when the agent actually starts, and a total deadline; agents that
+    time out, raise or are cancelled come back as structured failures (see
+    ``agent_failure``) so consensus can still run on a quorum. Handlers cannot
+    be interrupted, so a handler past its limit keeps running (in the
+    background, for ``thread``) while its result is discarded; ``serial``
+    skips the agents it has not started once the deadline passes. A
+    ``thread`` agent waiting for a free worker waits at most until the
+    deadline.
+    """
+
+    def __init__(self, max_workers: int = 8) -> None:
+        self.max_workers = max_workers
+        self._handlers: dict[str, Callable[[dict[str, Any]], Any]] = {}
 
-    def register(self, agent_id: str, handler: Callable[[dict[str, Any]], dict[str, Any]]) -> None:
+    def register(self, agent_id: str, handler: Callable[[dict[str, Any]], Any]) -> None:
         if agent_id in self._handlers:
             raise AgentDispatcherError(f"agent already registered: {agent_id}")
         self._handlers[agent_id] = handler
 
-    def dispatch(self, agent_ids: list[str], context: dict[str, Any]) -> list[dict[str, Any]]:
-        results: list[dict[str, Any]] = []
+    def _resolve(self, agent_ids: list[str]) -> list[tuple[str, Callable[[dict[str, Any]], Any]]]:
+        resolved: list[tuple[str, Callable[[dict[str, Any]], Any]]] = []
         for agent_id in agent_ids:
             handler = self._handlers.get(agent_id)
             if handler is None:
                 raise AgentDispatcherError(f"agent not registered: {agent_id}")
-            result = handler(context)
-            normalized = dict(result)
-            normalized["agent_id"] = agent_id
-            results.append(normalized)
+            resolved.append((agent_id, handler))
+        return resolved
+
+    @staticmethod
+    def _normalize(agent_id: str, result: dict[str, Any]) -> dict[str, Any]:
+        normalized = dict(result)
+        normalized["agent_id"] = agent_id
+        return normalized
+
+    def dispatch(
+        self,
+        agent_ids: list[str],
+        context: dict[str, Any],
+        mode: DispatchMode | str = DispatchMode.SERIAL,
+        agent_timeout_s: float | None = None,
+        deadline_s: float | None = None,
+    ) -> list[dict[str, Any]]:
+        resolved_mode = DispatchMode(mode)
+        if resolved_mode == DispatchMode.THREAD:
+            return self._dispatch_threaded(agent_ids, context, agent_timeout_s, deadline_s)
+        if resolved_mode == DispatchMode.ASYNC:
+            return asyncio.run(self.dispatch_async(agent_ids, context, agent_timeout_s, deadline_s))
+
+        return self._dispatch_serial(agent_ids, context, agent_timeout_s, deadline_s)
+
+    def _dispatch_serial(
+        self,
+        agent_ids: list[str],
+        context: dict[str, Any],
+        agent_timeout_s: float | None,
+        deadline_s: float | None,
+    ) -> list[dict[str, Any]]:
+        resolved = self._resolve(agent_ids)
+        deadline_at = monotonic() + deadline_s if deadline_s is not None else None
+        results: list[dict[str, Any]] = []
+        for agent_id, handler in resolved:
+            if deadline_at is not None and monotonic() >= deadline_at:
+                results.append(agent_failure(agent_id, "deadline", "agent exceeded deadline limit"))
+                continue
+            started = monotonic()
+            try:
+                result = _call_handler(handler, context)
+            except Exception as error:
+                results.append(agent_failure(agent_id, "error", f"{type(error).__name__}: {error}"))
+                continue
+            finished = monotonic()
+            if agent_timeout_s is not None and finished - started > agent_timeout_s:
+                results.append(agent_failure(agent_id, "timeout", "agent exceeded timeout limit"))
+            elif deadline_at is not None and finished > deadline_at:
+                results.append(agent_failure(agent_id, "deadline", "agent exceeded deadline limit"))
+            else:
+                results.append(self._normalize(agent_id, result))
+        return results
+
+    def _dispatch_threaded(
+        self,
+        agent_ids: list[str],
+        context: dict[str, Any],
+        agent_timeout_s: float | None,
+        deadline_s: float | None,
+    ) -> list[dict[str, Any]]:
+        resolved = self._resolve(agent_ids)
+        if not resolved:
+            return []
+        deadline_at = monotonic() + deadline_s if deadline_s is not None else None
+        executor = ThreadPoolExecutor(
+            max_workers=max(1, min(self.max_workers, len(resolved))),
+            thread_name_prefix="idk-agent",
+        )
+        # Agents beyond max_workers queue for a worker; their timeout only starts once they run.
+        started_at = [0.0] * len(resolved)
+        started = [threading.Event() for _ in resolved]
+
+        def run_agent(index: int, handler: Callable[[dict[str, Any]], Any]) -> Any:
+            started_at[index] = monotonic()
+            started[index].set()
+            return _call_handler(handler, context)
+
+        futures: list[tuple[str, Future[Any]]] = [
+            (agent_id, executor.submit(run_agent, index, handler))
+            for index, (agent_id, handler) in enumerate(resolved)
+        ]
+        results: list[dict[str, Any]] = []
+        try:
+            for index, (agent_id, future) in enumerate(futures):
+                limit_code = "deadline"
+                wait_s = _remaining_s(deadline_at)
+                if agent_timeout_s is not None and started[index].wait(wait_s):
+                    timeout_at = started_at[index] + agent_timeout_s
+                    if deadline_at is None or timeout_at < deadline_at:
+                        limit_code = "timeout"
+                        wait_s = _remaining_s(timeout_at)
+                    else:
+                        wait_s = _remaining_s(deadline_at)
+                try:
+                    results.append(self._normalize(agent_id, future.result(timeout=wait_s)))
+                except FutureTimeoutError:
+                    cancelled = future.cancel()
+                    code = "cancelled" if cancelled else limit_code
+                    results.append(agent_failure(agent_id, code, f"agent exceeded {limit_code} limit"))
+                except CancelledError:
+                    results.append(agent_failure(agent_id, "cancelled", "agent was cancelled"))
+                except Exception as error:
+                    results.append(agent_failure(agent_id, "error", f"{type(error).__name__}: {error}"))
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        return results
+
+    async def dispatch_async(
+        self,
+        agent_ids: list[str],
+        context: dict[str, Any],
+        agent_timeout_s: float | None = None,
+        deadline_s: float | None = None,
+    ) -> list[dict[str, Any]]:
+        resolved = self._resolve(agent_ids)
+        if not resolved:
+            return []
+
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(
+            max_workers=max(1, min(self.max_workers, len(resolved))),
+            thread_name_prefix="idk-agent",
+        )
+
+        async def run_agent(handler: Callable[[dict[str, Any]], Any]) -> Any:
+            if inspect.iscoroutinefunction(handler):
+                return await asyncio.wait_for(handler(context), timeout=agent_timeout_s)
+            started = asyncio.Event()
+
+            def job() -> Any:
+                loop.call_soon_threadsafe(started.set)
+                return handler(context)
+
+            call = loop.run_in_executor(executor, job)
+            if agent_timeout_s is not None:
+                # Agents queued behind busy workers start their timeout only once they run.
+                start = asyncio.ensure_future(started.wait())
+                try:
+                    await asyncio.wait((call, start), return_when=asyncio.FIRST_COMPLETED)
+                except asyncio.CancelledError:
+                    call.cancel()
+                    raise
+                finally:
+                    start.cancel()
+            return await asyncio.wait_for(call, timeout=agent_timeout_s)
+
+        tasks = [asyncio.create_task(run_agent(handler)) for _, handler in resolved]
+        try:
+            _, pending = await asyncio.wait(tasks, timeout=deadline_s)
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        results: list[dict[str, Any]] = []
+        for (agent_id, _), task in zip(resolved, tasks):
+            if task in pending:
+                results.append(agent_failure(agent_id, "deadline", "agent exceeded deadline limit"))
+                continue
+            if task.cancelled():
+                results.append(agent_failure(agent_id, "cancelled", "agent was cancelled"))
+                continue
+            error = task.exception()
+            if isinstance(error, asyncio.TimeoutError):
+                results.append(agent_failure(agent_id, "timeout", "agent exceeded timeout limit"))
+            elif error is not None:
+                results.append(agent_failure(agent_id, "error", f"{type(error).__name__}: {error}"))
+            else:
+                results.append(self._normalize(agent_id, task.result()))
         return results
@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+from src.core.event_bus import EventSubscription
+from src.core.event_bus import _as_filter
+from src.core.event_bus import compiled_event_validator
+from src.core.event_writer import EventWriter
+from src.core.run_store import open_event_writer
+
+
+class AsyncEventBusError(RuntimeError):
+    pass
+
+
+_CLOSED = object()
+
+
+class AsyncEventSubscription:
+    """Bounded per-subscriber queue, consumed with ``async for``."""
+
+    def __init__(self, subscription: EventSubscription, queue_size: int) -> None:
+        self.subscription = subscription
+        self._queue: asyncio.Queue[Any] = asyncio.Queue(maxsize=queue_size)
+
+    async def _deliver(self, event: Any, closing: asyncio.Event) -> None:
+        """Wait for room until the bus starts closing, then stop waiting on this reader."""
+        if not closing.is_set() and self._queue.full():
+            put = asyncio.ensure_future(self._queue.put(event))
+            closed = asyncio.ensure_future(closing.wait())
+            await asyncio.wait((put, closed), return_when=asyncio.FIRST_COMPLETED)
+            closed.cancel()
+            if put.done():
+                return
+            put.cancel()
+        self._push(event)
+
+    def _push(self, event: Any) -> None:
+        # Never wait on a reader that may be gone: make room by dropping the oldest events.
+        while self._queue.full():
+            self._queue.get_nowait()
+        self._queue.put_nowait(event)
+
+    def _close(self) -> None:
+        self._push(_CLOSED)
+
+    async def get(self) -> dict[str, Any]:
+        event = await self._queue.get()
+        if event is _CLOSED:
+            self._queue.put_nowait(_CLOSED)
+            raise StopAsyncIteration
+        return event
+
+    def __aiter__(self) -> "AsyncEventSubscription":
+        return self
+
+    async def __anext__(self) -> dict[str, Any]:
+        return await self.get()
+
+
+class AsyncEventBus:
+    """Asyncio front end for concurrent collectors feeding one run.
+
+    ``publish`` validates with the shared compiled schema and enqueues into a
+    bounded queue, so producers wait when the writer falls behind. A single
+    writer task drains the queue into the run's ``EventWriter`` and then fans
+    events out to subscribers; a full subscriber queue stalls the writer too,
+    which propagates backpressure to publishers instead of dropping events.
+    The writer is flushed whenever the queue runs dry (group commit).
+
+    If the writer task fails, ``publish`` raises its exception instead of
+    waiting on a queue nobody drains, and ``close`` re-raises it after
+    closing every subscription. Closing never waits on a subscriber: once
+    ``close`` starts, a full subscriber queue drops its oldest events to make
+    room for the remaining events and the end marker.
+    """
+
+    def __init__(
+        self,
+        writer: EventWriter | None = None,
+        queue_size: int = 1024,
+        subscriber_queue_size: int = 256,
+        drain_batch: int = 256,
+    ) -> None:
+        if queue_size < 1 or subscriber_queue_size < 1 or drain_batch < 1:
+            raise AsyncEventBusError("queue sizes and drain_batch must be >= 1")
+        self._writer = writer
+        self._validator = compiled_event_validator()
+        self.queue_size = queue_size
+        self.subscriber_queue_size = subscriber_queue_size
+        self.drain_batch = drain_batch
+        self._queue: asyncio.Queue[Any] | None = None
+        self._writer_task: asyncio.Task[None] | None = None
+        self._subscribers: list[AsyncEventSubscription] = []
+        self._closing = asyncio.Event()
+        self._next_subscription_id = 1
+        self._id_base = writer.event_count if writer is not None else 0
+        self._issued_ids = 0
+        self.published_count = 0
+        self.written_count = 0
+
+    @classmethod
+    def for_run(cls, run_root: Path, run_id: str, **options: Any) -> "AsyncEventBus":
+        return cls(writer=open_event_writer(run_root, run_id), **options)
+
+    @property
+    def running(self) -> bool:
+        return self._writer_task is not None and not self._writer_task.done()
+
+    def next_event_id(self) -> str:
+        """Allocate an event id; ids stay unique while events wait in the queue.
+
+        The bus must be the only producer for its writer while it is running.
+        """
+        if self._writer is None:
+            raise AsyncEventBusError("event ids require a writer")
+        self._issued_ids += 1
+        return f"{self._writer.run_id}-e{self._id_base + self._issued_ids}"
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._closing = asyncio.Event()
+        self._writer_task = asyncio.create_task(self._drain(self._queue))
+
+    @staticmethod
+    def _raise_if_failed(task: asyncio.Task[None]) -> None:
+        if not task.done():
+            return
+        error = None if task.cancelled() else task.exception()
+        if error is not None:
+            raise error
+        raise AsyncEventBusError("async event bus is not running")
+
+    @staticmethod
+    async def _enqueue(queue: asyncio.Queue[Any], writer_task: asyncio.Task[None], item: Any) -> bool:
+        """Put ``item`` on the queue; ``False`` if the writer task ended while waiting for room."""
+        if not queue.full():
+            queue.put_nowait(item)
+            return True
+        put = asyncio.ensure_future(queue.put(item))
+        await asyncio.wait((put, writer_task), return_when=asyncio.FIRST_COMPLETED)
+        if put.done():
+            return True
+        put.cancel()
+        return False
+
+    async def publish(self, event: dict[str, Any]) -> dict[str, Any]:
+        queue, writer_task = self._queue, self._writer_task
+        if queue is None or writer_task is None or self._closing.is_set():
+            raise AsyncEventBusError("async event bus is not running")
+        self._raise_if_failed(writer_task)
+        self._validator.validate(event)
+        if not await self._enqueue(queue, writer_task, event):
+            self._raise_if_failed(writer_task)
+        self.published_count += 1
+        return event
+
+    async def subscribe(
+        self,
+        topic: str = "*",
+        phase: str | Iterable[str] | None = None,
+        severity: str | Iterable[str] | None = None,
+        queue_size: int | None = None,
+    ) -> AsyncEventSubscription:
+        subscription = AsyncEventSubscription(
+            EventSubscription(
+                subscription_id=self._next_subscription_id,
+                handler=lambda event: None,
+                topic=topic,
+                phases=_as_filter(phase),
+                severities=_as_filter(severity),
+            ),
+            queue_size=queue_size or self.subscriber_queue_size,
+        )
+        self._next_subscription_id += 1
+        self._subscribers.append(subscription)
+        return subscription
+
+    async def _drain(self, queue: asyncio.Queue[Any]) -> None:
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.drain_batch and not queue.empty():
+                batch.append(queue.get_nowait())
+            for event in batch:
+                if event is _CLOSED:
+                    return
+                if self._writer is not None:
+                    self._writer.write(event)
+                self.written_count += 1
+                for subscriber in self._subscribers:
+                    item = subscriber.subscription
+                    if (item.topic == "*" or item.topic == event["tool"]) and item.matches(event):
+                        await subscriber._deliver(event, self._closing)
+            if queue.empty() and self._writer is not None:
+                self._writer.flush()
+
+    async def close(self) -> None:
+        if self._queue is None or self._writer_task is None:
+            return
+        writer_task = self._writer_task
+        self._closing.set()
+        try:
+            if not writer_task.done():
+                await self._enqueue(self._queue, writer_task, _CLOSED)
+            await writer_task
+            if self._writer is not None:
+                self._writer.flush()
+        finally:
+            for subscriber in self._subscribers:
+                subscriber._close()
+            self._writer_task = None
+            self._queue = None
+
+    async def __aenter__(self) -> "AsyncEventBus":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.close()
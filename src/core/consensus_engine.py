@@ -5,8 +5,15 @@ from datetime import datetime, UTC
 from typing import Any
 from uuid import uuid4
 
+from src.core.agent_dispatcher import is_agent_failure
+from src.core.veto_gate import VetoDecision
 from src.core.veto_gate import VetoGate
 
+try:
+    import numpy
+except ImportError:  # optional: the pure-Python path gives identical scores
+    numpy = None
+
 
 @dataclass(frozen=True, slots=True)
 class ConsensusInput:
@@ -16,33 +23,108 @@ class ConsensusInput:
     evidence_refs: tuple[str, ...]
 
 
+@dataclass(frozen=True, slots=True)
+class ConsensusTopic:
+    """One ``evaluate`` call's worth of input for ``evaluate_many``."""
+
+    topic: str
+    agent_results: list[dict[str, Any]]
+    required_evidence: frozenset[str] = frozenset()
+    min_quorum: int = 1
+
+
+def _row_sums(rows: list[int], columns: list[int], values: list[float], shape: tuple[int, int]) -> list[float]:
+    """Row sums of a sparse claims x agents matrix given as coordinate triplets.
+
+    Each row is accumulated column by column from ``0.0``, the same order
+    as the scalar path's running total per claim, so scores are
+    bit-identical (built-in ``sum`` may use compensated summation, and an
+    empty cell adds ``0.0``, which leaves an IEEE sum unchanged).
+    """
+    if numpy is not None and values:
+        matrix = numpy.zeros(shape, dtype=numpy.float64)
+        matrix[rows, columns] = values
+        totals = numpy.zeros(shape[0], dtype=numpy.float64)
+        for column in range(shape[1]):
+            totals += matrix[:, column]
+        return totals.tolist()
+    totals_list = [0.0] * shape[0]
+    # Triplets arrive in agent order within each row, so this is the same running total.
+    for row, value in zip(rows, values):
+        totals_list[row] += value
+    return totals_list
+
+
+def _missing_evidence(required: list[frozenset[str]], available: list[set[str]]) -> list[list[str]]:
+    """Sorted required evidence that no agent supplied, per topic.
+
+    With NumPy this is one topics x refs veto mask, ``required & ~available``,
+    over the sorted vocabulary of required refs, so each row's missing
+    columns already come out in sorted order.
+    """
+    vocabulary = sorted(set().union(*required))
+    if numpy is None or not vocabulary:
+        return [sorted(needed - supplied) for needed, supplied in zip(required, available)]
+    columns = {ref: index for index, ref in enumerate(vocabulary)}
+    shape = (len(required), len(vocabulary))
+    masks = []
+    for refs_by_topic in (required, available):
+        mask = numpy.zeros(shape, dtype=bool)
+        cells = [(row, columns[ref]) for row, refs in enumerate(refs_by_topic) for ref in refs if ref in columns]
+        if cells:
+            rows, cols = zip(*cells)
+            mask[list(rows), list(cols)] = True
+        masks.append(mask)
+    missing = masks[0] & ~masks[1]
+    vetoed = missing.any(axis=1).tolist()
+    return [
+        [vocabulary[column] for column in numpy.flatnonzero(missing[row]).tolist()] if vetoed[row] else []
+        for row in range(shape[0])
+    ]
+
+
+def _quorum_met(answered: list[int], min_quorums: list[int]) -> list[bool]:
+    if numpy is not None and answered:
+        return (numpy.asarray(answered) >= numpy.maximum(numpy.asarray(min_quorums), 1)).tolist()
+    return [count >= max(1, quorum) for count, quorum in zip(answered, min_quorums)]
+
+
+def _rank_claims(topic_of_row: list[int], scores: list[float]) -> list[int]:
+    """Claim rows grouped by topic, highest score first, ties kept in row (first-seen) order.
+
+    That is what the scalar path's stable ``sorted(..., reverse=True)`` gives
+    for each topic's claims.
+    """
+    if numpy is not None and scores:
+        order = numpy.arange(len(scores))
+        return numpy.lexsort((order, -numpy.asarray(scores), numpy.asarray(topic_of_row))).tolist()
+    return sorted(range(len(scores)), key=lambda row: (topic_of_row[row], -scores[row], row))
+
+
 class ConsensusEngine:
     def __init__(self) -> None:
         self._veto_gate = VetoGate()
 
-    def evaluate(
+    @staticmethod
+    def _failure_entry(item: dict[str, Any]) -> dict[str, str]:
+        return {
+            "agent_id": str(item["agent_id"]),
+            "code": str(item["failure"].get("code", "error")),
+            "message": str(item["failure"].get("message", "")),
+        }
+
+    def _base_payload(
         self,
         run_id: str,
         topic: str,
-        agent_results: list[dict[str, Any]],
-        required_evidence: set[str],
+        answered: int,
+        available_evidence: set[str],
+        failed_agents: list[dict[str, str]],
+        required_evidence: set[str] | frozenset[str],
+        min_quorum: int,
+        veto: VetoDecision,
+        quorum_met: bool,
     ) -> dict[str, Any]:
-        normalized: list[ConsensusInput] = []
-        for item in agent_results:
-            normalized.append(
-                ConsensusInput(
-                    agent_id=str(item["agent_id"]),
-                    claim=str(item["claim"]),
-                    confidence=float(item["confidence"]),
-                    evidence_refs=tuple(str(ref) for ref in item.get("evidence_refs", [])),
-                )
-            )
-
-        available_evidence: set[str] = set()
-        for item in normalized:
-            available_evidence.update(item.evidence_refs)
-
-        veto = self._veto_gate.evaluate(required_evidence=required_evidence, available_evidence=available_evidence)
         consensus_id = f"consensus-{uuid4().hex[:12]}"
         base_payload: dict[str, Any] = {
             "consensus_id": consensus_id,
@@ -54,6 +136,7 @@ class ConsensusEngine:
             "dissenting_claims": [],
             "vetoed": veto.vetoed,
             "veto_reasons": [],
+            "failed_agents": failed_agents,
             "evaluated_at": datetime.now(UTC).isoformat(),
         }
 
@@ -66,15 +149,23 @@ class ConsensusEngine:
                 }
                 for reason in veto.reasons
             ]
-            return base_payload
-
-        claim_scores: dict[str, float] = {}
-        claim_evidence: dict[str, set[str]] = {}
-        for item in normalized:
-            claim_scores[item.claim] = claim_scores.get(item.claim, 0.0) + item.confidence
-            claim_evidence.setdefault(item.claim, set()).update(item.evidence_refs)
+        if not quorum_met:
+            base_payload["vetoed"] = True
+            base_payload["veto_reasons"].append(
+                {
+                    "code": "quorum-not-met",
+                    "message": f"quorum not met: {answered} of {max(1, min_quorum)} agents answered",
+                    "required_evidence": sorted(required_evidence),
+                }
+            )
+        return base_payload
 
-        sorted_claims = sorted(claim_scores.items(), key=lambda pair: pair[1], reverse=True)
+    @staticmethod
+    def _apply_scores(
+        base_payload: dict[str, Any],
+        sorted_claims: list[tuple[str, float]],
+        claim_evidence: dict[str, set[str]],
+    ) -> None:
         winning_claim, winning_score = sorted_claims[0]
         dissenting = [
             {"claim": claim, "score": score, "evidence_refs": sorted(claim_evidence.get(claim, set()))}
@@ -84,4 +175,135 @@ class ConsensusEngine:
         base_payload["winning_claim"] = winning_claim
         base_payload["weighted_score"] = winning_score
         base_payload["dissenting_claims"] = dissenting
+
+    def evaluate(
+        self,
+        run_id: str,
+        topic: str,
+        agent_results: list[dict[str, Any]],
+        required_evidence: set[str],
+        min_quorum: int = 1,
+    ) -> dict[str, Any]:
+        normalized: list[ConsensusInput] = []
+        failed_agents: list[dict[str, str]] = []
+        for item in agent_results:
+            if is_agent_failure(item):
+                failed_agents.append(self._failure_entry(item))
+                continue
+            normalized.append(
+                ConsensusInput(
+                    agent_id=str(item["agent_id"]),
+                    claim=str(item["claim"]),
+                    confidence=float(item["confidence"]),
+                    evidence_refs=tuple(str(ref) for ref in item.get("evidence_refs", [])),
+                )
+            )
+
+        available_evidence: set[str] = set()
+        for item in normalized:
+            available_evidence.update(item.evidence_refs)
+
+        veto = self._veto_gate.evaluate(required_evidence=set(required_evidence), available_evidence=available_evidence)
+        base_payload = self._base_payload(
+            run_id,
+            topic,
+            len(normalized),
+            available_evidence,
+            failed_agents,
+            required_evidence,
+            min_quorum,
+            veto,
+            len(normalized) >= max(1, min_quorum),
+        )
+        if base_payload["vetoed"]:
+            return base_payload
+
+        claim_scores: dict[str, float] = {}
+        claim_evidence: dict[str, set[str]] = {}
+        for item in normalized:
+            claim_scores[item.claim] = claim_scores.get(item.claim, 0.0) + item.confidence
+            claim_evidence.setdefault(item.claim, set()).update(item.evidence_refs)
+
+        sorted_claims = sorted(claim_scores.items(), key=lambda pair: pair[1], reverse=True)
+        self._apply_scores(base_payload, sorted_claims, claim_evidence)
         return base_payload
+
+    def evaluate_many(self, run_id: str, topics: list[ConsensusTopic]) -> list[dict[str, Any]]:
+        """Score many topics at once; each payload equals what ``evaluate`` returns for that topic.
+
+        Agent results are read straight into columns instead of one
+        ``ConsensusInput`` per agent. Every claim of every topic is a row of
+        one sparse claims x agents confidence matrix. Claim scores, the
+        missing-evidence veto mask, the quorum mask and the per-topic
+        ranking of claims (winner first, then dissent) are each computed for
+        all topics in one pass, vectorized with NumPy when it is installed.
+        Vetoed topics keep their rows, which are simply not read back. Only
+        ``consensus_id`` and ``evaluated_at`` differ from the scalar path.
+        """
+        rows: list[int] = []
+        columns: list[int] = []
+        values: list[float] = []
+        width = 0
+        row_claims: list[str] = []
+        topic_of_row: list[int] = []
+        answered_by_topic: list[int] = []
+        available_by_topic: list[set[str]] = []
+        failed_by_topic: list[list[dict[str, str]]] = []
+        evidence_by_topic: list[dict[str, set[str]]] = []
+        for index, item in enumerate(topics):
+            failed_agents: list[dict[str, str]] = []
+            claim_rows: dict[str, int] = {}
+            claim_evidence: dict[str, set[str]] = {}
+            available_evidence: set[str] = set()
+            answered = 0
+            for result in item.agent_results:
+                if is_agent_failure(result):
+                    failed_agents.append(self._failure_entry(result))
+                    continue
+                claim = str(result["claim"])
+                row = claim_rows.get(claim)
+                if row is None:
+                    row = claim_rows[claim] = len(row_claims)
+                    row_claims.append(claim)
+                    topic_of_row.append(index)
+                    claim_evidence[claim] = set()
+                rows.append(row)
+                columns.append(answered)
+                values.append(float(result["confidence"]))
+                refs = [str(ref) for ref in result.get("evidence_refs", [])]
+                claim_evidence[claim].update(refs)
+                available_evidence.update(refs)
+                answered += 1
+            width = max(width, answered)
+            answered_by_topic.append(answered)
+            available_by_topic.append(available_evidence)
+            failed_by_topic.append(failed_agents)
+            evidence_by_topic.append(claim_evidence)
+
+        scores = _row_sums(rows, columns, values, (len(row_claims), width))
+        missing = _missing_evidence([item.required_evidence for item in topics], available_by_topic)
+        quorum_met = _quorum_met(answered_by_topic, [item.min_quorum for item in topics])
+        ranked = _rank_claims(topic_of_row, scores)
+
+        payloads: list[dict[str, Any]] = []
+        position = 0
+        for index, item in enumerate(topics):
+            claim_count = len(evidence_by_topic[index])
+            topic_rows = ranked[position : position + claim_count]
+            position += claim_count
+            base_payload = self._base_payload(
+                run_id,
+                item.topic,
+                answered_by_topic[index],
+                available_by_topic[index],
+                failed_by_topic[index],
+                item.required_evidence,
+                item.min_quorum,
+                self._veto_gate.decision(missing[index]),
+                quorum_met[index],
+            )
+            if not base_payload["vetoed"]:
+                sorted_claims = [(row_claims[row], scores[row]) for row in topic_rows]
+                self._apply_scores(base_payload, sorted_claims, evidence_by_topic[index])
+            payloads.append(base_payload)
+        return payloads
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from enum import Enum
+import json
+import os
+from pathlib import Path
+from typing import Any, BinaryIO
+from uuid import uuid4
+
+
+class DurableWriteError(OSError):
+    pass
+
+
+class Durability(str, Enum):
+    """How hard a write tries to survive a crash.
+
+    ``none``: write in place; a crash can leave a truncated file.
+    ``atomic``: temp file + rename; readers see old or new content, but the
+    new content may be lost on power failure.
+    ``fsync``: ``atomic`` plus fsync of the temp file before the rename.
+    ``fsync-dir``: ``fsync`` plus fsync of the parent directory, so the rename
+    itself is durable.
+    """
+
+    NONE = "none"
+    ATOMIC = "atomic"
+    FSYNC = "fsync"
+    FSYNC_DIR = "fsync-dir"
+
+
+def _fsync_dir(directory: Path) -> None:
+    flags = os.O_RDONLY | getattr(os, "O_DIRECTORY", 0)
+    try:
+        fd = os.open(directory, flags)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _temp_path(path: Path) -> Path:
+    return path.with_name(f".{path.name}.{uuid4().hex[:8]}.tmp")
+
+
+def _write_temp(path: Path, data: bytes, fsync: bool) -> Path:
+    temp_path = _temp_path(path)
+    with temp_path.open("wb") as file:
+        file.write(data)
+        if fsync:
+            file.flush()
+            os.fsync(file.fileno())
+    return temp_path
+
+
+def dump_json(payload: Any) -> str:
+    return json.dumps(payload, ensure_ascii=False, indent=2)
+
+
+def atomic_write_bytes(path: Path, data: bytes, durability: Durability | str = Durability.FSYNC) -> Path:
+    resolved = Durability(durability)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if resolved == Durability.NONE:
+        path.write_bytes(data)
+        return path
+    temp_path = _write_temp(path, data, fsync=resolved in (Durability.FSYNC, Durability.FSYNC_DIR))
+    try:
+        os.replace(temp_path, path)
+    except OSError as error:
+        temp_path.unlink(missing_ok=True)
+        raise DurableWriteError(f"atomic rename failed: {path}: {error}") from error
+    if resolved == Durability.FSYNC_DIR:
+        _fsync_dir(path.parent)
+    return path
+
+
+def atomic_write_text(path: Path, text: str, durability: Durability | str = Durability.FSYNC) -> Path:
+    return atomic_write_bytes(path, text.encode("utf-8"), durability)
+
+
+def atomic_write_json(path: Path, payload: Any, durability: Durability | str = Durability.FSYNC) -> Path:
+    return atomic_write_text(path, dump_json(payload), durability)
+
+
+@contextmanager
+def atomic_open(path: Path, durability: Durability | str = Durability.FSYNC) -> Iterator[BinaryIO]:
+    """Stream into a temp file that replaces ``path`` only if the block succeeds.
+
+    For outputs too large to build in memory before ``atomic_write_bytes``.
+    """
+    resolved = Durability(durability)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = _temp_path(path)
+    try:
+        with temp_path.open("wb") as file:
+            yield file
+            if resolved in (Durability.FSYNC, Durability.FSYNC_DIR):
+                file.flush()
+                os.fsync(file.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+    if resolved == Durability.FSYNC_DIR:
+        _fsync_dir(path.parent)
+
+
+class AtomicBatch:
+    """Stage several files and commit them together.
+
+    ``commit`` writes every temp file, fsyncs them (per durability), renames
+    them into place and fsyncs each touched directory once. Renames are
+    individually atomic, so a crash mid-commit leaves every file either old
+    or new, never truncated. Leaving the ``with`` block on an exception
+    discards the staged files.
+    """
+
+    def __init__(self, durability: Durability | str = Durability.FSYNC) -> None:
+        self.durability = Durability(durability)
+        self._staged: dict[Path, bytes] = {}
+
+    def stage_bytes(self, path: Path, data: bytes) -> None:
+        self._staged[path] = data
+
+    def stage_text(self, path: Path, text: str) -> None:
+        self.stage_bytes(path, text.encode("utf-8"))
+
+    def stage_json(self, path: Path, payload: Any) -> None:
+        self.stage_text(path, dump_json(payload))
+
+    def commit(self) -> list[Path]:
+        staged = list(self._staged.items())
+        self._staged.clear()
+        for path, _ in staged:
+            path.parent.mkdir(parents=True, exist_ok=True)
+        if self.durability == Durability.NONE:
+            for path, data in staged:
+                path.write_bytes(data)
+            return [path for path, _ in staged]
+
+        fsync = self.durability in (Durability.FSYNC, Durability.FSYNC_DIR)
+        temps: list[tuple[Path, Path]] = []
+        try:
+            for path, data in staged:
+                temps.append((_write_temp(path, data, fsync), path))
+            for temp_path, path in temps:
+                os.replace(temp_path, path)
+        except OSError as error:
+            for temp_path, _ in temps:
+                temp_path.unlink(missing_ok=True)
+            raise DurableWriteError(f"batch commit failed: {error}") from error
+        if self.durability == Durability.FSYNC_DIR:
+            for directory in sorted({path.parent for path, _ in staged}):
+                _fsync_dir(directory)
+        return [path for path, _ in staged]
+
+    def __enter__(self) -> "AtomicBatch":
+        return self
+
+    def __exit__(self, exc_type: object, *exc_info: object) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self._staged.clear()
@@ -1,14 +1,48 @@
 from __future__ import annotations
 
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import count
 import json
 from pathlib import Path
+import re
 from typing import Any
 
+from src.core.event_writer import EventWriter
+
 
 class EventValidationError(ValueError):
     pass
 
 
+FieldCheck = Callable[[Any], None]
+
+_JSON_TYPES: dict[str, tuple[type, ...]] = {
+    "string": (str,),
+    "integer": (int,),
+    "number": (int, float),
+    "boolean": (bool,),
+    "object": (dict,),
+    "array": (list, tuple),
+}
+
+
+class _FieldError(Exception):
+    """Internal failure carrying the path; only built when validation fails."""
+
+    def __init__(self, path: str, message: str) -> None:
+        super().__init__(message)
+        self.path = path
+        self.message = message
+
+    def nested(self, parent: str) -> "_FieldError":
+        separator = "" if self.path.startswith("[") else "."
+        path = f"{parent}{separator}{self.path}" if self.path else parent
+        return _FieldError(path, self.message)
+
+
+@lru_cache(maxsize=1)
 def _load_event_schema() -> dict[str, Any]:
     root = Path(__file__).resolve().parents[2]
     schema_path = root / "specs" / "001-debug-loop" / "contracts" / "event-schema.json"
@@ -16,28 +50,275 @@ def _load_event_schema() -> dict[str, Any]:
         return json.load(file)
 
 
+def _compile_field(schema: dict[str, Any]) -> FieldCheck:
+    """Compile the JSON-schema subset used by the contracts into one closure.
+
+    Supported keywords: type, enum, minLength, minimum, pattern, items,
+    required, properties and ``additionalProperties: false``. Every keyword is
+    resolved up front so a field costs a single call at validation time.
+    """
+    type_name = schema.get("type")
+    allowed_types = _JSON_TYPES[type_name] if type_name is not None else None
+    reject_bool = type_name in ("integer", "number")
+    allowed_values = frozenset(schema["enum"]) if "enum" in schema else None
+    min_length = int(schema.get("minLength", 0))
+    minimum = schema.get("minimum")
+    pattern_text = schema.get("pattern", "")
+    match = re.compile(pattern_text).search if pattern_text else None
+    item_check = _compile_field(schema["items"]) if "items" in schema else None
+    object_check = _compile_object(schema) if "properties" in schema else None
+
+    def check_field(value: Any) -> None:
+        if allowed_types is not None:
+            if not isinstance(value, allowed_types) or (reject_bool and isinstance(value, bool)):
+                raise _FieldError("", f"expected {type_name}")
+        if allowed_values is not None and value not in allowed_values:
+            raise _FieldError("", f"value not allowed: {value}")
+        if min_length and len(value) < min_length:
+            raise _FieldError("", f"shorter than {min_length}")
+        if minimum is not None and value < minimum:
+            raise _FieldError("", f"below minimum {minimum}")
+        if match is not None and match(value) is None:
+            raise _FieldError("", f"does not match {pattern_text}")
+        if item_check is not None:
+            for index, item in enumerate(value):
+                try:
+                    item_check(item)
+                except _FieldError as error:
+                    raise error.nested(f"[{index}]") from None
+        if object_check is not None:
+            object_check(value)
+
+    return check_field
+
+
+def _compile_object(schema: dict[str, Any]) -> FieldCheck:
+    required = frozenset(schema.get("required", []))
+    properties = {key: _compile_field(value) for key, value in schema["properties"].items()}
+    allowed = frozenset(properties)
+    closed = schema.get("additionalProperties", True) is False
+
+    def check_object(value: Any) -> None:
+        keys = value.keys()
+        if not required <= keys:
+            raise _FieldError("", f"missing fields: {', '.join(sorted(required - keys))}")
+        if closed and not keys <= allowed:
+            raise _FieldError("", f"unknown fields: {', '.join(sorted(keys - allowed))}")
+        for key, item in value.items():
+            check = properties.get(key)
+            if check is None:
+                continue
+            try:
+                check(item)
+            except _FieldError as error:
+                raise error.nested(key) from None
+
+    return check_object
+
+
+class CompiledEventValidator:
+    """Event validator compiled once from ``event-schema.json``."""
+
+    def __init__(self, schema: dict[str, Any]) -> None:
+        self.required_fields = frozenset(schema["required"])
+        self.allowed_fields = frozenset(schema["properties"].keys())
+        self._field_checks = {key: _compile_field(value) for key, value in schema["properties"].items()}
+
+    def validate(self, event: dict[str, Any]) -> None:
+        if not isinstance(event, dict):
+            raise EventValidationError("event must be an object")
+        keys = event.keys()
+        if not self.required_fields <= keys:
+            missing_fields = ", ".join(sorted(self.required_fields - keys))
+            raise EventValidationError(f"missing fields: {missing_fields}")
+        if not keys <= self.allowed_fields:
+            unknown_fields = ", ".join(sorted(keys - self.allowed_fields))
+            raise EventValidationError(f"unknown fields: {unknown_fields}")
+        field_checks = self._field_checks
+        for key, value in event.items():
+            try:
+                field_checks[key](value)
+            except _FieldError as error:
+                failure = error.nested(key)
+                raise EventValidationError(f"{failure.path}: {failure.message}") from None
+
+    def validate_batch(self, events: list[dict[str, Any]]) -> None:
+        validate = self.validate
+        for index, event in enumerate(events):
+            try:
+                validate(event)
+            except EventValidationError as error:
+                raise EventValidationError(f"events[{index}]: {error}") from error
+
+
+@lru_cache(maxsize=1)
+def compiled_event_validator() -> CompiledEventValidator:
+    return CompiledEventValidator(_load_event_schema())
+
+
+EventHandler = Callable[[dict[str, Any]], None]
+
+
+def _as_filter(value: str | Iterable[str] | None) -> frozenset[str] | None:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return frozenset((value,))
+    return frozenset(str(item) for item in value)
+
+
+@dataclass(frozen=True, slots=True)
+class EventSubscription:
+    subscription_id: int
+    handler: EventHandler
+    topic: str
+    phases: frozenset[str] | None
+    severities: frozenset[str] | None
+
+    def matches(self, event: dict[str, Any]) -> bool:
+        if self.phases is not None and event["phase"] not in self.phases:
+            return False
+        if self.severities is not None and event["severity"] not in self.severities:
+            return False
+        return True
+
+
+class EventCursor:
+    """Read position over an EventBus ring buffer.
+
+    ``read`` yields events straight from the ring without copying. Events
+    evicted before the cursor reached them are skipped and counted in
+    ``missed``.
+    """
+
+    def __init__(self, bus: "EventBus", position: int) -> None:
+        self._bus = bus
+        self.position = position
+        self.missed = 0
+
+    @property
+    def pending(self) -> int:
+        return self._bus.published_count - self.position
+
+    def read(self, max_events: int | None = None) -> Iterator[dict[str, Any]]:
+        oldest = self._bus.oldest_position
+        if self.position < oldest:
+            self.missed += oldest - self.position
+            self.position = oldest
+        end = self._bus.published_count
+        if max_events is not None:
+            end = min(end, self.position + max_events)
+        while self.position < end:
+            event = self._bus._event_at(self.position)
+            self.position += 1
+            yield event
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        return self.read()
+
+
 class EventBus:
-    def __init__(self) -> None:
-        self._schema = _load_event_schema()
-        self._required_fields = set(self._schema["required"])
-        self._allowed_fields = set(self._schema["properties"].keys())
-        self._events: list[dict[str, Any]] = []
+    """Validating event bus with topic subscriptions and a bounded ring buffer.
+
+    Topics are the event ``tool`` (``uart``, ``tracezone``, ...). Only the
+    most recent ``capacity`` events are retained; ``dropped_count`` reports
+    how many were overwritten.
+    """
+
+    DEFAULT_CAPACITY = 4096
+
+    def __init__(self, writer: EventWriter | None = None, capacity: int = DEFAULT_CAPACITY) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self._writer = writer
+        self._validator = compiled_event_validator()
+        self._required_fields = self._validator.required_fields
+        self._allowed_fields = self._validator.allowed_fields
+        self.capacity = capacity
+        self._ring: list[Any] = [None] * capacity
+        self._published = 0
+        self._subscription_ids = count(1)
+        self._subscriptions: dict[int, EventSubscription] = {}
+        self._by_topic: dict[str, tuple[EventSubscription, ...]] = {}
+
+    @property
+    def published_count(self) -> int:
+        return self._published
+
+    @property
+    def retained_count(self) -> int:
+        return min(self._published, self.capacity)
+
+    @property
+    def dropped_count(self) -> int:
+        return max(0, self._published - self.capacity)
+
+    @property
+    def oldest_position(self) -> int:
+        return self.dropped_count
 
     @property
     def events(self) -> list[dict[str, Any]]:
-        return list(self._events)
+        """Copy of the retained events; prefer ``cursor``/``iter_events`` on hot paths."""
+        return list(self.iter_events())
+
+    def _event_at(self, position: int) -> dict[str, Any]:
+        return self._ring[position % self.capacity]
+
+    def iter_events(self) -> Iterator[dict[str, Any]]:
+        for position in range(self.oldest_position, self._published):
+            yield self._event_at(position)
+
+    def cursor(self, from_start: bool = True) -> EventCursor:
+        position = self.oldest_position if from_start else self._published
+        return EventCursor(self, position)
+
+    def subscribe(
+        self,
+        handler: EventHandler,
+        topic: str = "*",
+        phase: str | Iterable[str] | None = None,
+        severity: str | Iterable[str] | None = None,
+    ) -> int:
+        subscription = EventSubscription(
+            subscription_id=next(self._subscription_ids),
+            handler=handler,
+            topic=topic,
+            phases=_as_filter(phase),
+            severities=_as_filter(severity),
+        )
+        self._subscriptions[subscription.subscription_id] = subscription
+        self._by_topic[topic] = self._by_topic.get(topic, ()) + (subscription,)
+        return subscription.subscription_id
+
+    def unsubscribe(self, subscription_id: int) -> None:
+        subscription = self._subscriptions.pop(subscription_id, None)
+        if subscription is None:
+            return
+        remaining = tuple(item for item in self._by_topic[subscription.topic] if item is not subscription)
+        if remaining:
+            self._by_topic[subscription.topic] = remaining
+        else:
+            del self._by_topic[subscription.topic]
 
     def validate(self, event: dict[str, Any]) -> None:
-        missing = self._required_fields - set(event.keys())
-        if missing:
-            missing_fields = ", ".join(sorted(missing))
-            raise EventValidationError(f"missing fields: {missing_fields}")
-        unknown = set(event.keys()) - self._allowed_fields
-        if unknown:
-            unknown_fields = ", ".join(sorted(unknown))
-            raise EventValidationError(f"unknown fields: {unknown_fields}")
+        self._validator.validate(event)
+
+    def validate_batch(self, events: list[dict[str, Any]]) -> None:
+        self._validator.validate_batch(events)
 
     def publish(self, event: dict[str, Any]) -> dict[str, Any]:
         self.validate(event)
-        self._events.append(event)
+        self._ring[self._published % self.capacity] = event
+        self._published += 1
+        if self._writer is not None:
+            self._writer.write(event)
+        if self._by_topic:
+            self._notify(event)
         return event
+
+    def _notify(self, event: dict[str, Any]) -> None:
+        for topic in (event["tool"], "*"):
+            for subscription in self._by_topic.get(topic, ()):
+                if subscription.matches(event):
+                    subscription.handler(event)
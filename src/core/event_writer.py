@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+from enum import Enum
+import json
+import os
+from pathlib import Path
+from time import monotonic
+from typing import Any, BinaryIO, Callable
+
+from src.core.durable_io import Durability
+from src.core.durable_io import atomic_write_json
+
+try:
+    import fcntl
+except ImportError:  # non-POSIX: single writer per run is by convention only
+    fcntl = None
+
+
+class EventWriterError(ValueError):
+    pass
+
+
+class FsyncPolicy(str, Enum):
+    NONE = "none"
+    BATCH = "batch"
+    EVENT = "event"
+
+
+def _count_event_lines(path: Path, offset: int) -> tuple[int, int]:
+    """Count complete non-empty lines from ``offset``; never modifies the file.
+
+    Returns ``(line_count, end_offset)`` where ``end_offset`` is the end of
+    the last complete line. A trailing line without its newline may still
+    be in flight from the writer, so it is neither counted nor touched.
+    """
+    count = 0
+    end_offset = offset
+    with path.open("rb") as file:
+        file.seek(offset)
+        for line in file:
+            if not line.endswith(b"\n"):
+                break
+            end_offset += len(line)
+            if line.strip():
+                count += 1
+    return count, end_offset
+
+
+def save_event_seq(seq_path: Path, run_id: str, seq: dict[str, int]) -> None:
+    payload = {"run_id": run_id, "event_count": seq["event_count"], "byte_offset": seq["byte_offset"]}
+    atomic_write_json(seq_path, payload, Durability.ATOMIC)
+
+
+def _read_event_seq(seq_path: Path) -> dict[str, int]:
+    if seq_path.exists():
+        try:
+            stored = json.loads(seq_path.read_text(encoding="utf-8"))
+            return {"event_count": int(stored["event_count"]), "byte_offset": int(stored["byte_offset"])}
+        except (ValueError, KeyError, TypeError):
+            pass
+    return {"event_count": 0, "byte_offset": 0}
+
+
+def load_event_seq(events_path: Path, seq_path: Path) -> dict[str, int]:
+    """Return the event sequence, reconciled against the events JSONL; read-only.
+
+    The sidecar stores ``event_count`` and the ``byte_offset`` it covers. When
+    the JSONL size matches the offset the count is trusted as-is (one stat).
+    A longer file means a crash between append and sidecar update (or a
+    writer mid-flush), so the complete lines of the unrecorded tail are
+    added; a shorter or missing file forces a recount. Readers never write:
+    repairs happen only in ``recover_event_seq`` when a writer opens.
+    """
+    seq = _read_event_seq(seq_path)
+    size = events_path.stat().st_size if events_path.exists() else 0
+    if size == seq["byte_offset"]:
+        return seq
+    if size < seq["byte_offset"]:
+        seq = {"event_count": 0, "byte_offset": 0}
+    tail_count, end_offset = _count_event_lines(events_path, seq["byte_offset"]) if size else (0, 0)
+    return {"event_count": seq["event_count"] + tail_count, "byte_offset": end_offset}
+
+
+def recover_event_seq(events_path: Path, seq_path: Path, run_id: str) -> dict[str, int]:
+    """Writer-side recovery: drop a torn trailing line and rewrite a stale sidecar.
+
+    Only call this while holding the run's writer lock; a torn line is then
+    known to be left over from a crashed writer rather than an append in flight.
+    """
+    seq = load_event_seq(events_path, seq_path)
+    size = events_path.stat().st_size if events_path.exists() else 0
+    if size > seq["byte_offset"]:
+        with events_path.open("rb+") as file:
+            file.truncate(seq["byte_offset"])
+    if seq != _read_event_seq(seq_path):
+        save_event_seq(seq_path, run_id, seq)
+    return seq
+
+
+class EventWriter:
+    """Append-only, batching writer for one run's ``events.raw.jsonl``.
+
+    Serialized events are buffered in memory and flushed when the batch
+    reaches ``max_batch_events`` or ``max_batch_bytes``, when
+    ``flush_interval_s`` has elapsed since the last flush (checked on write),
+    when an event arrives in a different phase than the previous one, or on
+    an explicit ``flush``/``close``. The sequence sidecar is updated once per
+    flush; ``recover_event_seq`` repairs any lag after a crash when the next
+    writer opens.
+
+    Event ids come from the count cached at open, so there must be one
+    writer per run: the writer holds an exclusive ``flock`` on
+    ``<events>.lock`` until ``close`` and a second writer on the same run
+    raises ``EventWriterError``.
+    """
+
+    def __init__(
+        self,
+        events_path: Path,
+        seq_path: Path,
+        run_id: str,
+        fsync_policy: FsyncPolicy | str = FsyncPolicy.NONE,
+        max_batch_events: int = 256,
+        max_batch_bytes: int = 1 << 20,
+        flush_interval_s: float = 1.0,
+        clock: Callable[[], float] = monotonic,
+    ) -> None:
+        if max_batch_events < 1:
+            raise EventWriterError("max_batch_events must be >= 1")
+        if max_batch_bytes < 1:
+            raise EventWriterError("max_batch_bytes must be >= 1")
+        self.events_path = events_path
+        self.seq_path = seq_path
+        self.run_id = run_id
+        self.fsync_policy = FsyncPolicy(fsync_policy)
+        self.max_batch_events = max_batch_events
+        self.max_batch_bytes = max_batch_bytes
+        self.flush_interval_s = flush_interval_s
+        self._clock = clock
+        self.events_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock_file = self._acquire_lock()
+        try:
+            seq = recover_event_seq(self.events_path, self.seq_path, self.run_id)
+            self._file = self.events_path.open("ab")
+        except BaseException:
+            self._lock_file.close()
+            raise
+        self._flushed_count = seq["event_count"]
+        self._buffer: list[bytes] = []
+        self._buffer_bytes = 0
+        self._last_phase = ""
+        self._last_flush_at = self._clock()
+        self._closed = False
+
+    @property
+    def lock_path(self) -> Path:
+        return self.events_path.with_name(f"{self.events_path.name}.lock")
+
+    def _acquire_lock(self) -> BinaryIO:
+        lock_file = self.lock_path.open("ab")
+        if fcntl is not None:
+            try:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                lock_file.close()
+                raise EventWriterError(f"another event writer is open for run: {self.run_id}") from None
+        return lock_file
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    @property
+    def event_count(self) -> int:
+        return self._flushed_count + len(self._buffer)
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._buffer)
+
+    def next_event_id(self) -> str:
+        return f"{self.run_id}-e{self.event_count + 1}"
+
+    def write(self, event: dict[str, Any]) -> None:
+        if self._closed:
+            raise EventWriterError(f"event writer is closed: {self.run_id}")
+        phase = str(event.get("phase", ""))
+        if self._buffer and phase != self._last_phase:
+            self.flush()
+        self._last_phase = phase
+        line = (json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8")
+        self._buffer.append(line)
+        self._buffer_bytes += len(line)
+        if self.fsync_policy == FsyncPolicy.EVENT:
+            self.flush()
+            return
+        if len(self._buffer) >= self.max_batch_events or self._buffer_bytes >= self.max_batch_bytes:
+            self.flush()
+            return
+        if self._clock() - self._last_flush_at >= self.flush_interval_s:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._closed:
+            return
+        self._last_flush_at = self._clock()
+        if not self._buffer:
+            return
+        self._file.write(b"".join(self._buffer))
+        self._file.flush()
+        if self.fsync_policy != FsyncPolicy.NONE:
+            os.fsync(self._file.fileno())
+        self._flushed_count += len(self._buffer)
+        self._buffer.clear()
+        self._buffer_bytes = 0
+        save_event_seq(
+            self.seq_path,
+            self.run_id,
+            {"event_count": self._flushed_count, "byte_offset": self._file.tell()},
+        )
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self.flush()
+        self._file.close()
+        # Closing the descriptor releases the flock.
+        self._lock_file.close()
+        self._closed = True
+
+    def __enter__(self) -> "EventWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
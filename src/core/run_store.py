@@ -1,20 +1,33 @@
 from __future__ import annotations
 
+import atexit
 from datetime import datetime, UTC
 import json
+import os
 from pathlib import Path
 from time import time_ns
 from typing import Any
 
+from src.core.durable_io import Durability
+from src.core.durable_io import atomic_write_json
 from src.core.event_bus import EventBus
+from src.core.event_writer import EventWriter
+from src.core.event_writer import FsyncPolicy
+from src.core.event_writer import load_event_seq
 from src.core.state_machine import CorePhase
 from src.core.state_machine import CoreStateMachine
+from src.core.state_machine import ReplayResult
+from src.core.state_machine import TransitionAudit
+from src.core.state_machine import replay_transitions
 
 
 class RunStoreError(ValueError):
     pass
 
 
+_EVENT_WRITERS: dict[tuple[str, str], EventWriter] = {}
+
+
 def default_run_root(base: Path | None = None) -> Path:
     root = (base or Path.cwd()) / "tmp" / "runs"
     root.mkdir(parents=True, exist_ok=True)
@@ -41,6 +54,14 @@ def run_events_path(run_root: Path, run_id: str) -> Path:
     return _events_path(run_root, run_id)
 
 
+def _event_seq_path(run_root: Path, run_id: str) -> Path:
+    return _run_dir(run_root, run_id) / "index" / "event-seq.json"
+
+
+def _transitions_path(run_root: Path, run_id: str) -> Path:
+    return _run_dir(run_root, run_id) / "index" / "transitions.jsonl"
+
+
 def _ensure_layout(run_root: Path, run_id: str) -> Path:
     run_dir = _run_dir(run_root, run_id)
     (run_dir / "index").mkdir(parents=True, exist_ok=True)
@@ -49,14 +70,56 @@ def _ensure_layout(run_root: Path, run_id: str) -> Path:
     return run_dir
 
 
-def _write_json(path: Path, payload: dict[str, Any]) -> None:
-    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+def _write_json(path: Path, payload: dict[str, Any], durability: Durability = Durability.FSYNC) -> None:
+    atomic_write_json(path, payload, durability)
 
 
-def _append_event(path: Path, event: dict[str, Any]) -> None:
-    with path.open("a", encoding="utf-8") as file:
-        file.write(json.dumps(event, ensure_ascii=False))
-        file.write("\n")
+def _writer_key(run_root: Path, run_id: str) -> tuple[str, str]:
+    return (str(run_root.resolve()), run_id)
+
+
+def open_event_writer(
+    run_root: Path,
+    run_id: str,
+    fsync_policy: FsyncPolicy | str = FsyncPolicy.NONE,
+    max_batch_events: int = 256,
+    max_batch_bytes: int = 1 << 20,
+    flush_interval_s: float = 1.0,
+) -> EventWriter:
+    """Return the process-wide event writer for a run, opening it on first use.
+
+    Options only apply when the writer is opened; later calls reuse it.
+    """
+    key = _writer_key(run_root, run_id)
+    writer = _EVENT_WRITERS.get(key)
+    if writer is not None and not writer.closed:
+        return writer
+    writer = EventWriter(
+        events_path=_events_path(run_root, run_id),
+        seq_path=_event_seq_path(run_root, run_id),
+        run_id=run_id,
+        fsync_policy=fsync_policy,
+        max_batch_events=max_batch_events,
+        max_batch_bytes=max_batch_bytes,
+        flush_interval_s=flush_interval_s,
+    )
+    _EVENT_WRITERS[key] = writer
+    return writer
+
+
+def close_event_writer(run_root: Path, run_id: str) -> None:
+    writer = _EVENT_WRITERS.pop(_writer_key(run_root, run_id), None)
+    if writer is not None:
+        writer.close()
+
+
+def close_event_writers() -> None:
+    while _EVENT_WRITERS:
+        _, writer = _EVENT_WRITERS.popitem()
+        writer.close()
+
+
+atexit.register(close_event_writers)
 
 
 def create_run(
@@ -71,6 +134,7 @@ def create_run(
     run_meta_file = _run_meta_path(run_root, resolved_run_id)
     if run_meta_file.exists():
         raise RunStoreError(f"run already exists: {resolved_run_id}")
+    close_event_writer(run_root, resolved_run_id)
 
     machine = CoreStateMachine()
     started_at = datetime.now(UTC).isoformat()
@@ -83,13 +147,14 @@ def create_run(
         "state": machine.phase.value,
         "trigger": trigger,
         "summary_note": "",
-        "core_state": machine.snapshot(),
+        "core_state": _core_state(machine, log_offset=0),
     }
     _write_json(run_meta_file, payload)
 
-    event_bus = EventBus()
+    writer = open_event_writer(run_root, resolved_run_id)
+    event_bus = EventBus(writer=writer)
     bootstrap_event = {
-        "event_id": f"{resolved_run_id}-e1",
+        "event_id": writer.next_event_id(),
         "run_id": resolved_run_id,
         "ts_ns": time_ns(),
         "phase": machine.phase.value,
@@ -104,7 +169,7 @@ def create_run(
         },
     }
     event_bus.publish(bootstrap_event)
-    _append_event(_events_path(run_root, resolved_run_id), bootstrap_event)
+    writer.flush()
     return payload
 
 
@@ -125,15 +190,88 @@ def save_run(run_root: Path, payload: dict[str, Any]) -> dict[str, Any]:
 
 
 def run_event_count(run_root: Path, run_id: str) -> int:
-    path = _events_path(run_root, run_id)
-    if not path.exists():
+    writer = _EVENT_WRITERS.get(_writer_key(run_root, run_id))
+    if writer is not None and not writer.closed:
+        return writer.event_count
+    if not _run_dir(run_root, run_id).exists():
         return 0
-    count = 0
-    with path.open("r", encoding="utf-8") as file:
-        for line in file:
-            if line.strip():
-                count += 1
-    return count
+    return load_event_seq(_events_path(run_root, run_id), _event_seq_path(run_root, run_id))["event_count"]
+
+
+def _core_state(machine: CoreStateMachine, log_offset: int) -> dict[str, Any]:
+    snapshot = machine.snapshot()
+    snapshot["checkpoint"]["log_offset"] = log_offset
+    return snapshot
+
+
+def _committed_log_offset(core_state: dict[str, Any]) -> int:
+    checkpoint = core_state.get("checkpoint") or {}
+    return int(checkpoint.get("log_offset", 0))
+
+
+def _append_transitions(path: Path, audits: list[TransitionAudit], log_offset: int) -> int:
+    """Append audits at ``log_offset`` and return the new end offset.
+
+    Anything past ``log_offset`` was written by a transition whose run.json
+    update never landed, so it is truncated before appending.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = "".join(json.dumps(item.to_dict(), ensure_ascii=False) + "\n" for item in audits).encode("utf-8")
+    with path.open("ab") as file:
+        file.truncate(log_offset)
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+    return log_offset + len(data)
+
+
+def _read_transition_records(path: Path, log_offset: int) -> list[dict[str, Any]]:
+    if not path.exists() or log_offset <= 0:
+        return []
+    with path.open("rb") as file:
+        data = file.read(log_offset)
+    return [json.loads(line) for line in data.splitlines() if line.strip()]
+
+
+def _read_transitions(path: Path, log_offset: int) -> list[TransitionAudit]:
+    return [TransitionAudit.from_dict(item) for item in _read_transition_records(path, log_offset)]
+
+
+def load_transition_audits(run_root: Path, run_id: str) -> list[TransitionAudit]:
+    """Read the committed transition history for a run (O(history))."""
+    core_state = load_run(run_root, run_id).get("core_state", {})
+    if "audits" in core_state:
+        return CoreStateMachine.from_snapshot(core_state).audits
+    return _read_transitions(_transitions_path(run_root, run_id), _committed_log_offset(core_state))
+
+
+def replay_runs(run_root: Path, run_ids: list[str] | None = None) -> dict[str, ReplayResult]:
+    """Rebuild each run's phase from its transition log and check it.
+
+    ``run_ids`` defaults to every run under ``run_root``. A result carries an
+    error when the log holds an illegal edge or ends in a different phase
+    than ``run.json`` records.
+    """
+    if run_ids is None:
+        run_ids = sorted(path.parent.parent.name for path in run_root.glob("*/index/run.json"))
+    results: dict[str, ReplayResult] = {}
+    for run_id in run_ids:
+        payload = load_run(run_root, run_id)
+        core_state = payload.get("core_state", {})
+        if "audits" in core_state:
+            records = core_state["audits"]
+        else:
+            records = _read_transition_records(_transitions_path(run_root, run_id), _committed_log_offset(core_state))
+        result = replay_transitions(records)
+        recorded_phase = str(core_state.get("phase", payload.get("state", "")))
+        if result.valid and result.phase.value != recorded_phase:
+            result = ReplayResult(
+                phase=result.phase,
+                transition_count=result.transition_count,
+                error=f"replayed phase {result.phase.value} does not match recorded {recorded_phase}",
+            )
+        results[run_id] = result
+    return results
 
 
 def transition_run(
@@ -142,19 +280,41 @@ def transition_run(
     to_phase: CorePhase,
     reason: str,
 ) -> dict[str, Any]:
+    """Move a run to ``to_phase``.
+
+    The new audit is appended to ``index/transitions.jsonl`` first and
+    ``run.json`` is then rewritten with the phase and a constant-size
+    checkpoint, so a transition costs the same at any history length. Legacy
+    runs that embed ``core_state.audits`` are migrated to the log here.
+    A transition to the phase the run is already in is a no-op, so a
+    repeated ``idk run stop`` succeeds without recording anything. Raises
+    ``InvalidTransitionError`` for edges outside the transition graph.
+    """
     payload = load_run(run_root, run_id)
     snapshot = payload.get("core_state", {})
-    machine = CoreStateMachine.from_snapshot(snapshot)
+    log_path = _transitions_path(run_root, run_id)
+    log_offset = _committed_log_offset(snapshot)
+    # The loader reads ``log_offset`` when called, so it also sees audits
+    # drained into the log below.
+    machine = CoreStateMachine.from_snapshot(
+        snapshot,
+        audit_loader=lambda: _read_transitions(log_path, log_offset),
+    )
+    if machine.phase == to_phase:
+        return payload
     audit = machine.transition(to_phase=to_phase, reason=reason)
+    log_offset = _append_transitions(log_path, machine.drain_pending_audits(), log_offset)
     payload["state"] = machine.phase.value
-    payload["core_state"] = machine.snapshot()
+    payload["core_state"] = _core_state(machine, log_offset)
     if to_phase == CorePhase.REPORT and not payload.get("finished_at"):
         payload["finished_at"] = datetime.now(UTC).isoformat()
     save_run(run_root, payload)
 
-    event_bus = EventBus()
+    writer = open_event_writer(run_root, run_id)
+    writer.flush()
+    event_bus = EventBus(writer=writer)
     transition_event = {
-        "event_id": f"{run_id}-e{run_event_count(run_root, run_id) + 1}",
+        "event_id": writer.next_event_id(),
         "run_id": run_id,
         "ts_ns": time_ns(),
         "phase": machine.phase.value,
@@ -170,36 +330,249 @@ def transition_run(
         },
     }
     event_bus.publish(transition_event)
-    _append_event(_events_path(run_root, run_id), transition_event)
+    writer.flush()
     return payload
 
 
+def _workflow_record_stem(run_root: Path, run_id: str, workflow_id: str, started_at: str) -> Path:
+    token = started_at.replace(":", "").replace("-", "").replace(".", "")
+    return _run_dir(run_root, run_id) / "workflows" / f"{token}-{workflow_id}"
+
+
+def parse_workflow_run_id(workflow_run_id: str) -> tuple[str, str, str]:
+    """Split ``<run_id>:<workflow_id>:<started_at>``; started_at contains colons."""
+    parts = workflow_run_id.split(":", 2)
+    if len(parts) != 3 or not all(parts):
+        raise RunStoreError(f"invalid workflow_run_id: {workflow_run_id}")
+    return parts[0], parts[1], parts[2]
+
+
 def append_workflow_record(
     run_root: Path,
     run_id: str,
     workflow_run: dict[str, Any],
 ) -> Path:
-    run_dir = _ensure_layout(run_root, run_id)
-    workflow_dir = run_dir / "workflows"
+    _ensure_layout(run_root, run_id)
     started_at = str(workflow_run.get("started_at", ""))
-    token = started_at.replace(":", "").replace("-", "").replace(".", "")
     workflow_id = str(workflow_run.get("workflow_id", "workflow"))
-    filename = f"{token}-{workflow_id}.json"
-    output = workflow_dir / filename
-    output.write_text(json.dumps(workflow_run, ensure_ascii=False, indent=2), encoding="utf-8")
+    stem = _workflow_record_stem(run_root, run_id, workflow_id, started_at)
+    output = stem.with_name(f"{stem.name}.json")
+    atomic_write_json(output, workflow_run)
     return output
 
 
+def append_workflow_checkpoint(
+    run_root: Path,
+    run_id: str,
+    workflow_run: dict[str, Any],
+    step_record: dict[str, Any],
+) -> Path:
+    """Append one finished step to ``workflows/<token>-<workflow_id>.steps.jsonl``.
+
+    Each line is flushed and fsynced, so a crash loses at most the step that
+    was running. ``load_workflow_checkpoint`` folds the lines back together.
+    """
+    _ensure_layout(run_root, run_id)
+    stem = _workflow_record_stem(
+        run_root,
+        run_id,
+        str(workflow_run.get("workflow_id", "workflow")),
+        str(workflow_run.get("started_at", "")),
+    )
+    output = stem.with_name(f"{stem.name}.steps.jsonl")
+    with output.open("a", encoding="utf-8") as file:
+        file.write(json.dumps(step_record, ensure_ascii=False) + "\n")
+        file.flush()
+        os.fsync(file.fileno())
+    return output
+
+
+def load_workflow_checkpoint(run_root: Path, workflow_run_id: str) -> dict[str, Any]:
+    """Rebuild a workflow run from its record and step checkpoints.
+
+    The final record may be missing if the process died mid-run; the step
+    log alone is enough because the workflow_run_id carries run_id,
+    workflow_id and started_at. The latest line per step_id wins.
+    """
+    run_id, workflow_id, started_at = parse_workflow_run_id(workflow_run_id)
+    stem = _workflow_record_stem(run_root, run_id, workflow_id, started_at)
+    record_path = stem.with_name(f"{stem.name}.json")
+    steps_path = stem.with_name(f"{stem.name}.steps.jsonl")
+    if not record_path.exists() and not steps_path.exists():
+        raise RunStoreError(f"workflow run not found: {workflow_run_id}")
+    workflow_run: dict[str, Any] = {
+        "workflow_run_id": workflow_run_id,
+        "workflow_id": workflow_id,
+        "run_id": run_id,
+        "status": "running",
+        "blocked_reason": "",
+        "started_at": started_at,
+        "finished_at": "",
+        "steps": [],
+    }
+    if record_path.exists():
+        workflow_run.update(json.loads(record_path.read_text(encoding="utf-8")))
+    steps = {str(item["step_id"]): item for item in workflow_run.get("steps", [])}
+    if steps_path.exists():
+        with steps_path.open("r", encoding="utf-8") as file:
+            for line in file:
+                if not line.endswith("\n") or not line.strip():
+                    continue
+                item = json.loads(line)
+                steps[str(item["step_id"])] = item
+    workflow_run["steps"] = list(steps.values())
+    return workflow_run
+
+
+def load_workflow_records(run_root: Path, run_id: str) -> list[dict[str, Any]]:
+    """Final workflow records of a run, oldest first (file names sort by start time)."""
+    workflow_dir = _run_dir(run_root, run_id) / "workflows"
+    if not workflow_dir.exists():
+        return []
+    return [json.loads(path.read_text(encoding="utf-8")) for path in sorted(workflow_dir.glob("*.json"))]
+
+
+def _consensus_log_path(run_root: Path, run_id: str) -> Path:
+    return _run_dir(run_root, run_id) / "index" / "consensus.jsonl"
+
+
+def _consensus_index_path(run_root: Path, run_id: str) -> Path:
+    return _run_dir(run_root, run_id) / "index" / "consensus.idx.json"
+
+
+def _legacy_consensus_path(run_root: Path, run_id: str) -> Path:
+    return _run_dir(run_root, run_id) / "index" / "consensus.json"
+
+
+def _empty_consensus_index() -> dict[str, Any]:
+    return {"record_count": 0, "byte_offset": 0, "latest": None, "latest_non_vetoed": None}
+
+
+def _scan_consensus_log(path: Path, index: dict[str, Any]) -> dict[str, Any]:
+    """Fold complete records after ``index["byte_offset"]`` into the index.
+
+    A trailing line without a newline is skipped, not touched: it may be an
+    append still in flight. Only ``append_consensus_record`` truncates it.
+    """
+    offset = int(index["byte_offset"])
+    with path.open("rb") as file:
+        file.seek(offset)
+        for line in file:
+            if not line.endswith(b"\n"):
+                break
+            if line.strip():
+                location = {"offset": offset, "length": len(line)}
+                index["record_count"] += 1
+                index["latest"] = location
+                if not json.loads(line).get("vetoed", False):
+                    index["latest_non_vetoed"] = location
+            offset += len(line)
+    index["byte_offset"] = offset
+    return index
+
+
+def _load_consensus_index(run_root: Path, run_id: str, repair: bool = False) -> dict[str, Any]:
+    """Return the consensus offset index, reconciled against consensus.jsonl.
+
+    Same recovery rule as the event sequence sidecar: a matching file size is
+    trusted, a longer log only has its tail scanned, a shorter one is rescanned.
+    Readers get the reconciled index in memory only; with ``repair`` (the
+    append path) a torn tail is truncated and the stale index rewritten.
+    """
+    log_path = _consensus_log_path(run_root, run_id)
+    index_path = _consensus_index_path(run_root, run_id)
+    index = _empty_consensus_index()
+    if index_path.exists():
+        try:
+            stored = json.loads(index_path.read_text(encoding="utf-8"))
+            index = {key: stored[key] for key in index}
+        except (ValueError, KeyError, TypeError):
+            index = _empty_consensus_index()
+    size = log_path.stat().st_size if log_path.exists() else 0
+    if size == index["byte_offset"]:
+        return index
+    if size < index["byte_offset"]:
+        index = _empty_consensus_index()
+    if size > index["byte_offset"]:
+        index = _scan_consensus_log(log_path, index)
+    if repair:
+        if size > index["byte_offset"]:
+            with log_path.open("rb+") as file:
+                file.truncate(index["byte_offset"])
+        _write_json(index_path, index, Durability.ATOMIC)
+    return index
+
+
+def _read_consensus_at(run_root: Path, run_id: str, location: dict[str, int]) -> dict[str, Any]:
+    with _consensus_log_path(run_root, run_id).open("rb") as file:
+        file.seek(location["offset"])
+        return json.loads(file.read(location["length"]))
+
+
+def _load_legacy_consensus(run_root: Path, run_id: str) -> list[dict[str, Any]]:
+    path = _legacy_consensus_path(run_root, run_id)
+    if not path.exists():
+        return []
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
 def append_consensus_record(
     run_root: Path,
     run_id: str,
     consensus_payload: dict[str, Any],
 ) -> Path:
-    run_dir = _ensure_layout(run_root, run_id)
-    output = run_dir / "index" / "consensus.json"
-    payload: list[dict[str, Any]] = []
-    if output.exists():
-        payload = json.loads(output.read_text(encoding="utf-8"))
-    payload.append(consensus_payload)
-    output.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    _ensure_layout(run_root, run_id)
+    index = _load_consensus_index(run_root, run_id, repair=True)
+    output = _consensus_log_path(run_root, run_id)
+    line = (json.dumps(consensus_payload, ensure_ascii=False) + "\n").encode("utf-8")
+    with output.open("ab") as file:
+        file.write(line)
+    location = {"offset": index["byte_offset"], "length": len(line)}
+    index["record_count"] += 1
+    index["byte_offset"] += len(line)
+    index["latest"] = location
+    if not consensus_payload.get("vetoed", False):
+        index["latest_non_vetoed"] = location
+    _write_json(_consensus_index_path(run_root, run_id), index, Durability.ATOMIC)
     return output
+
+
+def consensus_record_count(run_root: Path, run_id: str) -> int:
+    if not _run_dir(run_root, run_id).exists():
+        return 0
+    legacy_count = len(_load_legacy_consensus(run_root, run_id))
+    return legacy_count + int(_load_consensus_index(run_root, run_id)["record_count"])
+
+
+def latest_consensus_record(
+    run_root: Path,
+    run_id: str,
+    include_vetoed: bool = False,
+) -> dict[str, Any] | None:
+    """Return the newest consensus record via the offset index (one seek).
+
+    Runs written before consensus.jsonl existed fall back to consensus.json.
+    """
+    if not _run_dir(run_root, run_id).exists():
+        return None
+    index = _load_consensus_index(run_root, run_id)
+    location = index["latest"] if include_vetoed else index["latest_non_vetoed"]
+    if location is not None:
+        return _read_consensus_at(run_root, run_id, location)
+    for item in reversed(_load_legacy_consensus(run_root, run_id)):
+        if include_vetoed or not item.get("vetoed", False):
+            return item
+    return None
+
+
+def load_consensus_records(run_root: Path, run_id: str) -> list[dict[str, Any]]:
+    records = _load_legacy_consensus(run_root, run_id)
+    log_path = _consensus_log_path(run_root, run_id)
+    if log_path.exists():
+        with log_path.open("rb") as file:
+            for line in file:
+                if not line.endswith(b"\n"):
+                    break
+                if line.strip():
+                    records.append(json.loads(line))
+    return records
@@ -3,7 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from datetime import datetime, UTC
 from enum import Enum
-from typing import Any
+from typing import Any, Callable, Iterable
 
 
 class CorePhase(str, Enum):
@@ -23,6 +23,136 @@ class CorePhase(str, Enum):
     FAILED = "FAILED"
 
 
+class InvalidTransitionError(ValueError):
+    pass
+
+
+TERMINAL_PHASES = frozenset({CorePhase.REPORT, CorePhase.FAILED})
+
+# Forward edges of the debug loop. Every non-terminal phase may also stop
+# at REPORT or FAILED; those edges are added by ``TransitionTable.compile``.
+TRANSITION_GRAPH: dict[CorePhase, tuple[CorePhase, ...]] = {
+    CorePhase.BOOTSTRAP: (CorePhase.TEST_LOOP, CorePhase.MONITOR),
+    CorePhase.TEST_LOOP: (CorePhase.MONITOR, CorePhase.DETECT),
+    CorePhase.MONITOR: (CorePhase.TEST_LOOP, CorePhase.DETECT),
+    CorePhase.DETECT: (CorePhase.MONITOR, CorePhase.CONDITION_ANALYSIS, CorePhase.REPRODUCE),
+    CorePhase.CONDITION_ANALYSIS: (CorePhase.MONITOR, CorePhase.REPRODUCE),
+    CorePhase.REPRODUCE: (CorePhase.MONITOR, CorePhase.DETECT, CorePhase.DEBUG_ON),
+    CorePhase.DEBUG_ON: (CorePhase.REPRODUCE, CorePhase.ANALYZE),
+    CorePhase.ANALYZE: (CorePhase.REPRODUCE, CorePhase.ADV_TOOL_DECISION),
+    CorePhase.ADV_TOOL_DECISION: (CorePhase.ANALYZE, CorePhase.AUTO_ACTION, CorePhase.REPRO_TRACE),
+    CorePhase.AUTO_ACTION: (CorePhase.ANALYZE, CorePhase.REPRO_TRACE),
+    CorePhase.REPRO_TRACE: (CorePhase.ANALYZE, CorePhase.RUNTIME_PATCH_TEST),
+    CorePhase.RUNTIME_PATCH_TEST: (CorePhase.MONITOR, CorePhase.ANALYZE),
+    CorePhase.REPORT: (),
+    CorePhase.FAILED: (),
+}
+
+_PHASES: tuple[CorePhase, ...] = tuple(CorePhase)
+_PHASE_INDEX: dict[str, int] = {phase.value: index for index, phase in enumerate(_PHASES)}
+
+
+class TransitionTable:
+    """Transition graph compiled into per-phase bitmaps.
+
+    Bit ``j`` of ``adjacency[i]`` is set when phase ``i`` may move to phase
+    ``j`` (indexes follow ``CorePhase`` declaration order); ``reachable`` is
+    the transitive closure. Both lookups are a list index and a shift.
+    """
+
+    __slots__ = ("adjacency", "reachable")
+
+    def __init__(self, adjacency: list[int], reachable: list[int]) -> None:
+        self.adjacency = adjacency
+        self.reachable = reachable
+
+    @classmethod
+    def compile(
+        cls,
+        graph: dict[CorePhase, tuple[CorePhase, ...]],
+        terminal: frozenset[CorePhase] = TERMINAL_PHASES,
+    ) -> "TransitionTable":
+        terminal_bits = 0
+        for phase in terminal:
+            terminal_bits |= 1 << _PHASE_INDEX[phase.value]
+        adjacency = [0] * len(_PHASES)
+        for phase, targets in graph.items():
+            index = _PHASE_INDEX[phase.value]
+            for target in targets:
+                adjacency[index] |= 1 << _PHASE_INDEX[target.value]
+            if phase not in terminal:
+                adjacency[index] |= terminal_bits
+        reachable = list(adjacency)
+        for middle in range(len(_PHASES)):
+            middle_bit = 1 << middle
+            for index in range(len(_PHASES)):
+                if reachable[index] & middle_bit:
+                    reachable[index] |= reachable[middle]
+        return cls(adjacency, reachable)
+
+    def allows(self, from_phase: CorePhase, to_phase: CorePhase) -> bool:
+        return bool(self.adjacency[_PHASE_INDEX[from_phase.value]] >> _PHASE_INDEX[to_phase.value] & 1)
+
+    def can_reach(self, from_phase: CorePhase, to_phase: CorePhase) -> bool:
+        if from_phase == to_phase:
+            return True
+        return bool(self.reachable[_PHASE_INDEX[from_phase.value]] >> _PHASE_INDEX[to_phase.value] & 1)
+
+    def successors(self, phase: CorePhase) -> tuple[CorePhase, ...]:
+        bits = self.adjacency[_PHASE_INDEX[phase.value]]
+        return tuple(item for index, item in enumerate(_PHASES) if bits >> index & 1)
+
+
+DEFAULT_TRANSITION_TABLE = TransitionTable.compile(TRANSITION_GRAPH)
+
+
+@dataclass(frozen=True, slots=True)
+class ReplayResult:
+    phase: CorePhase
+    transition_count: int
+    error: str = ""
+
+    @property
+    def valid(self) -> bool:
+        return not self.error
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "phase": self.phase.value,
+            "transition_count": self.transition_count,
+            "error": self.error,
+        }
+
+
+def replay_transitions(
+    records: Iterable[dict[str, Any]],
+    initial_phase: CorePhase = CorePhase.BOOTSTRAP,
+    table: TransitionTable = DEFAULT_TRANSITION_TABLE,
+) -> ReplayResult:
+    """Rebuild the phase from raw transition-log records.
+
+    Works on the decoded JSON dicts directly, without building
+    ``TransitionAudit`` objects. Replay stops at the first record that does
+    not continue from the current phase or is not an allowed edge.
+    """
+    adjacency = table.adjacency
+    phase_index = _PHASE_INDEX
+    current = phase_index[initial_phase.value]
+    applied = 0
+    for record in records:
+        from_index = phase_index.get(record.get("from_phase"), -1)
+        to_index = phase_index.get(record.get("to_phase"), -1)
+        if from_index != current or to_index < 0 or not adjacency[current] >> to_index & 1:
+            error = (
+                f"record {applied}: invalid transition "
+                f"{record.get('from_phase')} -> {record.get('to_phase')} from {_PHASES[current].value}"
+            )
+            return ReplayResult(phase=_PHASES[current], transition_count=applied, error=error)
+        current = to_index
+        applied += 1
+    return ReplayResult(phase=_PHASES[current], transition_count=applied)
+
+
 @dataclass(slots=True)
 class TransitionAudit:
     from_phase: CorePhase
@@ -48,24 +178,66 @@ class TransitionAudit:
         )
 
 
+AuditLoader = Callable[[], list[TransitionAudit]]
+
+
 class CoreStateMachine:
+    """Core phase tracker with an append-only audit trail.
+
+    Transitions are checked against a compiled ``TransitionTable``.
+
+    Audits recorded since the last ``drain_pending_audits`` are held in
+    memory; older ones live in an external transition log and are only read
+    through ``audit_loader`` when ``audits`` is accessed. ``snapshot`` stores
+    the phase plus a fixed-size checkpoint, so its cost does not grow with
+    history.
+    """
+
     def __init__(
         self,
         initial_phase: CorePhase = CorePhase.BOOTSTRAP,
         audits: list[TransitionAudit] | None = None,
+        audit_loader: AuditLoader | None = None,
+        persisted_count: int = 0,
+        last_transition: TransitionAudit | None = None,
+        table: TransitionTable = DEFAULT_TRANSITION_TABLE,
     ) -> None:
         self._phase = initial_phase
-        self._audits = list(audits or [])
+        self._table = table
+        self._audit_loader = audit_loader
+        self._persisted_count = persisted_count
+        self._persisted_audits: list[TransitionAudit] | None = None if audit_loader is not None else []
+        self._pending_audits = list(audits or [])
+        self._last_transition = self._pending_audits[-1] if self._pending_audits else last_transition
 
     @property
     def phase(self) -> CorePhase:
         return self._phase
 
+    @property
+    def transition_count(self) -> int:
+        return self._persisted_count + len(self._pending_audits)
+
+    @property
+    def last_transition(self) -> TransitionAudit | None:
+        return self._last_transition
+
     @property
     def audits(self) -> list[TransitionAudit]:
-        return list(self._audits)
+        if self._persisted_audits is None:
+            loader = self._audit_loader
+            self._persisted_audits = list(loader()) if loader is not None else []
+        return self._persisted_audits + self._pending_audits
+
+    def can_transition(self, to_phase: CorePhase) -> bool:
+        return self._table.allows(self._phase, to_phase)
+
+    def can_reach(self, phase: CorePhase) -> bool:
+        return self._table.can_reach(self._phase, phase)
 
     def transition(self, to_phase: CorePhase, reason: str) -> TransitionAudit:
+        if not self._table.allows(self._phase, to_phase):
+            raise InvalidTransitionError(f"transition not allowed: {self._phase.value} -> {to_phase.value}")
         record = TransitionAudit(
             from_phase=self._phase,
             to_phase=to_phase,
@@ -73,18 +245,49 @@ class CoreStateMachine:
             at=datetime.now(UTC).isoformat(),
         )
         self._phase = to_phase
-        self._audits.append(record)
+        self._pending_audits.append(record)
+        self._last_transition = record
         return record
 
+    def drain_pending_audits(self) -> list[TransitionAudit]:
+        """Return audits not yet persisted and mark them as persisted."""
+        drained = self._pending_audits
+        self._pending_audits = []
+        self._persisted_count += len(drained)
+        if self._persisted_audits is not None:
+            self._persisted_audits.extend(drained)
+        return drained
+
     def snapshot(self) -> dict[str, Any]:
+        last_transition = self._last_transition
         return {
             "phase": self.phase.value,
-            "audits": [item.to_dict() for item in self._audits],
+            "checkpoint": {
+                "transition_count": self.transition_count,
+                "last_transition": last_transition.to_dict() if last_transition is not None else None,
+            },
         }
 
     @classmethod
-    def from_snapshot(cls, payload: dict[str, Any]) -> "CoreStateMachine":
+    def from_snapshot(
+        cls,
+        payload: dict[str, Any],
+        audit_loader: AuditLoader | None = None,
+    ) -> "CoreStateMachine":
+        """Restore from ``snapshot`` output without reading the audit history.
+
+        Legacy snapshots that still embed ``audits`` are accepted; their audits
+        come back as pending so the caller can move them to the log.
+        """
         phase = CorePhase(str(payload.get("phase", CorePhase.BOOTSTRAP.value)))
-        audits_payload = payload.get("audits", [])
-        audits = [TransitionAudit.from_dict(item) for item in audits_payload]
-        return cls(initial_phase=phase, audits=audits)
+        if "audits" in payload:
+            audits = [TransitionAudit.from_dict(item) for item in payload["audits"]]
+            return cls(initial_phase=phase, audits=audits)
+        checkpoint = payload.get("checkpoint") or {}
+        last_payload = checkpoint.get("last_transition")
+        return cls(
+            initial_phase=phase,
+            audit_loader=audit_loader,
+            persisted_count=int(checkpoint.get("transition_count", 0)),
+            last_transition=TransitionAudit.from_dict(last_payload) if last_payload else None,
+        )
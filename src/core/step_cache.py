@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+import hashlib
+import json
+from pathlib import Path
+import threading
+from typing import Any
+
+from src.core.durable_io import Durability
+from src.core.durable_io import atomic_write_json
+from src.core.durable_io import atomic_write_text
+
+_INDEX_VERSION = 1
+
+
+def step_cache_key(plugin_ref: str, action: str, plugin_version: str, inputs: dict[str, Any]) -> str:
+    """Content address for a step: sha256 over canonical JSON of its identity and inputs."""
+    payload = {
+        "plugin_ref": plugin_ref,
+        "action": action,
+        "plugin_version": plugin_version,
+        "inputs": inputs,
+    }
+    encoded = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class StepCache:
+    """Content-addressed, LRU and size-bounded store of step outputs.
+
+    Entries live as ``entries/<k[:2]>/<key>.json`` under ``root``; the LRU
+    order and sizes are kept in ``index.json``. Lookups only touch the
+    in-memory index plus one entry file, and recency changes are written on
+    ``flush``. Inserting evicts least recently used entries until both
+    ``max_entries`` and ``max_bytes`` hold. Safe to share between the
+    worker threads of one workflow run.
+    """
+
+    def __init__(self, root: Path, max_entries: int = 1024, max_bytes: int = 16 << 20) -> None:
+        if max_entries < 1 or max_bytes < 1:
+            raise ValueError("max_entries and max_bytes must be >= 1")
+        self.root = root
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, int] = OrderedDict()
+        self._total_bytes = 0
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._load_index()
+
+    @classmethod
+    def for_run_root(cls, run_root: Path, **options: Any) -> "StepCache":
+        return cls(run_root / "_cache" / "steps", **options)
+
+    @property
+    def index_path(self) -> Path:
+        return self.root / "index.json"
+
+    @property
+    def entry_count(self) -> int:
+        return len(self._entries)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def _entry_path(self, key: str) -> Path:
+        return self.root / "entries" / key[:2] / f"{key}.json"
+
+    def _load_index(self) -> None:
+        if not self.index_path.exists():
+            return
+        try:
+            payload = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except ValueError:
+            return
+        if payload.get("version") != _INDEX_VERSION:
+            return
+        for key, size in payload.get("entries", []):
+            self._entries[str(key)] = int(size)
+            self._total_bytes += int(size)
+
+    def _save_index(self) -> None:
+        payload = {"version": _INDEX_VERSION, "entries": [[key, size] for key, size in self._entries.items()]}
+        atomic_write_json(self.index_path, payload, Durability.ATOMIC)
+        self._dirty = False
+
+    def _drop(self, key: str) -> None:
+        self._total_bytes -= self._entries.pop(key)
+        self._entry_path(key).unlink(missing_ok=True)
+        self._dirty = True
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            try:
+                value = json.loads(self._entry_path(key).read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                self._drop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._dirty = True
+            self.hits += 1
+            return value
+
+    def put(self, key: str, value: dict[str, Any]) -> bool:
+        """Store ``value``; returns False when it alone exceeds ``max_bytes``."""
+        data = json.dumps(value, ensure_ascii=False, sort_keys=True)
+        size = len(data.encode("utf-8"))
+        if size > self.max_bytes:
+            return False
+        with self._lock:
+            if key in self._entries:
+                self._total_bytes -= self._entries.pop(key)
+            atomic_write_text(self._entry_path(key), data, Durability.ATOMIC)
+            self._entries[key] = size
+            self._total_bytes += size
+            while len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+            self._save_index()
+        return True
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._dirty:
+                self._save_index()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self._total_bytes,
+        }
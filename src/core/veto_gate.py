@@ -10,8 +10,10 @@ class VetoDecision:
 
 
 class VetoGate:
+    @staticmethod
+    def decision(missing: list[str]) -> VetoDecision:
+        """Decision for already computed, sorted missing evidence."""
+        return VetoDecision(vetoed=bool(missing), reasons=[f"missing evidence: {item}" for item in missing])
+
     def evaluate(self, required_evidence: set[str], available_evidence: set[str]) -> VetoDecision:
-        missing = sorted(required_evidence - available_evidence)
-        if missing:
-            return VetoDecision(vetoed=True, reasons=[f"missing evidence: {item}" for item in missing])
-        return VetoDecision(vetoed=False, reasons=[])
+        return self.decision(sorted(required_evidence - available_evidence))
@@ -0,0 +1,312 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from dataclasses import field
+from functools import lru_cache
+import re
+from typing import Any
+
+
+class GuardSyntaxError(ValueError):
+    pass
+
+
+@dataclass(slots=True)
+class GuardContext:
+    """Facts a guard can test: evidence keys, current phase and seen events."""
+
+    evidence: set[str] | frozenset[str] = frozenset()
+    phase: str = ""
+    seen_events: frozenset[tuple[str, str]] = frozenset()
+    seen_tools: frozenset[str] = field(init=False)
+    seen_severities: frozenset[str] = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.seen_tools = frozenset(tool for tool, _ in self.seen_events)
+        self.seen_severities = frozenset(severity for _, severity in self.seen_events)
+
+    @classmethod
+    def from_events(
+        cls,
+        events: Iterable[dict[str, Any]],
+        evidence: set[str] | frozenset[str] = frozenset(),
+        phase: str = "",
+    ) -> "GuardContext":
+        seen = frozenset((str(item.get("tool", "")), str(item.get("severity", ""))) for item in events)
+        return cls(evidence=evidence, phase=phase, seen_events=seen)
+
+
+GuardCheck = Callable[[GuardContext], bool]
+
+_TOKEN_PATTERN = re.compile(
+    r"\s*(?:(?P<string>\"[^\"]*\"|'[^']*')|(?P<op>>=|<=|==|!=|[<>(),=:])|(?P<name>[A-Za-z0-9_.\-/*]+))"
+)
+_KEYWORDS = frozenset({"and", "or", "not", "in", "true", "false"})
+_COMPARATORS: dict[str, Callable[[int, int], bool]] = {
+    ">=": lambda left, right: left >= right,
+    ">": lambda left, right: left > right,
+    "<=": lambda left, right: left <= right,
+    "<": lambda left, right: left < right,
+    "==": lambda left, right: left == right,
+    "!=": lambda left, right: left != right,
+}
+_EVENT_FILTERS = frozenset({"tool", "severity"})
+
+
+def _tokenize(expression: str) -> list[tuple[str, str]]:
+    tokens: list[tuple[str, str]] = []
+    position = 0
+    end = len(expression.rstrip())
+    while position < end:
+        match = _TOKEN_PATTERN.match(expression, position)
+        if match is None or match.end() == position:
+            raise GuardSyntaxError(f"unexpected character at {position}: {expression[position:]!r}")
+        kind = match.lastgroup or ""
+        value = match.group(kind)
+        if kind == "string":
+            tokens.append(("value", value[1:-1]))
+        elif kind == "name" and value in _KEYWORDS:
+            tokens.append(("keyword", value))
+        elif kind == "name":
+            tokens.append(("value", value))
+        else:
+            tokens.append(("op", value))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    """Recursive-descent parser that turns a guard expression into closures.
+
+    Grammar::
+
+        expr     := and_expr ("or" and_expr)*
+        and_expr := not_expr ("and" not_expr)*
+        not_expr := "not" not_expr | atom
+        atom     := "(" expr ")" | "true" | "false"
+                  | "has_evidence" (":" KEY | "(" KEY ")")
+                  | "count_evidence" ["(" [PREFIX] ")"] CMP INT
+                  | "phase" ["not"] "in" "(" NAME ("," NAME)* ")"
+                  | "phase" ("==" | "!=") NAME
+                  | "event_seen" "(" [FILTER "=" VALUE ("," FILTER "=" VALUE)*] ")"
+    """
+
+    def __init__(self, expression: str) -> None:
+        self.expression = expression
+        self.tokens = _tokenize(expression)
+        self.position = 0
+        self.uses_events = False
+
+    def _peek(self) -> tuple[str, str] | None:
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def _take(self) -> tuple[str, str]:
+        token = self._peek()
+        if token is None:
+            raise GuardSyntaxError(f"unexpected end of expression: {self.expression!r}")
+        self.position += 1
+        return token
+
+    def _accept(self, kind: str, value: str) -> bool:
+        if self._peek() == (kind, value):
+            self.position += 1
+            return True
+        return False
+
+    def _expect(self, kind: str, value: str) -> None:
+        token = self._take()
+        if token != (kind, value):
+            raise GuardSyntaxError(f"expected {value!r}, got {token[1]!r} in {self.expression!r}")
+
+    def _value(self) -> str:
+        kind, value = self._take()
+        if kind != "value":
+            raise GuardSyntaxError(f"expected a name, got {value!r} in {self.expression!r}")
+        return value
+
+    def parse(self) -> GuardCheck:
+        if not self.tokens:
+            raise GuardSyntaxError("empty guard expression")
+        check = self._or()
+        if self._peek() is not None:
+            raise GuardSyntaxError(f"unexpected {self._peek()[1]!r} in {self.expression!r}")
+        return check
+
+    def _or(self) -> GuardCheck:
+        checks = [self._and()]
+        while self._accept("keyword", "or"):
+            checks.append(self._and())
+        if len(checks) == 1:
+            return checks[0]
+        return lambda context: any(check(context) for check in checks)
+
+    def _and(self) -> GuardCheck:
+        checks = [self._not()]
+        while self._accept("keyword", "and"):
+            checks.append(self._not())
+        if len(checks) == 1:
+            return checks[0]
+        return lambda context: all(check(context) for check in checks)
+
+    def _not(self) -> GuardCheck:
+        if self._accept("keyword", "not"):
+            inner = self._not()
+            return lambda context: not inner(context)
+        return self._atom()
+
+    def _atom(self) -> GuardCheck:
+        if self._accept("op", "("):
+            check = self._or()
+            self._expect("op", ")")
+            return check
+        if self._accept("keyword", "true"):
+            return lambda context: True
+        if self._accept("keyword", "false"):
+            return lambda context: False
+        name = self._value()
+        if name == "has_evidence":
+            return self._has_evidence()
+        if name == "count_evidence":
+            return self._count_evidence()
+        if name == "phase":
+            return self._phase()
+        if name == "event_seen":
+            return self._event_seen()
+        raise GuardSyntaxError(f"unknown guard predicate: {name}")
+
+    def _has_evidence(self) -> GuardCheck:
+        if self._accept("op", ":"):
+            key = self._value()
+        else:
+            self._expect("op", "(")
+            key = self._value()
+            self._expect("op", ")")
+        return lambda context: key in context.evidence
+
+    def _count_evidence(self) -> GuardCheck:
+        prefix = ""
+        if self._accept("op", "("):
+            if not self._accept("op", ")"):
+                prefix = self._value()
+                self._expect("op", ")")
+        kind, operator = self._take()
+        compare = _COMPARATORS.get(operator) if kind == "op" else None
+        if compare is None:
+            raise GuardSyntaxError(f"count_evidence expects a comparison, got {operator!r}")
+        limit_text = self._value()
+        if not limit_text.isdigit():
+            raise GuardSyntaxError(f"count_evidence expects an integer, got {limit_text!r}")
+        limit = int(limit_text)
+        if not prefix:
+            return lambda context: compare(len(context.evidence), limit)
+        return lambda context: compare(sum(1 for key in context.evidence if key.startswith(prefix)), limit)
+
+    def _phase(self) -> GuardCheck:
+        if self._accept("op", "=="):
+            expected = self._value()
+            return lambda context: context.phase == expected
+        if self._accept("op", "!="):
+            expected = self._value()
+            return lambda context: context.phase != expected
+        negate = self._accept("keyword", "not")
+        self._expect("keyword", "in")
+        self._expect("op", "(")
+        phases = {self._value()}
+        while self._accept("op", ","):
+            phases.add(self._value())
+        self._expect("op", ")")
+        allowed = frozenset(phases)
+        if negate:
+            return lambda context: context.phase not in allowed
+        return lambda context: context.phase in allowed
+
+    def _event_seen(self) -> GuardCheck:
+        self.uses_events = True
+        filters: dict[str, str] = {}
+        self._expect("op", "(")
+        if not self._accept("op", ")"):
+            while True:
+                key = self._value()
+                if key not in _EVENT_FILTERS:
+                    raise GuardSyntaxError(f"event_seen does not support filter: {key}")
+                self._expect("op", "=")
+                filters[key] = self._value()
+                if self._accept("op", ")"):
+                    break
+                self._expect("op", ",")
+        tool = filters.get("tool")
+        severity = filters.get("severity")
+        if tool is not None and severity is not None:
+            pair = (tool, severity)
+            return lambda context: pair in context.seen_events
+        if tool is not None:
+            return lambda context: tool in context.seen_tools
+        if severity is not None:
+            return lambda context: severity in context.seen_severities
+        return lambda context: bool(context.seen_events)
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledGuard:
+    guard_id: str
+    expression: str
+    reason: str
+    on_block: str
+    check: GuardCheck
+    uses_events: bool
+
+    def evaluate(self, context: GuardContext) -> bool:
+        return self.check(context)
+
+
+def compile_guard(guard_id: str, expression: str, reason: str = "", on_block: str = "halt") -> CompiledGuard:
+    parser = _Parser(expression)
+    try:
+        check = parser.parse()
+    except GuardSyntaxError as error:
+        raise GuardSyntaxError(f"guard {guard_id}: {error}") from None
+    return CompiledGuard(
+        guard_id=guard_id,
+        expression=expression,
+        reason=reason,
+        on_block=on_block,
+        check=check,
+        uses_events=parser.uses_events,
+    )
+
+
+_GuardFingerprint = tuple[tuple[str, str, str, str], ...]
+
+
+@lru_cache(maxsize=256)
+def _compile_guard_table(fingerprint: _GuardFingerprint) -> dict[str, CompiledGuard]:
+    return {
+        guard_id: compile_guard(guard_id, expression, reason=reason, on_block=on_block)
+        for guard_id, expression, reason, on_block in fingerprint
+    }
+
+
+def compile_guards(definition: dict[str, Any]) -> dict[str, CompiledGuard]:
+    """Compile a definition's guards, reusing the table of an identical guard list.
+
+    The cache key is every guard field that ends up in a ``CompiledGuard``
+    (id, expression, reason, on_block), so an edited definition that kept
+    its version string is still recompiled. The cache keeps the 256 most
+    recently used guard lists.
+    """
+    fingerprint = tuple(
+        (
+            str(item["guard_id"]),
+            str(item.get("expression", "")),
+            str(item.get("reason", "")),
+            str(item.get("on_block", "halt")),
+        )
+        for item in definition.get("guards", [])
+        if str(item.get("guard_id", ""))
+    )
+    return _compile_guard_table(fingerprint)
+
+
+def guards_use_events(definition: dict[str, Any]) -> bool:
+    return any(guard.uses_events for guard in compile_guards(definition).values())
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from typing import Any
+
+# SC-001: a P1 closed loop has to finish within 15 minutes.
+P1_LOOP_BUDGET_MS = 15 * 60 * 1000
+
+
+@dataclass(frozen=True, slots=True)
+class StepProfile:
+    workflow_id: str
+    step_id: str
+    plugin_ref: str
+    action: str
+    runs: int
+    wall_ms: float
+    cpu_ms: float
+    guard_ms: float
+    io_ms: float
+    max_wall_ms: float
+    cache_hits: int
+
+    @property
+    def mean_wall_ms(self) -> float:
+        return self.wall_ms / self.runs if self.runs else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "workflow_id": self.workflow_id,
+            "step_id": self.step_id,
+            "plugin_ref": self.plugin_ref,
+            "action": self.action,
+            "runs": self.runs,
+            "wall_ms": round(self.wall_ms, 3),
+            "mean_wall_ms": round(self.mean_wall_ms, 3),
+            "max_wall_ms": round(self.max_wall_ms, 3),
+            "cpu_ms": round(self.cpu_ms, 3),
+            "guard_ms": round(self.guard_ms, 3),
+            "io_ms": round(self.io_ms, 3),
+            "cache_hits": self.cache_hits,
+        }
+
+
+def _timed_steps(
+    records: Iterable[dict[str, Any]],
+) -> Iterator[tuple[dict[str, Any], dict[str, Any], dict[str, float]]]:
+    for record in records:
+        for step in record.get("steps", []):
+            timing = step.get("timing")
+            if timing is not None:
+                yield record, step, timing
+
+
+def profile_steps(records: Iterable[dict[str, Any]]) -> list[StepProfile]:
+    """Aggregate step timings over workflow records, hottest (total wall) first.
+
+    Records written before timings were captured are skipped.
+    """
+    totals: dict[tuple[str, str], dict[str, Any]] = {}
+    for record, step, timing in _timed_steps(records):
+        key = (str(record.get("workflow_id", "")), str(step["step_id"]))
+        entry = totals.get(key)
+        if entry is None:
+            entry = {
+                "plugin_ref": str(step.get("plugin_ref", "")),
+                "action": str(step.get("action", "")),
+                "runs": 0,
+                "wall_ms": 0.0,
+                "cpu_ms": 0.0,
+                "guard_ms": 0.0,
+                "io_ms": 0.0,
+                "max_wall_ms": 0.0,
+                "cache_hits": 0,
+            }
+            totals[key] = entry
+        wall_ms = float(timing.get("wall_ms", 0.0))
+        entry["runs"] += 1
+        entry["wall_ms"] += wall_ms
+        entry["cpu_ms"] += float(timing.get("cpu_ms", 0.0))
+        entry["guard_ms"] += float(timing.get("guard_ms", 0.0))
+        entry["io_ms"] += float(timing.get("io_ms", 0.0))
+        entry["max_wall_ms"] = max(entry["max_wall_ms"], wall_ms)
+        if step.get("cache") == "hit":
+            entry["cache_hits"] += 1
+    profiles = [
+        StepProfile(workflow_id=workflow_id, step_id=step_id, **entry)
+        for (workflow_id, step_id), entry in totals.items()
+    ]
+    profiles.sort(key=lambda item: (-item.wall_ms, item.workflow_id, item.step_id))
+    return profiles
+
+
+def _frame(name: str) -> str:
+    return name.replace(";", "_").replace(" ", "_") or "-"
+
+
+def folded_stacks(records: Iterable[dict[str, Any]]) -> list[str]:
+    """Export step timings in the folded-stack format read by flamegraph.pl.
+
+    Each step contributes ``workflow;step;guard``, ``workflow;step;plugin:action;cpu``,
+    ``workflow;step;plugin:action;io`` and the remaining self time on
+    ``workflow;step``; values are integer microseconds summed across runs.
+    """
+    samples: dict[str, int] = {}
+
+    def add(stack: str, value_ms: float) -> None:
+        value = int(round(value_ms * 1000))
+        if value > 0:
+            samples[stack] = samples.get(stack, 0) + value
+
+    for record, step, timing in _timed_steps(records):
+        base = f"{_frame(str(record.get('workflow_id', '')))};{_frame(str(step['step_id']))}"
+        plugin = f"{base};{_frame(str(step.get('plugin_ref', '')))}:{_frame(str(step.get('action', '')))}"
+        wall_ms = float(timing.get("wall_ms", 0.0))
+        guard_ms = float(timing.get("guard_ms", 0.0))
+        io_ms = float(timing.get("io_ms", 0.0))
+        cpu_ms = max(0.0, float(timing.get("cpu_ms", 0.0)) - guard_ms)
+        add(f"{base};guard", guard_ms)
+        add(f"{plugin};cpu", cpu_ms)
+        add(f"{plugin};io", io_ms)
+        add(base, wall_ms - guard_ms - cpu_ms - io_ms)
+    return [f"{stack} {value}" for stack, value in sorted(samples.items())]
+
+
+def workflow_wall_ms(records: Iterable[dict[str, Any]]) -> float:
+    return sum(float(record.get("timing", {}).get("wall_ms", 0.0)) for record in records)
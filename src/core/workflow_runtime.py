@@ -1,10 +1,29 @@
 from __future__ import annotations
 
 from datetime import datetime, UTC
+import heapq
+from collections.abc import Callable
+from collections.abc import Iterable
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
 import json
+import os
 from pathlib import Path
+from time import perf_counter
+from time import thread_time
 from typing import Any
 
+from src.core.durable_io import Durability
+from src.core.durable_io import atomic_write_json
+from src.core.step_cache import StepCache
+from src.core.step_cache import step_cache_key
+from src.core.workflow_guards import CompiledGuard
+from src.core.workflow_guards import GuardContext
+from src.core.workflow_guards import GuardSyntaxError
+from src.core.workflow_guards import compile_guards
+
 
 class WorkflowError(ValueError):
     pass
@@ -14,60 +33,442 @@ def _workflow_root() -> Path:
     return Path(__file__).resolve().parents[2] / "specs" / "001-debug-loop" / "workflows"
 
 
+_CACHE_VERSION = 1
+
+
+class WorkflowRegistry:
+    """workflow_id -> definition index over one or more workflow directories.
+
+    The built-in ``specs/001-debug-loop/workflows`` comes first, then
+    ``extra_dirs`` in order; a later directory overrides a workflow_id from
+    an earlier one, so per-project workflows can replace built-ins. Each
+    lookup stats the files and re-parses only those whose mtime or size
+    changed. With ``cache_path`` the parsed index is persisted and reused by
+    later processes while the files are unchanged. Returned definitions are
+    shared; treat them as read-only.
+    """
+
+    def __init__(
+        self,
+        extra_dirs: Iterable[Path] = (),
+        cache_path: Path | None = None,
+        include_builtin: bool = True,
+    ) -> None:
+        roots = [_workflow_root()] if include_builtin else []
+        self.roots = roots + [Path(item) for item in extra_dirs]
+        self.cache_path = cache_path
+        self._files: dict[str, dict[str, Any]] = {}
+        self._index: dict[str, dict[str, Any]] = {}
+        self._order: list[str] = []
+        self._indexed = False
+        self.parse_count = 0
+        if cache_path is not None:
+            self._load_cache(cache_path)
+
+    def _load_cache(self, cache_path: Path) -> None:
+        if not cache_path.exists():
+            return
+        try:
+            payload = json.loads(cache_path.read_text(encoding="utf-8"))
+        except ValueError:
+            return
+        if payload.get("version") != _CACHE_VERSION or not isinstance(payload.get("files"), dict):
+            return
+        self._files = payload["files"]
+
+    def _save_cache(self) -> None:
+        if self.cache_path is None:
+            return
+        atomic_write_json(self.cache_path, {"version": _CACHE_VERSION, "files": self._files}, Durability.ATOMIC)
+
+    def _scan(self) -> list[tuple[str, os.stat_result]]:
+        found: list[tuple[str, os.stat_result]] = []
+        for root in self.roots:
+            if not root.is_dir():
+                continue
+            for file in sorted(root.glob("*.json")):
+                found.append((str(file), file.stat()))
+        return found
+
+    def refresh(self) -> None:
+        changed = False
+        files: dict[str, dict[str, Any]] = {}
+        for path, stat in self._scan():
+            entry = self._files.get(path)
+            if entry is None or entry["mtime_ns"] != stat.st_mtime_ns or entry["size"] != stat.st_size:
+                try:
+                    definition = json.loads(Path(path).read_text(encoding="utf-8"))
+                except ValueError as error:
+                    raise WorkflowError(f"invalid workflow file: {path}: {error}") from error
+                self.parse_count += 1
+                entry = {
+                    "mtime_ns": stat.st_mtime_ns,
+                    "size": stat.st_size,
+                    "workflow_id": str(definition.get("workflow_id", Path(path).stem)),
+                    "definition": definition,
+                }
+                changed = True
+            files[path] = entry
+        changed = changed or files.keys() != self._files.keys()
+        if changed or not self._indexed:
+            self._files = files
+            self._rebuild_index()
+        if changed:
+            self._save_cache()
+
+    def _rebuild_index(self) -> None:
+        index: dict[str, dict[str, Any]] = {}
+        order: list[str] = []
+        for entry in self._files.values():
+            workflow_id = entry["workflow_id"]
+            if workflow_id not in index:
+                order.append(workflow_id)
+            index[workflow_id] = entry["definition"]
+        self._index = index
+        self._order = order
+        self._indexed = True
+
+    def workflow_ids(self) -> list[str]:
+        self.refresh()
+        return list(self._order)
+
+    def get(self, workflow_id: str) -> dict[str, Any]:
+        self.refresh()
+        definition = self._index.get(workflow_id)
+        if definition is None:
+            raise WorkflowError(f"workflow not found: {workflow_id}")
+        return definition
+
+    def source_path(self, workflow_id: str) -> Path:
+        self.refresh()
+        for path, entry in reversed(self._files.items()):
+            if entry["workflow_id"] == workflow_id:
+                return Path(path)
+        raise WorkflowError(f"workflow not found: {workflow_id}")
+
+
+_DEFAULT_REGISTRY: WorkflowRegistry | None = None
+
+
+def default_workflow_registry() -> WorkflowRegistry:
+    global _DEFAULT_REGISTRY
+    if _DEFAULT_REGISTRY is None:
+        _DEFAULT_REGISTRY = WorkflowRegistry()
+    return _DEFAULT_REGISTRY
+
+
 def list_workflows() -> list[str]:
-    root = _workflow_root()
-    if not root.exists():
-        return []
-    workflow_ids: list[str] = []
-    for file in sorted(root.glob("*.json")):
-        payload = json.loads(file.read_text(encoding="utf-8"))
-        workflow_ids.append(str(payload.get("workflow_id", file.stem)))
-    return workflow_ids
+    return default_workflow_registry().workflow_ids()
 
 
 def load_workflow_definition(workflow_id: str) -> dict[str, Any]:
-    root = _workflow_root()
-    if not root.exists():
+    if not _workflow_root().exists():
         raise WorkflowError("workflow root not found")
-    for file in sorted(root.glob("*.json")):
-        payload = json.loads(file.read_text(encoding="utf-8"))
-        if payload.get("workflow_id") == workflow_id:
-            return payload
-    raise WorkflowError(f"workflow not found: {workflow_id}")
-
-
-def _guard_lookup(definition: dict[str, Any]) -> dict[str, dict[str, str]]:
-    guards = definition.get("guards", [])
-    table: dict[str, dict[str, str]] = {}
-    for item in guards:
-        guard_id = str(item.get("guard_id", ""))
-        if guard_id:
-            table[guard_id] = {
-                "expression": str(item.get("expression", "")),
-                "reason": str(item.get("reason", "")),
-                "on_block": str(item.get("on_block", "halt")),
-            }
-    return table
-
-
-def _evaluate_expression(expression: str, evidence: set[str]) -> bool:
-    marker = "has_evidence:"
-    if not expression.startswith(marker):
-        return False
-    key = expression[len(marker) :].strip()
-    if not key:
-        return False
-    return key in evidence
+    return default_workflow_registry().get(workflow_id)
+
+
+def _guard_lookup(definition: dict[str, Any]) -> dict[str, CompiledGuard]:
+    try:
+        return compile_guards(definition)
+    except GuardSyntaxError as error:
+        raise WorkflowError(f"invalid guard in {definition.get('workflow_id', '')}: {error}") from error
+
+
+StepRunner = Callable[[dict[str, Any], dict[str, Any]], dict[str, Any] | None]
+StepCallback = Callable[[dict[str, Any], dict[str, Any]], None]
+
+
+def _now() -> str:
+    return datetime.now(UTC).isoformat()
+
+
+def build_step_graph(steps: list[dict[str, Any]]) -> list[list[int]]:
+    """Return each step's dependency indexes, validating the graph.
+
+    When no step declares ``depends_on`` the steps form a serial chain in
+    definition order (the historical behaviour). Otherwise only declared
+    edges apply and steps without ``depends_on`` are roots.
+    """
+    positions: dict[str, int] = {}
+    for index, step in enumerate(steps):
+        step_id = str(step["step_id"])
+        if step_id in positions:
+            raise WorkflowError(f"duplicate step_id: {step_id}")
+        positions[step_id] = index
+    if not any("depends_on" in step for step in steps):
+        return [[index - 1] if index else [] for index in range(len(steps))]
+
+    dependencies: list[list[int]] = []
+    for step in steps:
+        indexes: list[int] = []
+        for dependency in step.get("depends_on", []):
+            if dependency not in positions:
+                raise WorkflowError(f"step {step['step_id']} depends on unknown step: {dependency}")
+            indexes.append(positions[dependency])
+        dependencies.append(indexes)
+
+    state = [0] * len(steps)
+    for root in range(len(steps)):
+        if state[root]:
+            continue
+        stack = [(root, iter(dependencies[root]))]
+        state[root] = 1
+        while stack:
+            index, pending = stack[-1]
+            dependency = next(pending, None)
+            if dependency is None:
+                state[index] = 2
+                stack.pop()
+            elif state[dependency] == 1:
+                raise WorkflowError(f"dependency cycle at step: {steps[dependency]['step_id']}")
+            elif state[dependency] == 0:
+                state[dependency] = 1
+                stack.append((dependency, iter(dependencies[dependency])))
+    return dependencies
+
+
+def _step_ancestors(dependencies: list[list[int]]) -> list[frozenset[int]]:
+    """Transitive ``depends_on`` closure of every step (the graph is acyclic)."""
+    ancestors: list[frozenset[int] | None] = [None] * len(dependencies)
+    for root in range(len(dependencies)):
+        stack = [root]
+        while stack:
+            index = stack[-1]
+            if ancestors[index] is not None:
+                stack.pop()
+                continue
+            pending = [dependency for dependency in dependencies[index] if ancestors[dependency] is None]
+            if pending:
+                stack.extend(pending)
+                continue
+            found: set[int] = set()
+            for dependency in dependencies[index]:
+                found.add(dependency)
+                found.update(ancestors[dependency] or ())
+            ancestors[index] = frozenset(found)
+            stack.pop()
+    return [item or frozenset() for item in ancestors]
+
+
+def _check_guards(
+    step: dict[str, Any],
+    guards: dict[str, CompiledGuard],
+    guard_context: GuardContext,
+) -> tuple[str, str]:
+    for guard_id in step.get("guards", []):
+        guard = guards.get(guard_id)
+        if guard is None:
+            return "blocked", f"guard not found: {guard_id}"
+        if not guard.check(guard_context):
+            return "blocked", guard.reason or f"guard failed: {guard_id}"
+    return "success", ""
+
+
+def _step_record(
+    step: dict[str, Any],
+    status: str,
+    reason: str,
+    started_at: str,
+    evidence: list[str],
+) -> dict[str, Any]:
+    return {
+        "step_id": step["step_id"],
+        "name": step["name"],
+        "plugin_ref": step["plugin_ref"],
+        "action": step["action"],
+        "status": status,
+        "reason": reason,
+        "started_at": started_at,
+        "finished_at": _now(),
+        "evidence": evidence,
+    }
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
+
+
+def _step_timing(wall_s: float, cpu_s: float, guard_s: float, io_s: float) -> dict[str, float]:
+    return {"wall_ms": _ms(wall_s), "cpu_ms": _ms(cpu_s), "guard_ms": _ms(guard_s), "io_ms": _ms(io_s)}
+
+
+def _execute_step(
+    step: dict[str, Any],
+    guards: dict[str, CompiledGuard],
+    guard_context: GuardContext,
+    step_runner: StepRunner | None,
+    context: dict[str, Any],
+    step_cache: StepCache | None = None,
+    cache_inputs: dict[str, Any] | None = None,
+    cache_evidence: frozenset[str] = frozenset(),
+) -> dict[str, Any]:
+    """Run one step and attach its ``timing`` breakdown.
+
+    ``cpu_ms`` is thread CPU time, so it stays per-step under the pool.
+    ``io_ms`` is what the runner reports as ``io_ms``, or else its wall time
+    not spent on CPU (waiting on targets, files, subprocesses).
+    """
+    wall_started = perf_counter()
+    cpu_started = thread_time()
+    spans = {"guard": 0.0, "io": 0.0}
+    record = _run_step(
+        step, guards, guard_context, step_runner, context, step_cache, cache_inputs, cache_evidence, spans
+    )
+    record["timing"] = _step_timing(
+        perf_counter() - wall_started,
+        thread_time() - cpu_started,
+        spans["guard"],
+        spans["io"],
+    )
+    return record
+
+
+def _run_step(
+    step: dict[str, Any],
+    guards: dict[str, CompiledGuard],
+    guard_context: GuardContext,
+    step_runner: StepRunner | None,
+    context: dict[str, Any],
+    step_cache: StepCache | None,
+    cache_inputs: dict[str, Any] | None,
+    cache_evidence: frozenset[str],
+    spans: dict[str, float],
+) -> dict[str, Any]:
+    started_at = _now()
+    guard_started = perf_counter()
+    step_status, step_reason = _check_guards(step, guards, guard_context)
+    spans["guard"] = perf_counter() - guard_started
+    if step_status != "success" or step_runner is None:
+        return _step_record(step, step_status, step_reason, started_at, [])
+
+    cache_key = ""
+    if step_cache is not None:
+        # Only evidence the step's dependencies guarantee is hashed; what unrelated
+        # siblings produced depends on pool scheduling and would make keys unstable.
+        inputs = {"step": step, "evidence": sorted(cache_evidence), **(cache_inputs or {})}
+        cache_key = step_cache_key(
+            str(step["plugin_ref"]),
+            str(step["action"]),
+            str(context["plugin_versions"].get(step["plugin_ref"], "0")),
+            inputs,
+        )
+        cached = step_cache.get(cache_key)
+        if cached is not None:
+            record = _step_record(step, "success", "", started_at, list(cached.get("evidence", [])))
+            record["outputs"] = list(cached.get("outputs", []))
+            record["cache"] = "hit"
+            return record
+
+    runner_started = perf_counter()
+    runner_cpu_started = thread_time()
+    try:
+        outcome = step_runner(step, {**context, "evidence": guard_context.evidence}) or {}
+    except Exception as error:
+        outcome = {"status": "failed", "reason": f"{type(error).__name__}: {error}"}
+    runner_wall = perf_counter() - runner_started
+    runner_cpu = thread_time() - runner_cpu_started
+    if "io_ms" in outcome:
+        spans["io"] = float(outcome["io_ms"]) / 1000
+    else:
+        spans["io"] = max(0.0, runner_wall - runner_cpu)
+    step_status = str(outcome.get("status", "success"))
+    produced = [str(item) for item in outcome.get("evidence", [])]
+    record = _step_record(step, step_status, str(outcome.get("reason", "")), started_at, produced)
+    record["outputs"] = [str(item) for item in outcome.get("outputs", [])]
+    if step_cache is not None:
+        record["cache"] = "miss"
+        if step_status == "success":
+            step_cache.put(cache_key, {"evidence": produced, "outputs": record["outputs"]})
+    return record
+
+
+def _reuse_step(
+    step: dict[str, Any],
+    guards: dict[str, CompiledGuard],
+    guard_context: GuardContext,
+    previous: dict[str, Any],
+) -> dict[str, Any]:
+    """Carry a step that succeeded in an earlier attempt over, re-checking its guards.
+
+    The carried record gets a fresh ``timing`` covering only the guard
+    re-check, so profiles do not count the earlier execution twice.
+    """
+    started_at = _now()
+    guard_started = perf_counter()
+    step_status, step_reason = _check_guards(step, guards, guard_context)
+    guard_s = perf_counter() - guard_started
+    if step_status != "success":
+        record = _step_record(step, step_status, step_reason, started_at, [])
+    else:
+        record = dict(previous)
+        record["evidence"] = list(previous.get("evidence", []))
+        record["reused"] = True
+    record["timing"] = _step_timing(guard_s, guard_s, guard_s, 0.0)
+    return record
 
 
 def run_workflow(
     definition: dict[str, Any],
     run_id: str,
     evidence: set[str] | None = None,
+    step_runner: StepRunner | None = None,
+    max_workers: int = 1,
+    phase: str = "",
+    events: Iterable[dict[str, Any]] | None = None,
+    on_step: StepCallback | None = None,
+    resume_from: dict[str, Any] | None = None,
+    step_cache: StepCache | None = None,
+    plugin_versions: dict[str, str] | None = None,
+    cache_inputs: dict[str, Any] | None = None,
 ) -> dict[str, Any]:
+    """Run a workflow definition as a dependency graph.
+
+    A step starts once all of its dependencies succeeded; with
+    ``max_workers > 1`` independent steps run concurrently on a thread pool.
+    ``step_runner(step, context)`` performs the step and may return
+    ``{"status", "reason", "evidence"}``; evidence keys it reports become
+    visible to the guards of downstream steps. The first step that does not
+    succeed halts the workflow (``blocked``, or ``failed`` when the runner
+    failed or raised): no new steps start, running ones finish and
+    are recorded, and steps that never started are left out.
+
+    Guards are compiled once per definition version (see
+    ``compile_guards``) and evaluated against the evidence, ``phase`` and
+    the tool/severity pairs seen in ``events``.
+
+    ``on_step(workflow_run, record)`` is called on the calling thread after
+    each executed step, so callers can checkpoint progress. ``resume_from``
+    is an earlier attempt of the same workflow run (see
+    ``load_workflow_checkpoint``): it keeps its ``workflow_run_id`` and
+    steps that already succeeded are not executed again once their guards
+    pass against the current evidence; they come back with ``reused: true``.
+
+    With ``step_cache``, a step whose guards pass is looked up by
+    ``(plugin_ref, action, plugin_versions[plugin_ref], step definition,
+    evidence, cache_inputs)`` before the runner is called. The evidence is
+    the run's initial evidence plus what the step's transitive
+    ``depends_on`` closure produced, so the key does not depend on which
+    sibling steps the pool happened to finish first. ``cache_inputs`` should
+    pin the event range the step reads. Successful outputs are stored, and
+    each executed step record carries ``cache: hit|miss``. The cache only
+    applies when a ``step_runner`` executes steps, so it is library-only.
+    """
+    if max_workers < 1:
+        raise WorkflowError("max_workers must be >= 1")
+    steps = list(definition.get("steps", []))
+    dependencies = build_step_graph(steps)
     evidence_set = set(evidence or set())
+    initial_evidence = frozenset(evidence_set)
+    ancestors = _step_ancestors(dependencies) if step_cache is not None else []
     guards = _guard_lookup(definition)
-    started_at = datetime.now(UTC).isoformat()
+    seen_events = GuardContext.from_events(events or ()).seen_events
+    wall_started = perf_counter()
+    started_at = str(resume_from["started_at"]) if resume_from else _now()
+    previous_steps = {
+        str(item["step_id"]): item
+        for item in (resume_from or {}).get("steps", [])
+        if item.get("status") == "success"
+    }
     workflow_run: dict[str, Any] = {
         "workflow_run_id": f"{run_id}:{definition['workflow_id']}:{started_at}",
         "workflow_id": definition["workflow_id"],
@@ -78,38 +479,112 @@ def run_workflow(
         "finished_at": "",
         "steps": [],
     }
+    if resume_from:
+        workflow_run["resumed_at"] = _now()
+    context = {
+        "run_id": run_id,
+        "workflow_id": definition["workflow_id"],
+        "plugin_versions": dict(plugin_versions or {}),
+    }
 
-    for step in definition.get("steps", []):
-        step_status = "success"
-        step_reason = ""
-        for guard_id in step.get("guards", []):
-            guard = guards.get(guard_id)
-            if guard is None:
-                step_status = "blocked"
-                step_reason = f"guard not found: {guard_id}"
-                break
-            if not _evaluate_expression(guard["expression"], evidence_set):
-                step_status = "blocked"
-                step_reason = guard["reason"] or f"guard failed: {guard_id}"
-                break
-
-        workflow_run["steps"].append(
-            {
-                "step_id": step["step_id"],
-                "name": step["name"],
-                "plugin_ref": step["plugin_ref"],
-                "action": step["action"],
-                "status": step_status,
-                "reason": step_reason,
-            }
-        )
+    remaining = [len(items) for items in dependencies]
+    dependents: list[list[int]] = [[] for _ in steps]
+    for index, items in enumerate(dependencies):
+        for dependency in items:
+            dependents[dependency].append(index)
+    ready = [index for index, count in enumerate(remaining) if count == 0]
+    heapq.heapify(ready)
+    records: dict[int, dict[str, Any]] = {}
+    halted = False
+
+    def guard_context() -> GuardContext:
+        return GuardContext(evidence=frozenset(evidence_set), phase=phase, seen_events=seen_events)
+
+    def complete(index: int, record: dict[str, Any]) -> None:
+        nonlocal halted
+        records[index] = record
+        if on_step is not None and not record.get("reused"):
+            on_step(workflow_run, record)
+        if record["status"] != "success":
+            halted = True
+            return
+        evidence_set.update(record["evidence"])
+        for dependent in dependents[index]:
+            remaining[dependent] -= 1
+            if remaining[dependent] == 0:
+                heapq.heappush(ready, dependent)
+
+    def cache_evidence(index: int) -> frozenset[str]:
+        if step_cache is None:
+            return frozenset()
+        scoped = set(initial_evidence)
+        for ancestor in ancestors[index]:
+            scoped.update(records[ancestor].get("evidence", ()))
+        return frozenset(scoped)
+
+    def reuse(index: int) -> bool:
+        previous = previous_steps.get(str(steps[index]["step_id"]))
+        if previous is None:
+            return False
+        complete(index, _reuse_step(steps[index], guards, guard_context(), previous))
+        return True
 
-        if step_status == "blocked":
-            workflow_run["status"] = "blocked"
-            workflow_run["blocked_reason"] = step_reason
-            workflow_run["finished_at"] = datetime.now(UTC).isoformat()
-            return workflow_run
+    if max_workers == 1:
+        while ready and not halted:
+            index = heapq.heappop(ready)
+            if not reuse(index):
+                record = _execute_step(
+                    steps[index],
+                    guards,
+                    guard_context(),
+                    step_runner,
+                    context,
+                    step_cache,
+                    cache_inputs,
+                    cache_evidence(index),
+                )
+                complete(index, record)
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="idk-step") as executor:
+            running: dict[Future[dict[str, Any]], int] = {}
+            while ready or running:
+                while ready and not halted and len(running) < max_workers:
+                    index = heapq.heappop(ready)
+                    if reuse(index):
+                        continue
+                    future = executor.submit(
+                        _execute_step,
+                        steps[index],
+                        guards,
+                        guard_context(),
+                        step_runner,
+                        context,
+                        step_cache,
+                        cache_inputs,
+                        cache_evidence(index),
+                    )
+                    running[future] = index
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in sorted(done, key=running.__getitem__):
+                    complete(running.pop(future), future.result())
 
-    workflow_run["status"] = "success"
-    workflow_run["finished_at"] = datetime.now(UTC).isoformat()
+    for index in sorted(records):
+        record = records[index]
+        for key in ("evidence", "outputs"):
+            if key in record and not record[key]:
+                del record[key]
+        workflow_run["steps"].append(record)
+        if record["status"] != "success" and workflow_run["status"] == "running":
+            workflow_run["status"] = "failed" if record["status"] == "failed" else "blocked"
+            workflow_run["blocked_reason"] = record["reason"]
+    if workflow_run["status"] == "running":
+        workflow_run["status"] = "success"
+    if step_cache is not None:
+        step_cache.flush()
+        statuses = [item.get("cache") for item in workflow_run["steps"]]
+        workflow_run["cache"] = {"hits": statuses.count("hit"), "misses": statuses.count("miss")}
+    workflow_run["timing"] = {"wall_ms": _ms(perf_counter() - wall_started)}
+    workflow_run["finished_at"] = _now()
     return workflow_run
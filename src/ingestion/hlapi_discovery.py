@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 from datetime import datetime, UTC
-import json
 from pathlib import Path
 from typing import Any
 
+from src.core.durable_io import atomic_write_json
+
 
 def _access_mode(raw: str) -> str:
     text = raw.strip().lower()
@@ -57,7 +58,4 @@ def parse_discovery_lines(
 
 
 def write_discovery_records(records: list[dict[str, Any]], output_file: str | Path) -> Path:
-    path = Path(output_file)
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(records, ensure_ascii=False, indent=2), encoding="utf-8")
-    return path
+    return atomic_write_json(Path(output_file), records)
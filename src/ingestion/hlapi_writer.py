@@ -2,12 +2,12 @@ from __future__ import annotations
 
 from collections import Counter
 from collections import defaultdict
-import json
 from pathlib import Path
 import re
 import shutil
 from typing import Any
 
+from src.core.durable_io import AtomicBatch
 
 SENSITIVE_PATTERN = re.compile(
     r"(?i)(password|passwd|token|secret|key)\s*[:=]\s*([^\s,;]+)"
@@ -94,10 +94,10 @@ def write_hlapi_obsidian(
     for case in masked_cases:
         grouped[case["source_sheet"]].append(case)
 
+    batch = AtomicBatch()
     for sheet, rows in grouped.items():
         markdown = _sheet_markdown(sheet, rows)
-        output_file = dirs["notes_testcases"] / f"{sheet}.md"
-        output_file.write_text(markdown, encoding="utf-8")
+        batch.stage_text(dirs["notes_testcases"] / f"{sheet}.md", markdown)
 
     source_path = Path(source_file)
     if source_path.exists():
@@ -118,7 +118,7 @@ def write_hlapi_obsidian(
             f"- unknown: {status_counter.get('unknown', 0)}",
         ]
     )
-    (base / "notes" / "run-summary.md").write_text(run_summary, encoding="utf-8")
+    batch.stage_text(base / "notes" / "run-summary.md", run_summary)
 
     trace_index = "\n".join(
         [
@@ -129,7 +129,7 @@ def write_hlapi_obsidian(
             "",
         ]
     )
-    (base / "notes" / "trace-index.md").write_text(trace_index, encoding="utf-8")
+    batch.stage_text(base / "notes" / "trace-index.md", trace_index)
 
     lineage = [
         {
@@ -140,24 +140,16 @@ def write_hlapi_obsidian(
         }
         for case in masked_cases
     ]
-    (dirs["index"] / "hlapi-testcases.json").write_text(
-        json.dumps(masked_cases, ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
-    (dirs["index"] / "lineage.json").write_text(
-        json.dumps(lineage, ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
+    batch.stage_json(dirs["index"] / "hlapi-testcases.json", masked_cases)
+    batch.stage_json(dirs["index"] / "lineage.json", lineage)
     run_meta = {
         "run_id": run_id,
         "project": project,
         "testcase_count": len(masked_cases),
         "source_file": str(source_path),
     }
-    (dirs["index"] / "run.json").write_text(
-        json.dumps(run_meta, ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
+    batch.stage_json(dirs["index"] / "run.json", run_meta)
+    batch.commit()
 
     return {
         "run_id": run_id,
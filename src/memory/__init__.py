@@ -4,9 +4,22 @@ from src.memory.memory_store import MemoryStore
 from src.memory.memory_store import MemoryStoreError
 from src.memory.compression_codec import CompressionCodec
 from src.memory.compression_codec import CompressionStepResult
+from src.memory.event_archive import EventArchive
+from src.memory.event_archive import EventArchiveError
+from src.memory.event_archive import EventArchiveStats
+from src.memory.event_archive import EventArchiveWriter
+from src.memory.event_archive import write_event_archive
 from src.memory.lexicon import CompressionLexicon
+from src.memory.lifecycle import GcReport
+from src.memory.lifecycle import MemoryLifecycleManager
+from src.memory.lifecycle import RetentionPolicy
+from src.memory.link_index import LongMemoryLinkIndex
+from src.memory.long_memory_index import LongMemoryIndex
+from src.memory.minhash import LshIndex
+from src.memory.minhash import MinHasher
 from src.memory.lexicon import CompressionLexiconEntry
 from src.memory.promotion_engine import MemoryPromotionEngine
+from src.memory.promotion_engine import PromotionCandidate
 from src.memory.promotion_engine import PromotionDecision
 
 __all__ = [
@@ -15,8 +28,21 @@ __all__ = [
     "MemoryStoreError",
     "CompressionCodec",
     "CompressionStepResult",
+    "EventArchive",
+    "EventArchiveError",
+    "EventArchiveStats",
+    "EventArchiveWriter",
+    "write_event_archive",
     "CompressionLexicon",
     "CompressionLexiconEntry",
+    "GcReport",
+    "MemoryLifecycleManager",
+    "RetentionPolicy",
+    "LongMemoryIndex",
+    "LongMemoryLinkIndex",
+    "LshIndex",
+    "MinHasher",
     "MemoryPromotionEngine",
+    "PromotionCandidate",
     "PromotionDecision",
 ]
@@ -1,8 +1,17 @@
 from __future__ import annotations
 
+from collections.abc import Iterable, Iterator
+from contextlib import ExitStack
 from dataclasses import dataclass
-from typing import Any
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Callable
 
+from src.core.durable_io import Durability
+from src.core.durable_io import atomic_open
+from src.memory.event_archive import EventArchive
+from src.memory.event_archive import EventArchiveWriter
 from src.memory.lexicon import CompressionLexicon
 
 
@@ -26,58 +35,82 @@ class CompressionStepResult:
         }
 
 
+def iter_raw_lines(path: Path) -> Iterator[str]:
+    """Yield the stripped, non-empty lines of a JSONL file one at a time."""
+    with path.open("r", encoding="utf-8") as file:
+        for line in file:
+            text = line.strip()
+            if text:
+                yield text
+
+
+def iter_segments_file(path: Path) -> Iterator[dict[str, Any]]:
+    """Yield the run-length segments written by ``compress_stream``."""
+    for line in iter_raw_lines(path):
+        yield json.loads(line)
+
+
+def _line_digest(lines: Iterable[str]) -> str:
+    digest = hashlib.sha256()
+    for line in lines:
+        digest.update(line.encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+def _run_length(lines: Iterable[str], digest: Any) -> Iterator[tuple[str, int]]:
+    """Collapse consecutive duplicates while feeding every raw line into ``digest``."""
+    current_line: str | None = None
+    current_count = 0
+    for line in lines:
+        digest.update(line.encode("utf-8"))
+        digest.update(b"\n")
+        if line == current_line:
+            current_count += 1
+            continue
+        if current_line is not None:
+            yield current_line, current_count
+        current_line = line
+        current_count = 1
+    if current_line is not None:
+        yield current_line, current_count
+
+
 class CompressionCodec:
     def __init__(self, lexicon: CompressionLexicon | None = None) -> None:
         self.lexicon = lexicon or CompressionLexicon()
 
     @staticmethod
-    def _dedup_segments(lines: list[str]) -> list[dict[str, Any]]:
-        if not lines:
-            return []
-        segments: list[dict[str, Any]] = []
-        current_line = lines[0]
-        current_count = 1
-        for line in lines[1:]:
-            if line == current_line:
-                current_count += 1
-                continue
-            segments.append({"line": current_line, "count": current_count})
-            current_line = line
-            current_count = 1
-        segments.append({"line": current_line, "count": current_count})
-        return segments
-
-    @staticmethod
-    def _aggregate_keys(lines: list[str]) -> dict[str, int]:
-        counts: dict[str, int] = {}
-        for line in lines:
-            token = line.split(" ", 1)[0] if " " in line else line
-            counts[token] = counts.get(token, 0) + 1
-        return counts
+    def _aggregate_token(line: str) -> str:
+        return line.split(" ", 1)[0] if " " in line else line
 
-    def compress(self, run_id: str, raw_lines: list[str]) -> dict[str, Any]:
-        segments = self._dedup_segments(raw_lines)
-        dedup_lines = [item["line"] for item in segments]
-        aggregate_counts = self._aggregate_keys(dedup_lines)
+    def _build_payload(
+        self,
+        run_id: str,
+        raw_count: int,
+        dedup_count: int,
+        aggregate_counts: dict[str, int],
+        raw_roundtrip_ok: bool,
+        segment_fields: dict[str, Any],
+    ) -> dict[str, Any]:
         summary_lines = [f"{key} x {count}" for key, count in sorted(aggregate_counts.items())]
         semantic_lines = [self.lexicon.encode_line(line) for line in summary_lines]
         decoded_summary = [self.lexicon.decode_line(line) for line in semantic_lines]
         semantic_roundtrip_ok = decoded_summary == summary_lines
-        raw_roundtrip_ok = self.decompress({"dedup_segments": segments}) == raw_lines
 
         steps = [
             CompressionStepResult(
                 run_id=run_id,
                 step="dedup",
-                input_count=len(raw_lines),
-                output_count=len(dedup_lines),
+                input_count=raw_count,
+                output_count=dedup_count,
                 lossless=True,
                 roundtrip_ok=raw_roundtrip_ok,
             ),
             CompressionStepResult(
                 run_id=run_id,
                 step="aggregate",
-                input_count=len(dedup_lines),
+                input_count=dedup_count,
                 output_count=len(aggregate_counts),
                 lossless=True,
                 roundtrip_ok=raw_roundtrip_ok,
@@ -102,21 +135,123 @@ class CompressionCodec:
 
         payload: dict[str, Any] = self.lexicon.bundle()
         payload["run_id"] = run_id
-        payload["dedup_segments"] = segments
-        payload["dedup_lines"] = dedup_lines
+        payload.update(segment_fields)
         payload["aggregate_counts"] = aggregate_counts
         payload["summary_lines"] = summary_lines
         payload["semantic_lines"] = semantic_lines
         payload["step_results"] = [step.to_dict() for step in steps]
         return payload
 
+    def _stream_segments(
+        self,
+        raw_lines: Iterable[str],
+        emit: Callable[[str, int], None],
+    ) -> tuple[int, dict[str, int], str]:
+        raw_digest = hashlib.sha256()
+        aggregate_counts: dict[str, int] = {}
+        dedup_count = 0
+        for line, count in _run_length(raw_lines, raw_digest):
+            emit(line, count)
+            dedup_count += 1
+            token = self._aggregate_token(line)
+            aggregate_counts[token] = aggregate_counts.get(token, 0) + 1
+        return dedup_count, aggregate_counts, raw_digest.hexdigest()
+
+    def compress(self, run_id: str, raw_lines: list[str]) -> dict[str, Any]:
+        segments: list[dict[str, Any]] = []
+        dedup_count, aggregate_counts, raw_sha256 = self._stream_segments(
+            raw_lines,
+            lambda line, count: segments.append({"line": line, "count": count}),
+        )
+        raw_roundtrip_ok = _line_digest(self.iter_decompressed(segments)) == raw_sha256
+        segment_fields = {
+            "dedup_segments": segments,
+            "dedup_lines": [item["line"] for item in segments],
+        }
+        return self._build_payload(
+            run_id, len(raw_lines), dedup_count, aggregate_counts, raw_roundtrip_ok, segment_fields
+        )
+
+    def compress_stream(
+        self,
+        run_id: str,
+        raw_lines: Iterable[str],
+        segments_path: Path,
+        durability: Durability | str = Durability.ATOMIC,
+        archive_path: Path | None = None,
+        verify_roundtrip: bool = True,
+    ) -> dict[str, Any]:
+        """Compress an iterable of raw lines in a single pass.
+
+        Run-length segments are written to ``segments_path`` as JSONL while
+        the input is consumed, so memory is bounded by the number of distinct
+        aggregate tokens rather than the number of lines. The raw round-trip
+        check compares a sha256 over the input with one over the segments
+        re-read from disk and expanded. The payload points at the segments
+        file instead of inlining ``dedup_segments``/``dedup_lines``.
+
+        With ``archive_path`` the raw lines are also written to a columnar
+        event archive; its size against SC-003 and its own round trip are
+        reported under ``archive``.
+
+        ``verify_roundtrip=False`` skips both re-read passes: the raw steps
+        then report ``roundtrip_ok`` as unchecked (true), ``roundtrip_checked``
+        is false and ``archive`` carries no ``roundtrip_ok``.
+        """
+        raw_count = 0
+        archive: EventArchiveWriter | None = None
+
+        def counted(lines: Iterable[str]) -> Iterator[str]:
+            nonlocal raw_count
+            for line in lines:
+                raw_count += 1
+                if archive is not None:
+                    archive.append(line)
+                yield line
+
+        with ExitStack() as stack:
+            file = stack.enter_context(atomic_open(segments_path, durability))
+            if archive_path is not None:
+                archive = stack.enter_context(EventArchiveWriter(archive_path, durability=durability))
+
+            def emit(line: str, count: int) -> None:
+                record = {"line": line, "count": count}
+                file.write((json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8"))
+
+            dedup_count, aggregate_counts, raw_sha256 = self._stream_segments(counted(raw_lines), emit)
+
+        raw_roundtrip_ok = True
+        if verify_roundtrip:
+            restored_sha256 = _line_digest(self.iter_decompressed(iter_segments_file(segments_path)))
+            raw_roundtrip_ok = restored_sha256 == raw_sha256
+        segment_fields = {
+            "dedup_segments_file": str(segments_path),
+            "dedup_segment_count": dedup_count,
+            "raw_sha256": raw_sha256,
+            "roundtrip_checked": verify_roundtrip,
+        }
+        payload = self._build_payload(
+            run_id, raw_count, dedup_count, aggregate_counts, raw_roundtrip_ok, segment_fields
+        )
+        if archive is not None and archive_path is not None:
+            archive_summary = archive.close().to_dict()
+            if verify_roundtrip:
+                archive_summary["roundtrip_ok"] = _line_digest(EventArchive(archive_path).iter_lines()) == raw_sha256
+            payload["archive"] = archive_summary
+        return payload
+
     @staticmethod
-    def decompress(payload: dict[str, Any]) -> list[str]:
-        output: list[str] = []
-        for item in payload.get("dedup_segments", []):
+    def iter_decompressed(segments: Iterable[dict[str, Any]]) -> Iterator[str]:
+        for item in segments:
             line = str(item.get("line", ""))
             count = int(item.get("count", 0))
-            if count <= 0:
-                continue
-            output.extend([line] * count)
-        return output
+            for _ in range(count):
+                yield line
+
+    @staticmethod
+    def decompress(payload: dict[str, Any]) -> list[str]:
+        if "dedup_segments_file" in payload:
+            segments: Iterable[dict[str, Any]] = iter_segments_file(Path(payload["dedup_segments_file"]))
+        else:
+            segments = payload.get("dedup_segments", [])
+        return list(CompressionCodec.iter_decompressed(segments))
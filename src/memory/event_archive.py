@@ -0,0 +1,416 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from contextlib import ExitStack
+from dataclasses import dataclass
+import json
+from pathlib import Path
+import struct
+from typing import Any, BinaryIO
+import zlib
+
+from src.core.durable_io import Durability
+from src.core.durable_io import atomic_open
+
+try:
+    import zstandard
+except ImportError:  # optional: zlib is always available
+    zstandard = None
+
+# SC-003: compressed event volume has to drop by at least 40%.
+SC003_MIN_REDUCTION = 0.40
+
+ARCHIVE_MAGIC = b"IDKA"
+ARCHIVE_VERSION = 1
+DICTIONARY_COLUMNS = ("tool", "phase", "severity", "target_id")
+_TIMESTAMP_COLUMN = "ts_ns"
+_COLUMNS = frozenset(DICTIONARY_COLUMNS) | {_TIMESTAMP_COLUMN}
+_TRAILER = struct.Struct("<QI4s")
+
+
+class EventArchiveError(ValueError):
+    pass
+
+
+def available_codecs() -> tuple[str, ...]:
+    return ("zstd", "zlib") if zstandard is not None else ("zlib",)
+
+
+def _resolve_codec(codec: str) -> str:
+    if codec == "auto":
+        return available_codecs()[0]
+    if codec not in available_codecs():
+        raise EventArchiveError(f"archive codec not available: {codec}")
+    return codec
+
+
+def _compress(codec: str, data: bytes) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=9).compress(data)
+    return zlib.compress(data, 9)
+
+
+def _decompress(codec: str, data: bytes) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise EventArchiveError("archive was written with zstd, which is not installed")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return zlib.decompress(data)
+
+
+def _put_varint(out: bytearray, value: int) -> None:
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _get_varint(data: bytes, position: int) -> tuple[int, int]:
+    value = 0
+    shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
+
+
+def _zigzag(value: int) -> int:
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def _unzigzag(value: int) -> int:
+    return value // 2 if value % 2 == 0 else -(value + 1) // 2
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _columnar_record(line: str) -> dict[str, Any] | None:
+    """Parse ``line`` if it can be rebuilt byte-for-byte from columns, else None."""
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(record, dict):
+        return None
+    ts_ns = record.get(_TIMESTAMP_COLUMN)
+    if not isinstance(ts_ns, int) or isinstance(ts_ns, bool):
+        return None
+    if any(not isinstance(record.get(column), str) for column in DICTIONARY_COLUMNS):
+        return None
+    if _dumps(record) != line:
+        return None
+    return record
+
+
+class _BlockBuilder:
+    """Accumulates one block: dictionary and timestamp columns plus templated leftovers.
+
+    Each record is encoded as a varint kind (0 = raw line, n = key-order
+    template n-1), then for templated records one dictionary code per
+    dictionary column and a zigzag delta of ``ts_ns``. Values of the other
+    keys are kept in template order in the JSON block header; lines that
+    would not re-serialize identically are stored verbatim.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.first_ts_ns: int | None = None
+        self.last_ts_ns: int | None = None
+        self.raw_count = 0
+        self._templates: dict[tuple[str, ...], int] = {}
+        self._dictionaries: dict[str, dict[str, int]] = {column: {} for column in DICTIONARY_COLUMNS}
+        self._raw: list[str] = []
+        self._rest: list[list[Any]] = []
+        self._codes = bytearray()
+        self._previous_ts = 0
+
+    def add(self, line: str) -> None:
+        self.count += 1
+        record = _columnar_record(line)
+        if record is None:
+            _put_varint(self._codes, 0)
+            self._raw.append(line)
+            self.raw_count += 1
+            return
+        keys = tuple(record)
+        template_id = self._templates.setdefault(keys, len(self._templates))
+        _put_varint(self._codes, template_id + 1)
+        for column in DICTIONARY_COLUMNS:
+            dictionary = self._dictionaries[column]
+            _put_varint(self._codes, dictionary.setdefault(record[column], len(dictionary)))
+        ts_ns = record[_TIMESTAMP_COLUMN]
+        _put_varint(self._codes, _zigzag(ts_ns - self._previous_ts))
+        self._previous_ts = ts_ns
+        if self.first_ts_ns is None:
+            self.first_ts_ns = ts_ns
+        self.last_ts_ns = ts_ns
+        self._rest.append([value for key, value in record.items() if key not in _COLUMNS])
+
+    def encode(self) -> bytes:
+        header = {
+            "count": self.count,
+            "templates": [list(keys) for keys in self._templates],
+            "dictionaries": {column: list(values) for column, values in self._dictionaries.items()},
+            "raw": self._raw,
+            "rest": self._rest,
+        }
+        header_bytes = json.dumps(header, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        output = bytearray()
+        _put_varint(output, len(header_bytes))
+        output += header_bytes
+        output += self._codes
+        return bytes(output)
+
+
+def _decode_block(data: bytes) -> list[str]:
+    header_length, position = _get_varint(data, 0)
+    header = json.loads(data[position : position + header_length].decode("utf-8"))
+    position += header_length
+    templates = header["templates"]
+    dictionaries = [header["dictionaries"][column] for column in DICTIONARY_COLUMNS]
+    raw_lines = iter(header["raw"])
+    rest_values = iter(header["rest"])
+    lines: list[str] = []
+    previous_ts = 0
+    for _ in range(header["count"]):
+        kind, position = _get_varint(data, position)
+        if kind == 0:
+            lines.append(next(raw_lines))
+            continue
+        columns: dict[str, Any] = {}
+        for column, dictionary in zip(DICTIONARY_COLUMNS, dictionaries):
+            code, position = _get_varint(data, position)
+            columns[column] = dictionary[code]
+        delta, position = _get_varint(data, position)
+        previous_ts += _unzigzag(delta)
+        columns[_TIMESTAMP_COLUMN] = previous_ts
+        rest = iter(next(rest_values))
+        record = {key: columns[key] if key in _COLUMNS else next(rest) for key in templates[kind - 1]}
+        lines.append(_dumps(record))
+    return lines
+
+
+@dataclass(frozen=True, slots=True)
+class EventArchiveStats:
+    path: str
+    codec: str
+    record_count: int
+    block_count: int
+    raw_fallback_count: int
+    raw_bytes: int
+    archive_bytes: int
+
+    @property
+    def ratio(self) -> float:
+        return self.archive_bytes / self.raw_bytes if self.raw_bytes else 1.0
+
+    @property
+    def reduction(self) -> float:
+        return 1.0 - self.ratio
+
+    @property
+    def meets_target(self) -> bool:
+        return self.reduction >= SC003_MIN_REDUCTION
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "path": self.path,
+            "codec": self.codec,
+            "record_count": self.record_count,
+            "block_count": self.block_count,
+            "raw_fallback_count": self.raw_fallback_count,
+            "raw_bytes": self.raw_bytes,
+            "archive_bytes": self.archive_bytes,
+            "ratio": round(self.ratio, 4),
+            "reduction": round(self.reduction, 4),
+            "target_reduction": SC003_MIN_REDUCTION,
+            "meets_target": self.meets_target,
+        }
+
+
+class EventArchiveWriter:
+    """Streams event JSONL lines into a block-compressed columnar archive.
+
+    Layout: ``IDKA`` + version byte, the compressed blocks back to back, a
+    zlib-compressed JSON footer (codec plus the block index) and a fixed
+    trailer holding the footer offset and length. Every block is
+    self-contained, so a reader can decode any one of them from the index.
+    The file only replaces ``path`` when ``close`` succeeds.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        block_records: int = 4096,
+        codec: str = "auto",
+        durability: Durability | str = Durability.ATOMIC,
+    ) -> None:
+        if block_records < 1:
+            raise EventArchiveError("block_records must be >= 1")
+        self.path = path
+        self.block_records = block_records
+        self.codec = _resolve_codec(codec)
+        self._stack = ExitStack()
+        self._file: BinaryIO = self._stack.enter_context(atomic_open(path, durability))
+        self._file.write(ARCHIVE_MAGIC + bytes([ARCHIVE_VERSION]))
+        self._offset = len(ARCHIVE_MAGIC) + 1
+        self._blocks: list[dict[str, Any]] = []
+        self._builder = _BlockBuilder()
+        self._record_count = 0
+        self._raw_fallback_count = 0
+        self._raw_bytes = 0
+        self._closed = False
+        self._stats: EventArchiveStats | None = None
+
+    def append(self, line: str) -> None:
+        if self._closed:
+            raise EventArchiveError(f"event archive is closed: {self.path}")
+        self._builder.add(line)
+        self._raw_bytes += len(line.encode("utf-8")) + 1
+        if self._builder.count >= self.block_records:
+            self._flush_block()
+
+    def _flush_block(self) -> None:
+        builder = self._builder
+        if builder.count == 0:
+            return
+        data = _compress(self.codec, builder.encode())
+        self._file.write(data)
+        self._blocks.append(
+            {
+                "offset": self._offset,
+                "length": len(data),
+                "first_record": self._record_count,
+                "count": builder.count,
+                "first_ts_ns": builder.first_ts_ns,
+                "last_ts_ns": builder.last_ts_ns,
+            }
+        )
+        self._offset += len(data)
+        self._record_count += builder.count
+        self._raw_fallback_count += builder.raw_count
+        self._builder = _BlockBuilder()
+
+    def close(self) -> EventArchiveStats:
+        if self._stats is not None:
+            return self._stats
+        if self._closed:
+            raise EventArchiveError(f"event archive was aborted: {self.path}")
+        try:
+            footer_bytes = self._write_footer()
+        except BaseException as error:
+            self._abort(error)
+            raise
+        self._closed = True
+        self._stack.close()
+        self._stats = EventArchiveStats(
+            path=str(self.path),
+            codec=self.codec,
+            record_count=self._record_count,
+            block_count=len(self._blocks),
+            raw_fallback_count=self._raw_fallback_count,
+            raw_bytes=self._raw_bytes,
+            archive_bytes=self._offset + len(footer_bytes) + _TRAILER.size,
+        )
+        return self._stats
+
+    def _write_footer(self) -> bytes:
+        self._flush_block()
+        footer = {
+            "version": ARCHIVE_VERSION,
+            "codec": self.codec,
+            "record_count": self._record_count,
+            "columns": list(DICTIONARY_COLUMNS),
+            "blocks": self._blocks,
+        }
+        footer_bytes = zlib.compress(json.dumps(footer, separators=(",", ":")).encode("utf-8"), 9)
+        self._file.write(footer_bytes)
+        self._file.write(_TRAILER.pack(self._offset, len(footer_bytes), ARCHIVE_MAGIC))
+        return footer_bytes
+
+    def _abort(self, error: BaseException) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._stack.__exit__(type(error), error, error.__traceback__)
+
+    def abort(self) -> None:
+        """Discard the partially written archive; ``path`` is left untouched."""
+        self._abort(EventArchiveError(f"event archive aborted: {self.path}"))
+
+    def __enter__(self) -> "EventArchiveWriter":
+        return self
+
+    def __exit__(self, exc_type: Any, error: BaseException | None, *exc_info: object) -> None:
+        if error is None:
+            self.close()
+        else:
+            self._abort(error)
+
+
+def write_event_archive(
+    path: Path,
+    lines: Iterable[str],
+    block_records: int = 4096,
+    codec: str = "auto",
+) -> EventArchiveStats:
+    with EventArchiveWriter(path, block_records=block_records, codec=codec) as writer:
+        for line in lines:
+            writer.append(line)
+    return writer.close()
+
+
+class EventArchive:
+    """Random-access reader for archives written by ``EventArchiveWriter``."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with path.open("rb") as file:
+            if file.read(len(ARCHIVE_MAGIC) + 1) != ARCHIVE_MAGIC + bytes([ARCHIVE_VERSION]):
+                raise EventArchiveError(f"not an event archive: {path}")
+            file.seek(-_TRAILER.size, 2)
+            footer_offset, footer_length, magic = _TRAILER.unpack(file.read(_TRAILER.size))
+            if magic != ARCHIVE_MAGIC:
+                raise EventArchiveError(f"event archive is truncated: {path}")
+            file.seek(footer_offset)
+            footer = json.loads(zlib.decompress(file.read(footer_length)).decode("utf-8"))
+        self.codec = str(footer["codec"])
+        self.record_count = int(footer["record_count"])
+        self.blocks: list[dict[str, Any]] = list(footer["blocks"])
+
+    @property
+    def block_count(self) -> int:
+        return len(self.blocks)
+
+    def read_block(self, index: int) -> list[str]:
+        entry = self.blocks[index]
+        with self.path.open("rb") as file:
+            file.seek(entry["offset"])
+            data = file.read(entry["length"])
+        return _decode_block(_decompress(self.codec, data))
+
+    def block_for_record(self, record_index: int) -> int:
+        if not 0 <= record_index < self.record_count:
+            raise IndexError(record_index)
+        low = 0
+        high = len(self.blocks) - 1
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self.blocks[middle]["first_record"] <= record_index:
+                low = middle
+            else:
+                high = middle - 1
+        return low
+
+    def line(self, record_index: int) -> str:
+        block_index = self.block_for_record(record_index)
+        return self.read_block(block_index)[record_index - self.blocks[block_index]["first_record"]]
+
+    def iter_lines(self) -> Iterator[str]:
+        for index in range(len(self.blocks)):
+            yield from self.read_block(index)
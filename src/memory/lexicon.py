@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+from collections.abc import Iterable
 from dataclasses import dataclass
 from datetime import datetime, UTC
+import re
 from typing import Any
 
 
@@ -25,10 +27,57 @@ class CompressionLexiconEntry:
         }
 
 
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Build one regex over ``words`` whose trie shape yields the longest match.
+
+    Shared prefixes are factored out, so matching at a position costs the
+    length of the candidate rather than the number of words; greedy optional
+    suffixes make the longest word win when one is a prefix of another.
+    """
+    trie: dict[str, Any] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def render(node: dict[str, Any]) -> str:
+        # Walk single-child chains iteratively so long patterns do not recurse per character.
+        prefix: list[str] = []
+        while "" not in node and len(node) == 1:
+            char, node = next(iter(node.items()))
+            prefix.append(re.escape(char))
+        terminal = "" in node
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return "".join(prefix)
+        body = "(?:" + "|".join(branches) + ")"
+        return "".join(prefix) + (body + "?" if terminal else body)
+
+    return render(trie)
+
+
+class _Replacer:
+    __slots__ = ("pattern", "table")
+
+    def __init__(self, table: dict[str, str]) -> None:
+        self.table = table
+        self.pattern = re.compile(_trie_pattern(table)) if table else None
+
+    def replace(self, text: str) -> str:
+        if self.pattern is None:
+            return text
+        table = self.table
+        return self.pattern.sub(lambda match: table[match.group(0)], text)
+
+
 class CompressionLexicon:
     def __init__(self, version: str = "0.1.0", entries: list[CompressionLexiconEntry] | None = None) -> None:
         self.version = version
         self._entries: list[CompressionLexiconEntry] = list(entries or self.default_entries())
+        self._encoder: _Replacer | None = None
+        self._decoder: _Replacer | None = None
+        self.compile_count = 0
 
     @staticmethod
     def default_entries() -> list[CompressionLexiconEntry]:
@@ -63,17 +112,43 @@ class CompressionLexicon:
     def entries(self) -> list[CompressionLexiconEntry]:
         return list(self._entries)
 
-    def encode_line(self, text: str) -> str:
-        output = text
+    def add_entries(self, entries: Iterable[CompressionLexiconEntry]) -> None:
+        self._entries.extend(entries)
+        self._encoder = None
+        self._decoder = None
+
+    def replace_entries(self, entries: Iterable[CompressionLexiconEntry]) -> None:
+        self._entries = list(entries)
+        self._encoder = None
+        self._decoder = None
+
+    def _compile(self) -> None:
+        """Build the encode/decode automata; the first entry wins on duplicates."""
+        encode: dict[str, str] = {}
+        decode: dict[str, str] = {}
         for entry in self._entries:
-            output = output.replace(entry.original_pattern, entry.token)
-        return output
+            if entry.original_pattern:
+                encode.setdefault(entry.original_pattern, entry.token)
+            if entry.token:
+                decode.setdefault(entry.token, entry.original_pattern)
+        self._encoder = _Replacer(encode)
+        self._decoder = _Replacer(decode)
+        self.compile_count += 1
+
+    def encode_line(self, text: str) -> str:
+        """Replace every pattern with its token in one left-to-right pass.
+
+        At each position the longest matching pattern wins, so the result does
+        not depend on entry order and replaced text is never rescanned.
+        """
+        if self._encoder is None:
+            self._compile()
+        return self._encoder.replace(text)
 
     def decode_line(self, text: str) -> str:
-        output = text
-        for entry in self._entries:
-            output = output.replace(entry.token, entry.original_pattern)
-        return output
+        if self._decoder is None:
+            self._compile()
+        return self._decoder.replace(text)
 
     def bundle(self) -> dict[str, Any]:
         return {
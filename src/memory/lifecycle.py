@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from dataclasses import field
+from datetime import datetime, UTC
+from pathlib import Path
+from time import time
+from typing import Any
+
+from src.core.run_store import load_consensus_records
+from src.memory.compression_codec import CompressionCodec
+from src.memory.memory_store import MemoryRecord
+from src.memory.memory_store import MemoryStore
+
+# Only these tiers are ever reclaimed; candidate and long memory are kept for good.
+MANAGED_TIERS = ("raw", "working")
+
+
+@dataclass(frozen=True, slots=True)
+class RetentionPolicy:
+    """Limits for one tier; ``None`` disables a limit."""
+
+    max_age_s: float | None = None
+    max_count: int | None = None
+    max_bytes: int | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"max_age_s": self.max_age_s, "max_count": self.max_count, "max_bytes": self.max_bytes}
+
+
+DEFAULT_RETENTION: dict[str, RetentionPolicy] = {
+    "raw": RetentionPolicy(max_age_s=7 * 86400, max_count=10_000, max_bytes=64 << 20),
+    "working": RetentionPolicy(max_age_s=30 * 86400, max_count=5_000, max_bytes=32 << 20),
+}
+
+
+@dataclass(slots=True)
+class TierGcResult:
+    tier: str
+    scanned: int = 0
+    protected: int = 0
+    evicted: list[str] = field(default_factory=list)
+    bytes_reclaimed: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "tier": self.tier,
+            "scanned": self.scanned,
+            "protected": self.protected,
+            "evicted_count": len(self.evicted),
+            "evicted": list(self.evicted),
+            "bytes_reclaimed": self.bytes_reclaimed,
+        }
+
+
+@dataclass(slots=True)
+class GcReport:
+    run_id: str
+    dry_run: bool
+    tiers: list[TierGcResult]
+    summary_memory_id: str = ""
+    summary_bytes: int = 0
+
+    @property
+    def bytes_reclaimed(self) -> int:
+        """Bytes of evicted records; the working summary written in their place is ``summary_bytes``."""
+        return sum(item.bytes_reclaimed for item in self.tiers)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "run_id": self.run_id,
+            "dry_run": self.dry_run,
+            "tiers": [item.to_dict() for item in self.tiers],
+            "summary_memory_id": self.summary_memory_id,
+            "summary_bytes": self.summary_bytes,
+            "bytes_reclaimed": self.bytes_reclaimed,
+        }
+
+
+def _created_ts(record: MemoryRecord, fallback: float) -> float:
+    try:
+        created = datetime.fromisoformat(record.created_at)
+    except ValueError:
+        return fallback
+    if created.tzinfo is None:
+        created = created.replace(tzinfo=UTC)
+    return created.timestamp()
+
+
+def referenced_memory_ids(store: MemoryStore) -> set[str]:
+    """Ids that candidate/long records or consensus evidence of the run point at."""
+    referenced: set[str] = set()
+    for tier in ("candidate", "long"):
+        for record in store.list_records(memory_tier=tier):
+            referenced.update(record.evidence_refs)
+            if record.promoted_from:
+                referenced.add(record.promoted_from)
+    for payload in load_consensus_records(store.run_root, store.run_id):
+        referenced.update(str(ref) for ref in payload.get("evidence_refs", []))
+        for claim in payload.get("dissenting_claims", []):
+            referenced.update(str(ref) for ref in claim.get("evidence_refs", []))
+    return referenced
+
+
+class MemoryLifecycleManager:
+    """Applies per-tier retention to one run's raw and working memory.
+
+    Records are ranked least recently used first (``MemoryStore`` bumps the
+    file mtime of raw/working records on read). A record is evicted when its
+    ``created_at`` is more than ``max_age_s`` ago, however recently it was
+    read, or while its tier is over ``max_count`` or
+    ``max_bytes``; ids referenced by candidate/long memory or consensus
+    evidence are never evicted. Raw records are folded into one working
+    summary through ``CompressionCodec`` before they are deleted. A non-dry
+    run also folds the run's promotion link log and is logged to
+    ``index/memory-gc.jsonl``.
+    """
+
+    def __init__(
+        self,
+        policies: dict[str, RetentionPolicy] | None = None,
+        codec: CompressionCodec | None = None,
+    ) -> None:
+        self.policies = dict(DEFAULT_RETENTION if policies is None else policies)
+        self.codec = codec or CompressionCodec()
+
+    def _plan_tier(
+        self,
+        store: MemoryStore,
+        tier: str,
+        protected_ids: set[str],
+        now: float,
+    ) -> tuple[TierGcResult, list[MemoryRecord]]:
+        result = TierGcResult(tier=tier)
+        policy = self.policies.get(tier)
+        entries = store.record_usage(tier)
+        result.scanned = len(entries)
+        if policy is None:
+            return result, []
+        entries.sort(key=lambda item: (item[1], item[0].memory_id))
+        total_count = len(entries)
+        total_bytes = sum(size for _, _, size in entries)
+        evicted: list[MemoryRecord] = []
+        for record, last_used, size in entries:
+            if record.memory_id in protected_ids:
+                result.protected += 1
+                continue
+            expired = policy.max_age_s is not None and now - _created_ts(record, last_used) > policy.max_age_s
+            over_count = policy.max_count is not None and total_count > policy.max_count
+            over_bytes = policy.max_bytes is not None and total_bytes > policy.max_bytes
+            if not (expired or over_count or over_bytes):
+                continue
+            evicted.append(record)
+            result.evicted.append(record.memory_id)
+            result.bytes_reclaimed += size
+            total_count -= 1
+            total_bytes -= size
+        return result, evicted
+
+    def _summarize(self, store: MemoryStore, records: list[MemoryRecord], dry_run: bool) -> tuple[str, int]:
+        payload = self.codec.compress(store.run_id, [record.content for record in records])
+        content = "\n".join(payload["summary_lines"])
+        refs = list(dict.fromkeys(ref for record in records for ref in record.evidence_refs))
+        if dry_run:
+            draft = MemoryRecord(
+                memory_id=store.new_memory_id("working"),
+                run_id=store.run_id,
+                memory_tier="working",
+                content=content,
+                evidence_refs=tuple(refs),
+                created_at=datetime.now(UTC).isoformat(),
+                promoted_from="raw-compaction",
+            )
+            return "", len(store.encode_record(draft))
+        summary = store.create_record(
+            memory_tier="working",
+            content=content,
+            evidence_refs=refs,
+            promoted_from="raw-compaction",
+        )
+        return summary.memory_id, store.record_size("working", summary.memory_id)
+
+    def collect(self, store: MemoryStore, dry_run: bool = False, now: float | None = None) -> GcReport:
+        resolved_now = time() if now is None else now
+        protected_ids = referenced_memory_ids(store)
+        report = GcReport(run_id=store.run_id, dry_run=dry_run, tiers=[])
+
+        raw_result, raw_evicted = self._plan_tier(store, "raw", protected_ids, resolved_now)
+        report.tiers.append(raw_result)
+        if raw_evicted:
+            report.summary_memory_id, report.summary_bytes = self._summarize(store, raw_evicted, dry_run)
+            if report.summary_memory_id:
+                # The fresh summary must not be reclaimed by the working pass of the same run.
+                protected_ids.add(report.summary_memory_id)
+
+        working_result, working_evicted = self._plan_tier(store, "working", protected_ids, resolved_now)
+        report.tiers.append(working_result)
+
+        if not dry_run:
+            for record in raw_evicted + working_evicted:
+                store.delete_record(record.memory_id, record.memory_tier)
+            store.long_memory_links.compact()
+            store.append_gc_report(
+                {
+                    **report.to_dict(),
+                    "policies": {tier: policy.to_dict() for tier, policy in self.policies.items()},
+                    "collected_at": datetime.now(UTC).isoformat(),
+                }
+            )
+        return report
+
+
+def memory_run_ids(run_root: Path) -> list[str]:
+    return sorted(path.parent.name for path in run_root.glob("*/memory") if path.is_dir())
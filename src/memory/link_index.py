@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+from src.memory.snapshot_log import SnapshotLogIndex
+
+
+def _link_key(entry: dict[str, Any]) -> tuple[str, str, str]:
+    return (
+        str(entry["candidate_memory_id"]),
+        str(entry.get("long_run_id") or entry["run_id"]),
+        str(entry["long_memory_id"]),
+    )
+
+
+class LongMemoryLinkIndex(SnapshotLogIndex):
+    """Candidate <-> long memory links of one run.
+
+    New links are appended to ``long-memory-links.jsonl``, so a promotion
+    costs one small append however many links already exist. The folded
+    links live in ``long-memory-links.json`` (the file earlier releases
+    rewrote on every promotion, so existing runs load unchanged). Both
+    lookup maps are built on first use and kept current by replaying only
+    the log bytes appended since the last read. ``compact`` folds the log
+    into the snapshot, where repeated links collapse to their latest entry;
+    ``idk memory gc`` does that for every run it collects.
+    """
+
+    log_name = "long-memory-links.jsonl"
+    snapshot_name = "long-memory-links.json"
+    lock_name = "long-memory-links.lock"
+
+    def _reset_state(self) -> None:
+        self._links: dict[tuple[str, str, str], dict[str, Any]] = {}
+        self._by_candidate: dict[str, dict[str, Any]] = {}
+        self._by_long: dict[tuple[str, str], dict[str, dict[str, Any]]] = {}
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._ensure_loaded()
+            return len(self._links)
+
+    def append(self, entries: list[dict[str, Any]]) -> Path:
+        with self._lock:
+            self._write_log(entries)
+        return self.log_path
+
+    def _apply(self, entry: dict[str, Any]) -> None:
+        key = _link_key(entry)
+        # Re-inserting moves a repeated link to the end, so iteration order follows the latest entry.
+        self._links.pop(key, None)
+        self._links[key] = entry
+        self._by_candidate[key[0]] = entry
+        self._by_long.setdefault(key[1:], {})[key[0]] = entry
+
+    def _load_snapshot(self, payload: Any) -> None:
+        for entry in payload if isinstance(payload, list) else ():
+            self._apply(entry)
+
+    def _snapshot_payload(self) -> list[dict[str, Any]]:
+        return list(self._links.values())
+
+    def links(self) -> list[dict[str, Any]]:
+        with self._lock:
+            self._ensure_loaded()
+            return [dict(entry) for entry in self._links.values()]
+
+    def long_for(self, candidate_memory_id: str) -> dict[str, Any] | None:
+        """Latest link of a candidate, or ``None`` if it was never promoted."""
+        with self._lock:
+            self._ensure_loaded()
+            entry = self._by_candidate.get(candidate_memory_id)
+            return None if entry is None else dict(entry)
+
+    def candidates_for(self, long_memory_id: str, long_run_id: str) -> list[dict[str, Any]]:
+        """Links of every candidate of this run promoted or merged into one long record."""
+        with self._lock:
+            self._ensure_loaded()
+            return [dict(entry) for entry in self._by_long.get((long_run_id, long_memory_id), {}).values()]
@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+import json
+from pathlib import Path
+import re
+from typing import Any
+
+from src.memory.memory_store import MemoryRecord
+from src.memory.memory_store import MemoryStoreError
+from src.memory.minhash import LshIndex
+from src.memory.minhash import MinHasher
+from src.memory.minhash import estimate_jaccard
+from src.memory.snapshot_log import SnapshotLogIndex
+
+_SNAPSHOT_VERSION = 1
+_WORD_PATTERN = re.compile(r"\w+")
+_CJK_PATTERN = re.compile("[\u3400-\u9fff\uf900-\ufaff]+")
+
+
+def tokenize(text: str) -> set[str]:
+    """Lower-cased word tokens; CJK runs, which carry no spaces, become character bigrams."""
+    tokens: set[str] = set()
+    for word in _WORD_PATTERN.findall(text.lower()):
+        tokens.add(word)
+        for run in _CJK_PATTERN.findall(word):
+            if len(run) == 1:
+                tokens.add(run)
+            tokens.update(run[index : index + 2] for index in range(len(run) - 1))
+    return tokens
+
+
+def _document_key(run_id: str, memory_id: str) -> str:
+    return f"{run_id}/{memory_id}"
+
+
+class LongMemoryIndex(SnapshotLogIndex):
+    """Inverted index over long memory of every run under one run root.
+
+    Updates are appended to ``log.jsonl`` as idempotent ``upsert``
+    operations, so a promotion costs one small append and never loads the
+    index. ``snapshot.json`` holds the documents and postings; loading reads
+    it and replays the log on top. Queries only read; the log is folded into
+    the snapshot by ``compact`` or ``rebuild`` (``idk memory gc`` and
+    ``idk memory reindex``). See ``SnapshotLogIndex`` for the locking rules.
+
+    Every document also carries a MinHash signature of its content, banded
+    into an LSH table, so ``find_near_duplicate`` inspects only the records
+    sharing a band instead of scanning the whole long tier.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self._pending: list[dict[str, Any]] | None = None
+        self._hasher = MinHasher(num_perm=64)
+        super().__init__(root)
+
+    def _reset_state(self) -> None:
+        self._documents: dict[str, dict[str, Any]] = {}
+        self._tokens: dict[str, set[str]] = {}
+        self._refs: dict[str, set[str]] = {}
+        self._signatures: dict[str, tuple[int, ...]] = {}
+        self._lsh = LshIndex(bands=16, rows=4)
+
+    @classmethod
+    def for_run_root(cls, run_root: Path) -> "LongMemoryIndex":
+        return cls(run_root / "_index" / "long-memory")
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._ensure_loaded()
+            return len(self._documents)
+
+    def _append(self, operations: list[dict[str, Any]]) -> None:
+        if self._pending is not None:
+            self._pending.extend(operations)
+            if self._loaded:
+                for operation in operations:
+                    self._apply(operation)
+            return
+        self._write_log(operations)
+
+    @contextmanager
+    def batch(self) -> Iterator["LongMemoryIndex"]:
+        """Buffer updates and append them to the log in one write when the block exits.
+
+        Buffered updates are applied to a loaded index right away, so
+        searches and duplicate checks inside the block already see them.
+        The buffer is written even if the block raises, because the records
+        it describes are already on disk.
+        """
+        with self._lock:
+            if self._pending is not None:
+                raise MemoryStoreError("long memory index batch already open")
+            self._pending = []
+        try:
+            yield self
+        finally:
+            with self._lock:
+                operations, self._pending = self._pending, None
+                self._write_log(operations)
+
+    def add(self, record: MemoryRecord) -> None:
+        self.add_many([record])
+
+    def add_many(self, records: Iterable[MemoryRecord]) -> None:
+        with self._lock:
+            self._append([{"op": "upsert", "record": record.to_dict()} for record in records])
+
+    def _unlink(self, key: str) -> None:
+        document = self._documents.pop(key, None)
+        if document is None:
+            return
+        for token in tokenize(document["content"]):
+            postings = self._tokens.get(token)
+            if postings is not None:
+                postings.discard(key)
+                if not postings:
+                    del self._tokens[token]
+        for ref in document["evidence_refs"]:
+            postings = self._refs.get(ref)
+            if postings is not None:
+                postings.discard(key)
+                if not postings:
+                    del self._refs[ref]
+        signature = self._signatures.pop(key, None)
+        if signature is not None:
+            self._lsh.remove(key, signature)
+
+    def _link(self, key: str, document: dict[str, Any], signature: tuple[int, ...] | None) -> None:
+        self._documents[key] = document
+        for token in tokenize(document["content"]):
+            self._tokens.setdefault(token, set()).add(key)
+        for ref in document["evidence_refs"]:
+            self._refs.setdefault(ref, set()).add(key)
+        if signature is not None:
+            # Records without word characters have no signature and never take part in dedup.
+            self._signatures[key] = signature
+            self._lsh.add(key, signature)
+
+    def _apply(self, operation: dict[str, Any]) -> None:
+        document = MemoryRecord.from_dict(operation["record"]).to_dict()
+        key = _document_key(document["run_id"], document["memory_id"])
+        previous = self._documents.get(key)
+        if previous is not None and previous["content"] == document["content"]:
+            # Evidence-only updates (duplicate merges) keep the content signature.
+            signature = self._signatures.get(key)
+        else:
+            signature = self._hasher.signature(document["content"])
+        self._unlink(key)
+        self._link(key, document, signature)
+
+    def _load_snapshot(self, payload: Any) -> None:
+        if not isinstance(payload, dict) or payload.get("version") != _SNAPSHOT_VERSION:
+            return
+        self._documents = dict(payload["documents"])
+        self._tokens = {token: set(keys) for token, keys in payload["tokens"].items()}
+        self._refs = {ref: set(keys) for ref, keys in payload["refs"].items()}
+        stored = payload.get("signatures", {})
+        for key, document in self._documents.items():
+            minhash = stored.get(key)
+            signature = tuple(minhash) if minhash is not None and len(minhash) == self._hasher.num_perm else None
+            if signature is None:
+                signature = self._hasher.signature(document["content"])
+            if signature is not None:
+                self._signatures[key] = signature
+                self._lsh.add(key, signature)
+
+    def _after_reload(self) -> None:
+        # Buffered batch updates are not in the files yet.
+        for operation in self._pending or ():
+            self._apply(operation)
+
+    def _snapshot_payload(self) -> dict[str, Any]:
+        return {
+            "version": _SNAPSHOT_VERSION,
+            "documents": self._documents,
+            "tokens": {token: sorted(keys) for token, keys in self._tokens.items()},
+            "refs": {ref: sorted(keys) for ref, keys in self._refs.items()},
+            "signatures": {key: list(signature) for key, signature in self._signatures.items()},
+        }
+
+    def rebuild(self, run_root: Path) -> int:
+        """Re-index every ``<run>/memory/long/*.json`` under ``run_root``; returns the document count."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        with self._lock, self._file_lock(exclusive=True):
+            # Scanning under the lock means every logged operation is covered, so the fold empties the log.
+            records = [
+                MemoryRecord.from_dict(json.loads(path.read_text(encoding="utf-8")))
+                for path in sorted(run_root.glob("*/memory/long/*.json"))
+            ]
+            self._reset_state()
+            self._loaded = True
+            for record in records:
+                self._apply({"op": "upsert", "record": record.to_dict()})
+            self._fold()
+            return len(self._documents)
+
+    def search(self, text: str = "", evidence_refs: Iterable[str] = (), limit: int = 20) -> list[MemoryRecord]:
+        """Long memories containing every token of ``text`` and every evidence ref, newest first."""
+        tokens = tokenize(text)
+        refs = set(evidence_refs)
+        with self._lock:
+            self._ensure_loaded()
+            postings = [self._tokens.get(token, set()) for token in tokens]
+            postings.extend(self._refs.get(ref, set()) for ref in refs)
+            if not postings:
+                return []
+            postings.sort(key=len)
+            matches = set(postings[0])
+            for keys in postings[1:]:
+                matches &= keys
+                if not matches:
+                    break
+            documents = [self._documents[key] for key in matches]
+        documents.sort(key=lambda item: (item["created_at"], item["run_id"], item["memory_id"]), reverse=True)
+        return [MemoryRecord.from_dict(document) for document in documents[:limit]]
+
+    def find_near_duplicate(
+        self,
+        content: str,
+        threshold: float = 0.8,
+        exclude: Iterable[tuple[str, str]] = (),
+    ) -> tuple[MemoryRecord, float] | None:
+        """Most similar long memory whose estimated Jaccard with ``content`` is >= ``threshold``.
+
+        ``exclude`` lists ``(run_id, memory_id)`` pairs to ignore. Content
+        without word characters has no signature and never matches.
+        """
+        signature = self._hasher.signature(content)
+        if signature is None:
+            return None
+        skipped = {_document_key(run_id, memory_id) for run_id, memory_id in exclude}
+        with self._lock:
+            self._ensure_loaded()
+            best: tuple[float, str] | None = None
+            for key in self._lsh.candidates(signature):
+                if key in skipped:
+                    continue
+                similarity = estimate_jaccard(signature, self._signatures[key])
+                if similarity >= threshold and (best is None or (similarity, key) > best):
+                    best = (similarity, key)
+            if best is None:
+                return None
+            return MemoryRecord.from_dict(self._documents[best[1]]), best[0]
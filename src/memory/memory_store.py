@@ -1,12 +1,22 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from dataclasses import replace
 from datetime import datetime, UTC
 import json
+import os
 from pathlib import Path
-from typing import Any
+from typing import Any, TYPE_CHECKING
 from uuid import uuid4
 
+from src.core.durable_io import atomic_write_bytes
+from src.core.durable_io import atomic_write_json
+from src.core.durable_io import dump_json
+from src.memory.link_index import LongMemoryLinkIndex
+
+if TYPE_CHECKING:
+    from src.memory.long_memory_index import LongMemoryIndex
+
 
 class MemoryStoreError(ValueError):
     pass
@@ -46,12 +56,21 @@ class MemoryRecord:
         )
 
 
+# Estimated content Jaccard at or above which MemoryPromotionEngine merges a candidate into an
+# existing long memory. MemoryStore itself only deduplicates when a threshold is passed.
+DEFAULT_DEDUP_THRESHOLD = 0.8
+
+
 class MemoryStore:
     TIERS = ("raw", "working", "candidate", "long")
+    # Reads of these tiers bump the file mtime so retention can evict least recently used first.
+    USAGE_TRACKED_TIERS = ("raw", "working")
 
-    def __init__(self, run_root: Path, run_id: str) -> None:
+    def __init__(self, run_root: Path, run_id: str, long_index: LongMemoryIndex | None = None) -> None:
         self.run_root = run_root
         self.run_id = run_id
+        self._long_index = long_index
+        self._long_links: LongMemoryLinkIndex | None = None
         self._run_dir = self.run_root / self.run_id
         self._memory_dir = self._run_dir / "memory"
         self._index_dir = self._run_dir / "index"
@@ -60,6 +79,22 @@ class MemoryStore:
         for tier in self.TIERS:
             (self._memory_dir / tier).mkdir(parents=True, exist_ok=True)
 
+    @property
+    def long_index(self) -> LongMemoryIndex:
+        """Cross-run long-memory index shared by every run under ``run_root``."""
+        if self._long_index is None:
+            from src.memory.long_memory_index import LongMemoryIndex
+
+            self._long_index = LongMemoryIndex.for_run_root(self.run_root)
+        return self._long_index
+
+    @property
+    def long_memory_links(self) -> LongMemoryLinkIndex:
+        """Candidate <-> long links of this run, loaded on first lookup."""
+        if self._long_links is None:
+            self._long_links = LongMemoryLinkIndex(self._index_dir)
+        return self._long_links
+
     def _tier_path(self, tier: str) -> Path:
         if tier not in self.TIERS:
             raise MemoryStoreError(f"unknown memory tier: {tier}")
@@ -68,6 +103,15 @@ class MemoryStore:
     def _record_path(self, tier: str, memory_id: str) -> Path:
         return self._tier_path(tier) / f"{memory_id}.json"
 
+    @staticmethod
+    def new_memory_id(memory_tier: str) -> str:
+        return f"mem-{memory_tier}-{uuid4().hex[:12]}"
+
+    @staticmethod
+    def encode_record(record: MemoryRecord) -> bytes:
+        """Bytes ``create_record`` writes for ``record``."""
+        return dump_json(record.to_dict()).encode("utf-8")
+
     def create_record(
         self,
         memory_tier: str,
@@ -76,7 +120,7 @@ class MemoryStore:
         promoted_from: str = "",
         memory_id: str = "",
     ) -> MemoryRecord:
-        resolved_memory_id = memory_id or f"mem-{memory_tier}-{uuid4().hex[:12]}"
+        resolved_memory_id = memory_id or self.new_memory_id(memory_tier)
         record = MemoryRecord(
             memory_id=resolved_memory_id,
             run_id=self.run_id,
@@ -87,14 +131,23 @@ class MemoryStore:
             promoted_from=promoted_from,
         )
         output = self._record_path(memory_tier, resolved_memory_id)
-        output.write_text(json.dumps(record.to_dict(), ensure_ascii=False, indent=2), encoding="utf-8")
+        atomic_write_bytes(output, self.encode_record(record))
         return record
 
+    @classmethod
+    def _touch(cls, tier: str, path: Path) -> None:
+        if tier in cls.USAGE_TRACKED_TIERS:
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+
     def get_record(self, memory_id: str) -> MemoryRecord:
         for tier in self.TIERS:
             path = self._record_path(tier, memory_id)
             if path.exists():
                 payload = json.loads(path.read_text(encoding="utf-8"))
+                self._touch(tier, path)
                 return MemoryRecord.from_dict(payload)
         raise MemoryStoreError(f"memory record not found: {memory_id}")
 
@@ -108,38 +161,145 @@ class MemoryStore:
                 records.append(MemoryRecord.from_dict(payload))
         return records
 
-    def promote_candidate_to_long(self, candidate_memory_id: str) -> MemoryRecord:
-        candidate = self.get_record(candidate_memory_id)
-        if candidate.memory_tier != "candidate":
-            raise MemoryStoreError("only candidate memory can be promoted")
+    def merge_evidence_refs(self, memory_id: str, evidence_refs: list[str] | tuple[str, ...]) -> MemoryRecord:
+        """Add ``evidence_refs`` to a long record in this run, keeping its identity and order."""
+        record = self.get_record(memory_id)
+        if record.memory_tier != "long":
+            raise MemoryStoreError("evidence can only be merged into long memory")
+        merged_refs = record.evidence_refs + tuple(
+            ref for ref in dict.fromkeys(evidence_refs) if ref not in record.evidence_refs
+        )
+        if merged_refs == record.evidence_refs:
+            return record
+        merged = replace(record, evidence_refs=merged_refs)
+        atomic_write_json(self._record_path("long", memory_id), merged.to_dict())
+        self.long_index.add(merged)
+        return merged
+
+    def get_records(self, memory_ids: list[str] | tuple[str, ...], memory_tier: str) -> list[MemoryRecord]:
+        """Read records known to be in ``memory_tier`` without probing the other tiers."""
+        records: list[MemoryRecord] = []
+        for memory_id in memory_ids:
+            path = self._record_path(memory_tier, memory_id)
+            try:
+                payload = json.loads(path.read_text(encoding="utf-8"))
+            except FileNotFoundError:
+                record = self.get_record(memory_id)
+                raise MemoryStoreError(f"memory record {memory_id} is in tier {record.memory_tier}, not {memory_tier}")
+            self._touch(memory_tier, path)
+            records.append(MemoryRecord.from_dict(payload))
+        return records
+
+    def record_usage(self, memory_tier: str) -> list[tuple[MemoryRecord, float, int]]:
+        """``(record, last_used, size_bytes)`` for every record in a tier; last use is the file mtime."""
+        usage: list[tuple[MemoryRecord, float, int]] = []
+        for file in sorted(self._tier_path(memory_tier).glob("*.json")):
+            stat = file.stat()
+            record = MemoryRecord.from_dict(json.loads(file.read_text(encoding="utf-8")))
+            usage.append((record, stat.st_mtime, stat.st_size))
+        return usage
+
+    def record_size(self, memory_tier: str, memory_id: str) -> int:
+        return self._record_path(memory_tier, memory_id).stat().st_size
+
+    def delete_record(self, memory_id: str, memory_tier: str) -> None:
+        if memory_tier == "long":
+            raise MemoryStoreError("long memory cannot be deleted")
+        try:
+            self._record_path(memory_tier, memory_id).unlink()
+        except FileNotFoundError:
+            raise MemoryStoreError(f"memory record not found: {memory_id}") from None
+
+    def append_gc_report(self, report: dict[str, Any]) -> Path:
+        path = self._index_dir / "memory-gc.jsonl"
+        with path.open("a", encoding="utf-8") as file:
+            file.write(json.dumps(report, ensure_ascii=False) + "\n")
+        return path
+
+    def _promote(self, candidate: MemoryRecord, dedup_threshold: float | None) -> tuple[MemoryRecord, dict[str, Any]]:
+        if dedup_threshold is not None:
+            duplicate = self.long_index.find_near_duplicate(candidate.content, threshold=dedup_threshold)
+            if duplicate is not None:
+                existing, _ = duplicate
+                owner = self if existing.run_id == self.run_id else MemoryStore(
+                    self.run_root, existing.run_id, long_index=self.long_index
+                )
+                merged = owner.merge_evidence_refs(existing.memory_id, candidate.evidence_refs)
+                return merged, self._link_entry(candidate.memory_id, merged.memory_id, long_run_id=merged.run_id)
         long_record = self.create_record(
             memory_tier="long",
             content=candidate.content,
             evidence_refs=list(candidate.evidence_refs),
             promoted_from=candidate.memory_id,
         )
-        self._append_long_memory_link(candidate.memory_id, long_record.memory_id)
-        return long_record
-
-    def _append_long_memory_link(self, candidate_id: str, long_id: str) -> Path:
-        path = self._index_dir / "long-memory-links.json"
-        payload: list[dict[str, str]] = []
-        if path.exists():
-            payload = json.loads(path.read_text(encoding="utf-8"))
-        payload.append(
-            {
-                "run_id": self.run_id,
-                "candidate_memory_id": candidate_id,
-                "long_memory_id": long_id,
-                "linked_at": datetime.now(UTC).isoformat(),
-            }
-        )
-        path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
-        return path
+        self.long_index.add(long_record)
+        return long_record, self._link_entry(candidate.memory_id, long_record.memory_id)
+
+    def promote_candidate_to_long(
+        self,
+        candidate_memory_id: str,
+        dedup_threshold: float | None = None,
+    ) -> MemoryRecord:
+        """Promote a candidate into a new long record of this run.
+
+        By default (``dedup_threshold=None``) this always creates the record,
+        with ``promoted_from`` set to the candidate. With a threshold, the
+        cross-run index is first asked for a long record whose content is
+        near-identical (MinHash/LSH); if one exists the candidate's evidence
+        refs are merged into it and that record, possibly from another run,
+        is returned instead of creating a duplicate.
+        """
+        candidate = self.get_record(candidate_memory_id)
+        if candidate.memory_tier != "candidate":
+            raise MemoryStoreError("only candidate memory can be promoted")
+        record, link = self._promote(candidate, dedup_threshold)
+        self._append_long_memory_links([link])
+        return record
+
+    def promote_candidates_to_long(
+        self,
+        candidates: list[MemoryRecord],
+        dedup_threshold: float | None = None,
+    ) -> list[MemoryRecord]:
+        """Promote already loaded candidate records with one index append and one links append.
+
+        With ``dedup_threshold`` set, candidates earlier in the list are
+        visible to the duplicate check of later ones, so near-identical
+        candidates in one batch collapse too.
+        """
+        if any(candidate.memory_tier != "candidate" for candidate in candidates):
+            raise MemoryStoreError("only candidate memory can be promoted")
+        promoted: list[MemoryRecord] = []
+        links: list[dict[str, Any]] = []
+        with self.long_index.batch():
+            for candidate in candidates:
+                record, link = self._promote(candidate, dedup_threshold)
+                promoted.append(record)
+                links.append(link)
+        self._append_long_memory_links(links)
+        return promoted
+
+    def _link_entry(self, candidate_id: str, long_id: str, long_run_id: str = "") -> dict[str, Any]:
+        entry: dict[str, Any] = {
+            "run_id": self.run_id,
+            "candidate_memory_id": candidate_id,
+            "long_memory_id": long_id,
+            "linked_at": datetime.now(UTC).isoformat(),
+        }
+        if long_run_id:
+            entry["long_run_id"] = long_run_id
+            entry["merged"] = True
+        return entry
+
+    def _append_long_memory_links(self, entries: list[dict[str, Any]]) -> Path:
+        return self.long_memory_links.append(entries)
 
     def append_promotion_decision(self, decision: dict[str, Any]) -> Path:
+        return self.append_promotion_decisions([decision])
+
+    def append_promotion_decisions(self, decisions: list[dict[str, Any]]) -> Path:
         path = self._index_dir / "memory-promotion-decisions.jsonl"
+        data = "".join(json.dumps(decision, ensure_ascii=False) + "\n" for decision in decisions)
         with path.open("a", encoding="utf-8") as file:
-            file.write(json.dumps(decision, ensure_ascii=False))
-            file.write("\n")
+            file.write(data)
         return path
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+import hashlib
+import random
+import re
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+def shingles(text: str, size: int = 5) -> set[str]:
+    """Character ``size``-grams of the lower-cased, whitespace-normalized words of ``text``.
+
+    Character shingles work for spaced and CJK text alike and make small
+    edits (punctuation, a changed word) move the similarity only slightly.
+    """
+    normalized = " ".join(_WORD_PATTERN.findall(text.lower()))
+    if len(normalized) <= size:
+        return {normalized} if normalized else set()
+    return {normalized[index : index + size] for index in range(len(normalized) - size + 1)}
+
+
+def _shingle_hash(shingle: str) -> int:
+    return int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class MinHasher:
+    """MinHash signatures from ``num_perm`` universal hashes ``(a * x + b) mod p``.
+
+    The hash parameters derive from ``seed`` only, so signatures stay
+    comparable across processes and persisted snapshots.
+    """
+
+    def __init__(self, num_perm: int = 64, seed: int = 1) -> None:
+        if num_perm < 1:
+            raise ValueError("num_perm must be >= 1")
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._permutations = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME)) for _ in range(num_perm)
+        ]
+
+    def signature(self, text: str) -> tuple[int, ...] | None:
+        """``None`` for text without word characters: it has nothing to compare, so it never matches."""
+        hashes = [_shingle_hash(item) for item in shingles(text)]
+        if not hashes:
+            return None
+        prime = _MERSENNE_PRIME
+        return tuple(min([(a * value + b) % prime for value in hashes]) for a, b in self._permutations)
+
+
+def estimate_jaccard(left: Sequence[int], right: Sequence[int]) -> float:
+    if len(left) != len(right) or not left:
+        return 0.0
+    return sum(1 for a, b in zip(left, right) if a == b) / len(left)
+
+
+class LshIndex:
+    """Banded locality-sensitive hashing over MinHash signatures.
+
+    A signature is cut into ``bands`` slices of ``rows`` values; two keys
+    become candidates when any slice matches exactly. Lookups touch one
+    bucket per band, independent of how many keys are indexed. With the
+    defaults (16 x 4) pairs above roughly 0.5 Jaccard are likely candidates.
+    """
+
+    def __init__(self, bands: int = 16, rows: int = 4) -> None:
+        if bands < 1 or rows < 1:
+            raise ValueError("bands and rows must be >= 1")
+        self.bands = bands
+        self.rows = rows
+        self._buckets: list[dict[tuple[int, ...], set[str]]] = [{} for _ in range(bands)]
+
+    @property
+    def num_perm(self) -> int:
+        return self.bands * self.rows
+
+    def _slices(self, signature: Sequence[int]) -> Iterable[tuple[int, tuple[int, ...]]]:
+        if len(signature) != self.num_perm:
+            raise ValueError(f"signature length {len(signature)} != {self.num_perm}")
+        for band in range(self.bands):
+            yield band, tuple(signature[band * self.rows : (band + 1) * self.rows])
+
+    def add(self, key: str, signature: Sequence[int]) -> None:
+        for band, values in self._slices(signature):
+            self._buckets[band].setdefault(values, set()).add(key)
+
+    def remove(self, key: str, signature: Sequence[int]) -> None:
+        for band, values in self._slices(signature):
+            bucket = self._buckets[band].get(values)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band][values]
+
+    def candidates(self, signature: Sequence[int]) -> set[str]:
+        found: set[str] = set()
+        for band, values in self._slices(signature):
+            found.update(self._buckets[band].get(values, ()))
+        return found
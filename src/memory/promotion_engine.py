@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+from collections.abc import Iterable
 from dataclasses import dataclass
 from datetime import datetime, UTC
 from typing import Any
 from uuid import uuid4
 
+from src.memory.memory_store import DEFAULT_DEDUP_THRESHOLD
 from src.memory.memory_store import MemoryRecord
 from src.memory.memory_store import MemoryStore
 from src.memory.memory_store import MemoryStoreError
@@ -42,9 +44,20 @@ class PromotionDecision:
         }
 
 
+@dataclass(frozen=True, slots=True)
+class PromotionCandidate:
+    candidate_memory_id: str
+    repro_count: int
+    consensus_score: float
+    threshold: float | None = None
+    evidence_refs: tuple[str, ...] = ()
+
+
 class MemoryPromotionEngine:
-    def __init__(self, threshold: float = 0.7) -> None:
+    def __init__(self, threshold: float = 0.7, dedup_threshold: float | None = DEFAULT_DEDUP_THRESHOLD) -> None:
+        # The engine opts into cross-run dedup explicitly; pass None to always create a new long record.
         self.threshold = threshold
+        self.dedup_threshold = dedup_threshold
 
     def _gate_checks(self, repro_count: int, consensus_score: float, threshold: float) -> dict[str, bool]:
         return {
@@ -117,5 +130,42 @@ class MemoryPromotionEngine:
         store.append_promotion_decision(decision_payload)
         if not decision.approved:
             return decision_payload, None
-        promoted = store.promote_candidate_to_long(candidate_memory_id)
+        promoted = store.promote_candidate_to_long(candidate_memory_id, dedup_threshold=self.dedup_threshold)
         return decision_payload, promoted
+
+    def evaluate_and_apply_batch(
+        self,
+        store: MemoryStore,
+        candidates: Iterable[PromotionCandidate],
+    ) -> list[tuple[dict[str, Any], MemoryRecord | None]]:
+        """Batch form of ``evaluate_and_apply`` with results in input order.
+
+        Every candidate is loaded and gated before anything is written; then
+        all decisions are appended in one write, and approved candidates are
+        promoted with one long-index append and one links append.
+        """
+        requests = list(candidates)
+        if not requests:
+            return []
+        records = store.get_records([item.candidate_memory_id for item in requests], "candidate")
+        decisions = [
+            self.evaluate(
+                run_id=store.run_id,
+                candidate_memory_id=item.candidate_memory_id,
+                repro_count=item.repro_count,
+                consensus_score=item.consensus_score,
+                threshold=item.threshold,
+                evidence_refs=item.evidence_refs,
+            ).to_dict()
+            for item in requests
+        ]
+        store.append_promotion_decisions(decisions)
+        approved = [index for index, decision in enumerate(decisions) if decision["approved"]]
+        promoted = store.promote_candidates_to_long(
+            [records[index] for index in approved],
+            dedup_threshold=self.dedup_threshold,
+        )
+        results: list[tuple[dict[str, Any], MemoryRecord | None]] = [(decision, None) for decision in decisions]
+        for index, record in zip(approved, promoted):
+            results[index] = (decisions[index], record)
+        return results
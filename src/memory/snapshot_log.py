@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+from abc import ABC
+from abc import abstractmethod
+from collections.abc import Iterator
+from contextlib import contextmanager
+import json
+import os
+from pathlib import Path
+import threading
+from typing import Any
+
+from src.core.durable_io import Durability
+from src.core.durable_io import atomic_write_json
+
+try:
+    import fcntl
+except ImportError:  # non-POSIX: callers must keep to one process per index
+    fcntl = None
+
+
+def _torn_tail_offset(file: Any, size: int) -> int:
+    """Offset just past the last newline of a file whose last byte is not a newline."""
+    position = size
+    while position > 0:
+        start = max(0, position - 4096)
+        file.seek(start)
+        chunk = file.read(position - start)
+        newline = chunk.rfind(b"\n")
+        if newline >= 0:
+            return start + newline + 1
+        position = start
+    return 0
+
+
+class SnapshotLogIndex(ABC):
+    """In-memory index persisted as a JSON snapshot plus a JSONL operation log.
+
+    Subclasses keep their lookup structures in memory and implement
+    ``_reset_state``, ``_load_snapshot``, ``_snapshot_payload`` and
+    ``_apply``. Operations must be idempotent: a crash between writing the
+    snapshot and emptying the log replays operations the snapshot already
+    reflects.
+
+    Concurrency across processes goes through ``flock`` on ``lock_name``.
+    Appends hold the lock exclusively, readers hold it shared and compaction
+    holds it exclusively, so a fold never races an append or a half-read.
+    Readers never modify files: they replay only complete log lines past the
+    offset they consumed and skip a trailing partial line. The log is only
+    repaired (torn tail dropped) under the exclusive lock of an append, and
+    only folded by ``compact``/``rebuild``, which truncate it in place so no
+    append can land on a replaced inode.
+    """
+
+    log_name = "log.jsonl"
+    snapshot_name = "snapshot.json"
+    lock_name = "index.lock"
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._snapshot_stamp: tuple[int, int, int] | None = None
+        self._log_consumed = 0
+        self._reset_state()
+
+    @abstractmethod
+    def _reset_state(self) -> None:
+        """Empty the in-memory lookup structures."""
+
+    @abstractmethod
+    def _load_snapshot(self, payload: Any) -> None:
+        """Load the parsed snapshot into the emptied structures."""
+
+    @abstractmethod
+    def _snapshot_payload(self) -> Any:
+        """JSON payload written as the snapshot."""
+
+    @abstractmethod
+    def _apply(self, operation: dict[str, Any]) -> None:
+        """Apply one logged operation."""
+
+    def _after_reload(self) -> None:
+        """Hook run after a full reload, before the index is used."""
+
+    @property
+    def log_path(self) -> Path:
+        return self.root / self.log_name
+
+    @property
+    def snapshot_path(self) -> Path:
+        return self.root / self.snapshot_name
+
+    @property
+    def lock_path(self) -> Path:
+        return self.root / self.lock_name
+
+    @contextmanager
+    def _file_lock(self, exclusive: bool) -> Iterator[None]:
+        if fcntl is None or not self.root.exists():
+            # Nothing on disk yet: there is nothing to read and no peer to race.
+            yield
+            return
+        with self.lock_path.open("ab") as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _write_log(self, operations: list[dict[str, Any]]) -> None:
+        if not operations:
+            return
+        self.root.mkdir(parents=True, exist_ok=True)
+        data = "".join(json.dumps(item, ensure_ascii=False) + "\n" for item in operations).encode("utf-8")
+        with self._file_lock(exclusive=True):
+            with self.log_path.open("ab+") as file:
+                size = file.seek(0, os.SEEK_END)
+                if size:
+                    file.seek(size - 1)
+                    if file.read(1) != b"\n":
+                        # Left by a crashed append; no append can be in flight while we hold the lock.
+                        file.truncate(_torn_tail_offset(file, size))
+                file.write(data)
+                file.flush()
+                os.fsync(file.fileno())
+
+    def _snapshot_stamp_now(self) -> tuple[int, int, int] | None:
+        try:
+            stat = self.snapshot_path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _replay_log(self) -> None:
+        try:
+            file = self.log_path.open("rb")
+        except FileNotFoundError:
+            return
+        with file:
+            file.seek(self._log_consumed)
+            for line in file:
+                if not line.endswith(b"\n"):
+                    break
+                self._log_consumed += len(line)
+                if line.strip():
+                    self._apply(json.loads(line))
+
+    def _sync(self) -> None:
+        """Bring memory up to date with the files; caller holds the file lock."""
+        stamp = self._snapshot_stamp_now()
+        log_size = self.log_path.stat().st_size if self.log_path.exists() else 0
+        if self._loaded and stamp == self._snapshot_stamp and log_size >= self._log_consumed:
+            if log_size > self._log_consumed:
+                self._replay_log()
+            return
+        # A new snapshot or a shorter log means another process compacted.
+        self._reset_state()
+        self._log_consumed = 0
+        if stamp is not None:
+            try:
+                payload = json.loads(self.snapshot_path.read_text(encoding="utf-8"))
+            except ValueError:
+                payload = None
+            if payload is not None:
+                self._load_snapshot(payload)
+        self._snapshot_stamp = stamp
+        self._loaded = True
+        self._replay_log()
+        self._after_reload()
+
+    def _ensure_loaded(self) -> None:
+        with self._file_lock(exclusive=False):
+            self._sync()
+
+    def _fold(self) -> None:
+        """Write the snapshot and empty the log; caller holds the exclusive file lock."""
+        atomic_write_json(self.snapshot_path, self._snapshot_payload(), Durability.FSYNC)
+        if self.log_path.exists():
+            with self.log_path.open("rb+") as file:
+                file.truncate(0)
+                os.fsync(file.fileno())
+        self._snapshot_stamp = self._snapshot_stamp_now()
+        self._log_consumed = 0
+
+    def compact(self) -> None:
+        """Fold the log into the snapshot; a no-op while the log is empty."""
+        if not self.log_path.exists():
+            return
+        with self._lock, self._file_lock(exclusive=True):
+            if not self.log_path.stat().st_size:
+                return
+            self._sync()
+            self._fold()
@@ -1,26 +1,17 @@
 from __future__ import annotations
 
 from datetime import datetime, UTC
-import json
 from pathlib import Path
 from typing import Any
 from uuid import uuid4
 
-
-def _read_json(path: Path) -> Any:
-    return json.loads(path.read_text(encoding="utf-8"))
+from src.core.durable_io import Durability
+from src.core.durable_io import atomic_write_json
+from src.core.run_store import latest_consensus_record
 
 
 def build_patch_proposal(run_root: Path, run_id: str) -> dict[str, Any]:
-    run_dir = run_root / run_id
-    consensus_file = run_dir / "index" / "consensus.json"
-    consensus_records = _read_json(consensus_file) if consensus_file.exists() else []
-
-    latest_non_veto = None
-    for item in reversed(consensus_records):
-        if not item.get("vetoed", False):
-            latest_non_veto = item
-            break
+    latest_non_veto = latest_consensus_record(run_root, run_id)
 
     if latest_non_veto is None:
         return {
@@ -55,6 +46,5 @@ def build_patch_proposal(run_root: Path, run_id: str) -> dict[str, Any]:
 
 def write_patch_proposal(run_root: Path, run_id: str, payload: dict[str, Any]) -> Path:
     output = run_root / run_id / "index" / "patch-proposal.json"
-    output.parent.mkdir(parents=True, exist_ok=True)
-    output.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    atomic_write_json(output, payload, Durability.ATOMIC)
     return output
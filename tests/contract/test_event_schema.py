@@ -54,6 +54,53 @@ class EventSchemaTest(unittest.TestCase):
         with self.assertRaises(EventValidationError):
             bus.publish(event)
 
+    def test_event_bus_rejects_enum_pattern_and_nested_violations(self) -> None:
+        bus = EventBus()
+        base = {
+            "event_id": "e-1",
+            "run_id": "run-1",
+            "ts_ns": 1,
+            "phase": "MONITOR",
+            "source": "target",
+            "tool": "uart",
+            "target_id": "board-1",
+            "severity": "warn",
+            "payload": {},
+        }
+        bus.validate(dict(base, address="0x80001000"))
+        invalid_events = [
+            dict(base, phase="UNKNOWN"),
+            dict(base, severity="fatal"),
+            dict(base, ts_ns=-1),
+            dict(base, ts_ns=True),
+            dict(base, address="80001000"),
+            dict(base, payload=[]),
+            dict(base, compression_refs=[{"tier": "semantic", "token": "[x]"}]),
+            dict(base, compression_refs=[{"tier": "zip", "token": "[x]", "lexicon_id": "lex-1"}]),
+            dict(base, links=[{"type": "workflow", "target": ""}]),
+            dict(base, links=[{"type": "workflow", "target": "wf", "extra": 1}]),
+        ]
+        for event in invalid_events:
+            with self.assertRaises(EventValidationError, msg=str(event)):
+                bus.validate(event)
+
+    def test_validate_batch_reports_failing_index(self) -> None:
+        bus = EventBus()
+        good = {
+            "event_id": "e-1",
+            "run_id": "run-1",
+            "ts_ns": 1,
+            "phase": "MONITOR",
+            "source": "target",
+            "tool": "uart",
+            "target_id": "board-1",
+            "severity": "info",
+            "payload": {},
+        }
+        bus.validate_batch([good, dict(good, event_id="e-2")])
+        with self.assertRaisesRegex(EventValidationError, r"events\[1\]"):
+            bus.validate_batch([good, dict(good, source="cloud")])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -7,6 +7,8 @@ import sys
 import tempfile
 import unittest
 
+from src.memory.memory_store import MemoryStore
+
 
 class CliRunWorkflowCommandsTest(unittest.TestCase):
     def _run_cli(self, cwd: Path, *args: str) -> subprocess.CompletedProcess[str]:
@@ -98,6 +100,45 @@ class CliRunWorkflowCommandsTest(unittest.TestCase):
             success_payload = json.loads(success.stdout)
             self.assertEqual("success", success_payload["workflow_run"]["status"])
 
+            resumed = self._run_cli(
+                root,
+                "workflow",
+                "resume",
+                blocked_payload["workflow_run"]["workflow_run_id"],
+                "--run-root",
+                str(run_root),
+                "--evidence",
+                "trace.captured",
+                "--format",
+                "json",
+            )
+            self.assertEqual(0, resumed.returncode, msg=resumed.stderr)
+            resumed_payload = json.loads(resumed.stdout)
+            self.assertEqual("success", resumed_payload["workflow_run"]["status"])
+            self.assertEqual(
+                blocked_payload["workflow_run"]["workflow_run_id"],
+                resumed_payload["workflow_run"]["workflow_run_id"],
+            )
+            self.assertEqual(blocked_payload["output_file"], resumed_payload["output_file"])
+
+            profile = self._run_cli(
+                root,
+                "workflow",
+                "profile",
+                "run-cli-001",
+                "--run-root",
+                str(run_root),
+                "--folded",
+                str(Path(tmp_dir) / "workflow.folded"),
+                "--format",
+                "json",
+            )
+            self.assertEqual(0, profile.returncode, msg=profile.stderr)
+            profile_payload = json.loads(profile.stdout)
+            self.assertEqual(2, profile_payload["workflow_runs"])
+            self.assertIn("rc-01", [item["step_id"] for item in profile_payload["steps"]])
+            self.assertTrue((Path(tmp_dir) / "workflow.folded").exists())
+
             verify = self._run_cli(
                 root,
                 "verify",
@@ -113,6 +154,11 @@ class CliRunWorkflowCommandsTest(unittest.TestCase):
             self.assertEqual(0, verify.returncode, msg=verify.stderr)
             verify_payload = json.loads(verify.stdout)
             self.assertTrue(verify_payload["compression"]["roundtrip_ok"])
+            self.assertTrue(Path(verify_payload["compression"]["dedup_segments_file"]).exists())
+            archive = verify_payload["compression"]["archive"]
+            self.assertTrue(archive["roundtrip_ok"])
+            self.assertEqual(0.40, archive["target_reduction"])
+            self.assertTrue(Path(archive["path"]).exists())
 
             stop = self._run_cli(
                 root,
@@ -131,6 +177,86 @@ class CliRunWorkflowCommandsTest(unittest.TestCase):
             stop_payload = json.loads(stop.stdout)
             self.assertEqual("REPORT", stop_payload["run"]["state"])
 
+            # Stopping an already stopped run is accepted and leaves it in REPORT.
+            stop_again = self._run_cli(
+                root,
+                "run",
+                "stop",
+                "--run-id",
+                "run-cli-001",
+                "--run-root",
+                str(run_root),
+                "--format",
+                "json",
+            )
+            self.assertEqual(0, stop_again.returncode, msg=stop_again.stderr)
+            self.assertEqual("REPORT", json.loads(stop_again.stdout)["run"]["state"])
+
+    def test_memory_search_across_runs(self) -> None:
+        root = Path(__file__).resolve().parents[2]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            run_root = Path(tmp_dir) / "runs"
+            for run_id, content in (("run-a", "uart timeout on boot"), ("run-b", "uart timeout after flash")):
+                store = MemoryStore(run_root=run_root, run_id=run_id)
+                store.create_record("candidate", content, ["trace.captured"], memory_id=f"cand-{run_id}")
+                store.promote_candidate_to_long(f"cand-{run_id}")
+
+            search = self._run_cli(
+                root,
+                "memory",
+                "search",
+                "uart timeout",
+                "--ref",
+                "trace.captured",
+                "--run-root",
+                str(run_root),
+                "--format",
+                "json",
+            )
+            self.assertEqual(0, search.returncode, msg=search.stderr)
+            payload = json.loads(search.stdout)
+            self.assertEqual({"run-a", "run-b"}, {item["run_id"] for item in payload["records"]})
+
+            reindex = self._run_cli(root, "memory", "reindex", "--run-root", str(run_root), "--format", "json")
+            self.assertEqual(0, reindex.returncode, msg=reindex.stderr)
+            self.assertEqual(2, json.loads(reindex.stdout)["document_count"])
+
+            empty = self._run_cli(root, "memory", "search", "--run-root", str(run_root))
+            self.assertEqual(2, empty.returncode)
+
+    def test_memory_gc_dry_run_reports_reclaimable_bytes(self) -> None:
+        root = Path(__file__).resolve().parents[2]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            run_root = Path(tmp_dir) / "runs"
+            store = MemoryStore(run_root=run_root, run_id="run-gc")
+            for index in range(3):
+                store.create_record("raw", f"uart trace line {index}", ["trace.captured"], memory_id=f"raw-{index}")
+
+            dry_run = self._run_cli(
+                root,
+                "memory",
+                "gc",
+                "--run-root",
+                str(run_root),
+                "--raw-max-count",
+                "1",
+                "--dry-run",
+                "--format",
+                "json",
+            )
+            self.assertEqual(0, dry_run.returncode, msg=dry_run.stderr)
+            payload = json.loads(dry_run.stdout)
+            self.assertTrue(payload["dry_run"])
+            self.assertEqual(["run-gc"], [item["run_id"] for item in payload["runs"]])
+            self.assertEqual(2, payload["runs"][0]["tiers"][0]["evicted_count"])
+            self.assertEqual(3, len(store.list_records(memory_tier="raw")))
+
+            collected = self._run_cli(root, "memory", "gc", "--run-root", str(run_root), "--raw-max-count", "1")
+            self.assertEqual(0, collected.returncode, msg=collected.stderr)
+            self.assertIn("bytes_reclaimed:", collected.stdout)
+            self.assertEqual(1, len(store.list_records(memory_tier="raw")))
+            self.assertEqual(1, len(store.list_records(memory_tier="working")))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+from pathlib import Path
+import tempfile
 import unittest
+from unittest import mock
 
 from src.memory.compression_codec import CompressionCodec
 
@@ -23,6 +26,61 @@ class CompressionRoundtripIntegrationTest(unittest.TestCase):
         step_flags = [item["roundtrip_ok"] for item in payload["step_results"]]
         self.assertTrue(all(step_flags))
 
+    def test_stream_matches_in_memory_compress(self) -> None:
+        raw_lines = [f"event step-{index // 3} ok" for index in range(30)] + ["tail line"]
+        codec = CompressionCodec()
+        expected = codec.compress(run_id="run-test-002", raw_lines=raw_lines)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            segments_path = Path(tmp_dir) / "index" / "compression.segments.jsonl"
+            payload = codec.compress_stream(
+                run_id="run-test-002",
+                raw_lines=iter(raw_lines),
+                segments_path=segments_path,
+            )
+            restored = codec.decompress(payload)
+
+            self.assertTrue(segments_path.exists())
+            self.assertNotIn("dedup_lines", payload)
+            self.assertEqual(len(expected["dedup_segments"]), payload["dedup_segment_count"])
+            self.assertEqual(expected["aggregate_counts"], payload["aggregate_counts"])
+            self.assertEqual(expected["semantic_lines"], payload["semantic_lines"])
+            self.assertEqual(expected["step_results"], payload["step_results"])
+            self.assertEqual(raw_lines, restored)
+
+    def test_stream_handles_empty_input(self) -> None:
+        codec = CompressionCodec()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            segments_path = Path(tmp_dir) / "segments.jsonl"
+            payload = codec.compress_stream("run-test-003", iter(()), segments_path)
+
+            self.assertEqual(0, payload["dedup_segment_count"])
+            self.assertEqual([], codec.decompress(payload))
+            self.assertTrue(all(item["roundtrip_ok"] for item in payload["step_results"]))
+
+    def test_stream_skips_reread_without_roundtrip(self) -> None:
+        raw_lines = [f"event step-{index // 2} ok" for index in range(10)]
+        codec = CompressionCodec()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            index_dir = Path(tmp_dir) / "index"
+            with (
+                mock.patch("src.memory.compression_codec.iter_segments_file") as reread_segments,
+                mock.patch("src.memory.compression_codec.EventArchive") as reread_archive,
+            ):
+                payload = codec.compress_stream(
+                    "run-test-004",
+                    iter(raw_lines),
+                    index_dir / "segments.jsonl",
+                    archive_path=index_dir / "events.idka",
+                    verify_roundtrip=False,
+                )
+
+            reread_segments.assert_not_called()
+            reread_archive.assert_not_called()
+            self.assertFalse(payload["roundtrip_checked"])
+            self.assertNotIn("roundtrip_ok", payload["archive"])
+            self.assertEqual(raw_lines, codec.decompress(payload))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
-import json
 from pathlib import Path
 import tempfile
 import unittest
 
 from src.memory.memory_store import MemoryStore
+from src.memory.memory_store import MemoryStoreError
 from src.memory.promotion_engine import MemoryPromotionEngine
+from src.memory.promotion_engine import PromotionCandidate
 
 
 class MemoryPromotionGateIntegrationTest(unittest.TestCase):
@@ -60,10 +61,111 @@ class MemoryPromotionGateIntegrationTest(unittest.TestCase):
             long_records = store.list_records(memory_tier="long")
             self.assertEqual(1, len(long_records))
 
-            link_file = run_root / "run-test-002" / "index" / "long-memory-links.json"
-            self.assertTrue(link_file.exists())
-            links = json.loads(link_file.read_text(encoding="utf-8"))
-            self.assertEqual("candidate-approved", links[0]["candidate_memory_id"])
+            link_log = run_root / "run-test-002" / "index" / "long-memory-links.jsonl"
+            self.assertTrue(link_log.exists())
+            link = store.long_memory_links.long_for("candidate-approved")
+            self.assertEqual(promoted.memory_id, link["long_memory_id"])
+            back_links = store.long_memory_links.candidates_for(promoted.memory_id, promoted.run_id)
+            self.assertEqual(["candidate-approved"], [item["candidate_memory_id"] for item in back_links])
+
+    def test_near_duplicate_candidate_merges_into_existing_long_memory(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            run_root = Path(tmp_dir) / "runs"
+            engine = MemoryPromotionEngine(threshold=0.7)
+            first = MemoryStore(run_root=run_root, run_id="run-test-003")
+            first.create_record(
+                memory_tier="candidate",
+                content="watchdog reset caused by uart rx timeout in boot stage",
+                evidence_refs=["trace.captured"],
+                memory_id="candidate-first",
+            )
+            _, original = engine.evaluate_and_apply(first, "candidate-first", repro_count=2, consensus_score=0.9)
+
+            second = MemoryStore(run_root=run_root, run_id="run-test-004")
+            second.create_record(
+                memory_tier="candidate",
+                content="Watchdog reset caused by UART RX timeout in boot stage.",
+                evidence_refs=["trace.captured", "gdb.core"],
+                memory_id="candidate-second",
+            )
+            decision, merged = engine.evaluate_and_apply(second, "candidate-second", repro_count=3, consensus_score=0.9)
+
+            self.assertTrue(decision["approved"])
+            self.assertEqual((original.run_id, original.memory_id), (merged.run_id, merged.memory_id))
+            self.assertEqual(("trace.captured", "gdb.core"), merged.evidence_refs)
+            self.assertEqual(merged, first.get_record(original.memory_id))
+            self.assertFalse(second.list_records(memory_tier="long"))
+            link = second.long_memory_links.long_for("candidate-second")
+            self.assertTrue(link["merged"])
+            self.assertEqual("run-test-003", link["long_run_id"])
+            self.assertEqual(1, len(first.long_index.search("watchdog", evidence_refs=["gdb.core"])))
+
+            # Called directly, the store keeps its original contract and never merges across runs.
+            third = MemoryStore(run_root=run_root, run_id="run-test-006")
+            third.create_record(
+                memory_tier="candidate",
+                content="Watchdog reset caused by UART RX timeout in boot stage",
+                evidence_refs=["uart.log"],
+                memory_id="candidate-third",
+            )
+            own = third.promote_candidate_to_long("candidate-third")
+            self.assertEqual(("run-test-006", "candidate-third"), (own.run_id, own.promoted_from))
+            self.assertEqual(("trace.captured", "gdb.core"), first.get_record(original.memory_id).evidence_refs)
+
+    def test_batch_promotion_matches_single_path_in_input_order(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            run_root = Path(tmp_dir) / "runs"
+            store = MemoryStore(run_root=run_root, run_id="run-test-005")
+            contents = {
+                "cand-1": "i2c bus hang after clock stretch timeout",
+                "cand-2": "stack overflow in logging thread",
+                "cand-3": "I2C bus hang after clock-stretch timeout!",
+            }
+            for memory_id, content in contents.items():
+                store.create_record("candidate", content, [f"e-{memory_id}"], memory_id=memory_id)
+            engine = MemoryPromotionEngine(threshold=0.7)
+
+            results = engine.evaluate_and_apply_batch(
+                store,
+                [
+                    PromotionCandidate("cand-1", repro_count=2, consensus_score=0.9),
+                    PromotionCandidate("cand-2", repro_count=1, consensus_score=0.9),
+                    PromotionCandidate("cand-3", repro_count=2, consensus_score=0.9, evidence_refs=("e-cand-3",)),
+                ],
+            )
+
+            self.assertEqual(["cand-1", "cand-2", "cand-3"], [item[0]["candidate_memory_id"] for item in results])
+            self.assertEqual([True, False, True], [item[0]["approved"] for item in results])
+            self.assertIsNone(results[1][1])
+            self.assertEqual(results[0][1].memory_id, results[2][1].memory_id)
+            self.assertEqual(("e-cand-1", "e-cand-3"), results[2][1].evidence_refs)
+            self.assertEqual(1, len(store.list_records(memory_tier="long")))
+
+            index_dir = run_root / "run-test-005" / "index"
+            decision_lines = (index_dir / "memory-promotion-decisions.jsonl").read_text("utf-8").splitlines()
+            self.assertEqual(3, len(decision_lines))
+            links = MemoryStore(run_root=run_root, run_id="run-test-005").long_memory_links.links()
+            self.assertEqual(["cand-1", "cand-3"], [item["candidate_memory_id"] for item in links])
+            self.assertTrue(links[1]["merged"])
+
+    def test_batch_rejects_non_candidate_before_writing(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            run_root = Path(tmp_dir) / "runs"
+            store = MemoryStore(run_root=run_root, run_id="run-test-006")
+            store.create_record("candidate", "ok candidate", ["e-1"], memory_id="cand-ok")
+            store.create_record("working", "not a candidate", ["e-2"], memory_id="work-1")
+            engine = MemoryPromotionEngine(threshold=0.7)
+
+            with self.assertRaises(MemoryStoreError):
+                engine.evaluate_and_apply_batch(
+                    store,
+                    [
+                        PromotionCandidate("cand-ok", repro_count=2, consensus_score=0.9),
+                        PromotionCandidate("work-1", repro_count=2, consensus_score=0.9),
+                    ],
+                )
+            self.assertFalse((run_root / "run-test-006" / "index" / "memory-promotion-decisions.jsonl").exists())
+            self.assertFalse(store.list_records(memory_tier="long"))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import asyncio
+from time import sleep
+from typing import Any
+import unittest
+
+from src.core.agent_dispatcher import AgentDispatcher
+from src.core.agent_dispatcher import is_agent_failure
+from src.core.consensus_engine import ConsensusEngine
+
+
+def _sleeping_agent(claim: str, delay_s: float) -> Any:
+    def handler(context: dict[str, Any]) -> dict[str, Any]:
+        _ = context
+        sleep(delay_s)
+        return {"claim": claim, "confidence": 0.8, "evidence_refs": ["trace.captured"]}
+
+    return handler
+
+
+def _failing_agent(context: dict[str, Any]) -> dict[str, Any]:
+    _ = context
+    raise RuntimeError("provider unavailable")
+
+
+class AgentDispatcherTest(unittest.TestCase):
+    def _dispatcher(self) -> AgentDispatcher:
+        dispatcher = AgentDispatcher()
+        dispatcher.register("slow", _sleeping_agent("claim-slow", 1.0))
+        dispatcher.register("fast-a", _sleeping_agent("claim-A", 0.01))
+        dispatcher.register("fast-b", _sleeping_agent("claim-A", 0.02))
+        dispatcher.register("broken", _failing_agent)
+        return dispatcher
+
+    def test_thread_mode_keeps_order_and_reports_timeouts(self) -> None:
+        results = self._dispatcher().dispatch(
+            agent_ids=["slow", "fast-a", "broken", "fast-b"],
+            context={"topic": "root-cause"},
+            mode="thread",
+            agent_timeout_s=0.2,
+        )
+        self.assertEqual(["slow", "fast-a", "broken", "fast-b"], [item["agent_id"] for item in results])
+        self.assertEqual("timeout", results[0]["failure"]["code"])
+        self.assertEqual("error", results[2]["failure"]["code"])
+        self.assertFalse(is_agent_failure(results[1]))
+        self.assertFalse(is_agent_failure(results[3]))
+
+    def test_timeout_counts_from_agent_start(self) -> None:
+        dispatcher = AgentDispatcher(max_workers=1)
+        for agent_id in ("first", "second", "third"):
+            dispatcher.register(agent_id, _sleeping_agent("claim-A", 0.15))
+        # One worker runs the agents back to back; each finishes within its own 0.25s budget.
+        for mode in ("thread", "async"):
+            results = dispatcher.dispatch(
+                agent_ids=["first", "second", "third"],
+                context={"topic": "root-cause"},
+                mode=mode,
+                agent_timeout_s=0.25,
+            )
+            self.assertEqual(["claim-A"] * 3, [item.get("claim") for item in results], mode)
+
+    def test_serial_mode_honors_limits_and_reports_errors(self) -> None:
+        results = self._dispatcher().dispatch(
+            agent_ids=["fast-a", "broken", "slow", "fast-b"],
+            context={"topic": "root-cause"},
+            mode="serial",
+            agent_timeout_s=0.5,
+            deadline_s=0.8,
+        )
+        self.assertEqual(["fast-a", "broken", "slow", "fast-b"], [item["agent_id"] for item in results])
+        self.assertFalse(is_agent_failure(results[0]))
+        self.assertEqual("error", results[1]["failure"]["code"])
+        self.assertEqual("timeout", results[2]["failure"]["code"])
+        self.assertEqual("deadline", results[3]["failure"]["code"])
+
+    def test_async_mode_applies_total_deadline(self) -> None:
+        dispatcher = self._dispatcher()
+
+        async def async_agent(context: dict[str, Any]) -> dict[str, Any]:
+            _ = context
+            await asyncio.sleep(0.01)
+            return {"claim": "claim-B", "confidence": 0.5, "evidence_refs": ["trace.captured"]}
+
+        dispatcher.register("async", async_agent)
+        results = dispatcher.dispatch(
+            agent_ids=["fast-a", "slow", "async"],
+            context={"topic": "root-cause"},
+            mode="async",
+            deadline_s=0.2,
+        )
+        self.assertEqual(["fast-a", "slow", "async"], [item["agent_id"] for item in results])
+        self.assertEqual("deadline", results[1]["failure"]["code"])
+        self.assertEqual("claim-B", results[2]["claim"])
+
+    def test_consensus_runs_on_quorum_and_vetoes_below_it(self) -> None:
+        results = self._dispatcher().dispatch(
+            agent_ids=["fast-a", "fast-b", "broken"],
+            context={"topic": "root-cause"},
+            mode="thread",
+        )
+        engine = ConsensusEngine()
+        payload = engine.evaluate(
+            run_id="run-test-001",
+            topic="root-cause",
+            agent_results=results,
+            required_evidence={"trace.captured"},
+            min_quorum=2,
+        )
+        self.assertFalse(payload["vetoed"])
+        self.assertEqual("claim-A", payload["winning_claim"])
+        self.assertEqual(["broken"], [item["agent_id"] for item in payload["failed_agents"]])
+
+        payload = engine.evaluate(
+            run_id="run-test-001",
+            topic="root-cause",
+            agent_results=results,
+            required_evidence={"trace.captured"},
+            min_quorum=3,
+        )
+        self.assertTrue(payload["vetoed"])
+        self.assertEqual("quorum-not-met", payload["veto_reasons"][0]["code"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+import tempfile
+from typing import Any
+import unittest
+
+from src.core.async_event_bus import AsyncEventBus
+from src.core.async_event_bus import AsyncEventBusError
+from src.core.event_bus import EventValidationError
+from src.core.event_writer import EventWriter
+
+
+def _event(bus: AsyncEventBus, tool: str, index: int) -> dict[str, Any]:
+    return {
+        "event_id": bus.next_event_id(),
+        "run_id": "run-async",
+        "ts_ns": index,
+        "phase": "MONITOR",
+        "source": "target",
+        "tool": tool,
+        "target_id": "board-01",
+        "severity": "info",
+        "payload": {"index": index},
+    }
+
+
+class _FailingWriter(EventWriter):
+    def write(self, event: dict[str, Any]) -> None:
+        raise OSError("disk full")
+
+
+class AsyncEventBusTest(unittest.IsolatedAsyncioTestCase):
+    async def test_concurrent_collectors_drain_into_single_writer(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            events_file = Path(tmp_dir) / "events.raw.jsonl"
+            writer = EventWriter(events_file, Path(tmp_dir) / "event-seq.json", "run-async")
+            async with AsyncEventBus(writer=writer, queue_size=4) as bus:
+                uart_subscription = await bus.subscribe(topic="uart")
+
+                async def collector(tool: str) -> None:
+                    for index in range(20):
+                        await bus.publish(_event(bus, tool, index))
+
+                async def consume() -> list[str]:
+                    return [event["tool"] async for event in uart_subscription]
+
+                consumer = asyncio.create_task(consume())
+                await asyncio.gather(collector("uart"), collector("tracezone"))
+            uart_tools = await consumer
+            writer.close()
+
+            lines = events_file.read_text(encoding="utf-8").splitlines()
+            self.assertEqual(40, len(lines))
+            event_ids = {json.loads(line)["event_id"] for line in lines}
+            self.assertEqual({f"run-async-e{index}" for index in range(1, 41)}, event_ids)
+            self.assertEqual(["uart"] * 20, uart_tools)
+            self.assertEqual(40, bus.written_count)
+
+    async def test_publish_validates_before_enqueue(self) -> None:
+        async with AsyncEventBus() as bus:
+            with self.assertRaises(EventValidationError):
+                await bus.publish({"event_id": "e-1"})
+            self.assertEqual(0, bus.published_count)
+
+    async def test_writer_failure_surfaces_in_publish_and_close(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            writer = _FailingWriter(Path(tmp_dir) / "events.raw.jsonl", Path(tmp_dir) / "event-seq.json", "run-async")
+            bus = AsyncEventBus(writer=writer, queue_size=1)
+            await bus.start()
+            subscription = await bus.subscribe()
+
+            async def flood() -> None:
+                for index in range(10):
+                    await bus.publish(_event(bus, "uart", index))
+
+            with self.assertRaisesRegex(OSError, "disk full"):
+                await asyncio.wait_for(flood(), timeout=5)
+            with self.assertRaisesRegex(OSError, "disk full"):
+                await asyncio.wait_for(bus.close(), timeout=5)
+            self.assertEqual([], [event async for event in subscription])
+            with self.assertRaises(AsyncEventBusError):
+                await bus.publish(_event(bus, "uart", 99))
+            writer.close()
+
+    async def test_close_does_not_wait_on_unread_subscriber(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            writer = EventWriter(Path(tmp_dir) / "events.raw.jsonl", Path(tmp_dir) / "event-seq.json", "run-async")
+            bus = AsyncEventBus(writer=writer, subscriber_queue_size=1)
+            await bus.start()
+            subscription = await bus.subscribe()
+            await bus.publish(_event(bus, "uart", 1))
+
+            # The subscriber queue is full and nobody reads it; the end marker replaces the oldest event.
+            await asyncio.wait_for(bus.close(), timeout=5)
+            writer.close()
+            self.assertEqual(1, bus.written_count)
+            self.assertEqual([], [event async for event in subscription])
+
+    async def test_close_does_not_wait_on_full_unread_subscriber(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            writer = EventWriter(Path(tmp_dir) / "events.raw.jsonl", Path(tmp_dir) / "event-seq.json", "run-async")
+            bus = AsyncEventBus(writer=writer, subscriber_queue_size=2)
+            await bus.start()
+            subscription = await bus.subscribe()
+            for index in range(5):
+                await bus.publish(_event(bus, "uart", index))
+
+            # The writer is stalled on the full subscriber; closing releases it and still writes every event.
+            await asyncio.wait_for(bus.close(), timeout=2)
+            writer.close()
+            self.assertEqual(5, bus.written_count)
+            self.assertEqual([4], [event["payload"]["index"] async for event in subscription])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,39 @@
 from __future__ import annotations
 
+import random
 import unittest
+from unittest import mock
 
+from src.core import consensus_engine
 from src.core.consensus_engine import ConsensusEngine
+from src.core.consensus_engine import ConsensusTopic
+
+
+def _random_topics(seed: int, count: int) -> list[ConsensusTopic]:
+    rng = random.Random(seed)
+    topics: list[ConsensusTopic] = []
+    for index in range(count):
+        results: list[dict[str, object]] = []
+        for agent in range(rng.randint(0, 12)):
+            if rng.random() < 0.1:
+                results.append({"agent_id": f"a{agent}", "failure": {"code": "timeout", "message": "late"}})
+                continue
+            results.append(
+                {
+                    "agent_id": f"a{agent}",
+                    "claim": f"claim-{rng.randint(0, 3)}",
+                    # Repeated tenths make ties and rounding-order differences likely.
+                    "confidence": rng.choice((0.1, 0.2, 0.3, 0.7, rng.random())),
+                    "evidence_refs": rng.sample(["trace.captured", "gdb.core", "uart.log"], rng.randint(0, 2)),
+                }
+            )
+        required = frozenset(rng.sample(["trace.captured", "gdb.core"], rng.randint(0, 1)))
+        topics.append(ConsensusTopic(f"topic-{index}", results, required, min_quorum=rng.randint(0, 3)))
+    return topics
+
+
+def _comparable(payload: dict[str, object]) -> dict[str, object]:
+    return {key: value for key, value in payload.items() if key not in ("consensus_id", "evaluated_at")}
 
 
 class ConsensusScoringUnitTest(unittest.TestCase):
@@ -38,6 +69,47 @@ class ConsensusScoringUnitTest(unittest.TestCase):
         self.assertGreater(payload["weighted_score"], 1.0)
         self.assertTrue(payload["dissenting_claims"])
 
+    def test_evaluate_many_matches_scalar_path(self) -> None:
+        engine = ConsensusEngine()
+        topics = _random_topics(seed=7, count=300)
+        expected = [
+            _comparable(
+                engine.evaluate(
+                    "run-many", item.topic, item.agent_results, set(item.required_evidence), item.min_quorum
+                )
+            )
+            for item in topics
+        ]
+        self.assertTrue(any(not item["vetoed"] for item in expected))
+        self.assertTrue(any(item["vetoed"] for item in expected))
+
+        self.assertEqual(expected, [_comparable(item) for item in engine.evaluate_many("run-many", topics)])
+        with mock.patch.object(consensus_engine, "numpy", None):
+            self.assertEqual(expected, [_comparable(item) for item in engine.evaluate_many("run-many", topics)])
+
+    def test_evaluate_many_vetoes_each_missing_ref_in_order(self) -> None:
+        engine = ConsensusEngine()
+        results = [{"agent_id": "a1", "claim": "claim-A", "confidence": 0.5, "evidence_refs": ["gdb.core"]}]
+        required = frozenset({"uart.log", "gdb.core", "trace.captured"})
+        topics = [
+            ConsensusTopic("vetoed", results, required),
+            ConsensusTopic("clean", results, frozenset({"gdb.core"})),
+        ]
+        expected = [
+            _comparable(engine.evaluate("run-many", item.topic, item.agent_results, set(item.required_evidence)))
+            for item in topics
+        ]
+        self.assertEqual(
+            ["missing evidence: trace.captured", "missing evidence: uart.log"],
+            [item["message"] for item in expected[0]["veto_reasons"]],
+        )
+        for backend in (consensus_engine.numpy, None):
+            with mock.patch.object(consensus_engine, "numpy", backend):
+                self.assertEqual(expected, [_comparable(item) for item in engine.evaluate_many("run-many", topics)])
+
+    def test_evaluate_many_handles_empty_batch(self) -> None:
+        self.assertEqual([], ConsensusEngine().evaluate_many("run-many", []))
+
 
 if __name__ == "__main__":
     unittest.main()
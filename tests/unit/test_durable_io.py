@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+import tempfile
+import unittest
+
+from src.core.durable_io import AtomicBatch
+from src.core.durable_io import Durability
+from src.core.durable_io import atomic_write_json
+
+
+class DurableIoTest(unittest.TestCase):
+    def test_atomic_write_replaces_file_without_leaving_temp_files(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            target = Path(tmp_dir) / "index" / "run.json"
+            for durability in Durability:
+                atomic_write_json(target, {"state": durability.value}, durability)
+                self.assertEqual(durability.value, json.loads(target.read_text(encoding="utf-8"))["state"])
+            self.assertEqual(["run.json"], [file.name for file in target.parent.iterdir()])
+
+    def test_batch_commits_all_files_or_none(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            with AtomicBatch(Durability.FSYNC_DIR) as batch:
+                batch.stage_json(root / "index" / "a.json", {"value": 1})
+                batch.stage_text(root / "notes" / "b.md", "# b")
+            self.assertTrue((root / "index" / "a.json").exists())
+            self.assertEqual("# b", (root / "notes" / "b.md").read_text(encoding="utf-8"))
+
+            with self.assertRaises(RuntimeError):
+                with AtomicBatch() as batch:
+                    batch.stage_json(root / "index" / "a.json", {"value": 2})
+                    raise RuntimeError("abort")
+            self.assertEqual(1, json.loads((root / "index" / "a.json").read_text(encoding="utf-8"))["value"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+import tempfile
+import unittest
+
+from src.memory.event_archive import EventArchive
+from src.memory.event_archive import EventArchiveError
+from src.memory.event_archive import EventArchiveWriter
+from src.memory.event_archive import write_event_archive
+
+
+def _event_lines(count: int) -> list[str]:
+    lines: list[str] = []
+    for index in range(count):
+        event = {
+            "event_id": f"run-a-e{index + 1}",
+            "run_id": "run-a",
+            "ts_ns": 1_700_000_000_000_000_000 + index * 1_250_000 - (index % 3) * 7,
+            "phase": "MONITOR" if index % 10 else "DETECT",
+            "source": "target",
+            "tool": ("uart", "gdb", "perf")[index % 3],
+            "target_id": "dut-01",
+            "severity": "error" if index % 17 == 0 else "info",
+            "payload": {"line": f"watchdog tick {index % 5}", "seq": index},
+        }
+        lines.append(json.dumps(event, ensure_ascii=False))
+    return lines
+
+
+class EventArchiveTest(unittest.TestCase):
+    def test_roundtrip_with_random_access(self) -> None:
+        lines = _event_lines(250)
+        lines.insert(40, "not json at all")
+        lines.insert(41, '{"ts_ns": 5, "tool": "x", "phase": "p", "severity": "s", "target_id": "t", "msg": "中文"}')
+        lines.insert(42, '{"ts_ns":5}')
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "events.idka"
+            stats = write_event_archive(path, lines, block_records=64)
+            archive = EventArchive(path)
+
+            self.assertEqual(lines, list(archive.iter_lines()))
+            self.assertEqual(len(lines), archive.record_count)
+            self.assertEqual(4, archive.block_count)
+            self.assertEqual(2, stats.raw_fallback_count)
+            self.assertEqual(lines[200], archive.line(200))
+            self.assertEqual(3, archive.block_for_record(200))
+            self.assertEqual(path.stat().st_size, stats.archive_bytes)
+            self.assertTrue(stats.meets_target)
+            with self.assertRaises(IndexError):
+                archive.line(len(lines))
+
+    def test_failed_write_leaves_no_archive(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "events.idka"
+            with self.assertRaises(RuntimeError):
+                with EventArchiveWriter(path) as writer:
+                    writer.append(_event_lines(1)[0])
+                    raise RuntimeError("interrupted")
+
+            self.assertEqual([], list(Path(tmp_dir).iterdir()))
+            with self.assertRaises(EventArchiveError):
+                writer.append("late")
+
+    def test_rejects_foreign_file(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "events.idka"
+            path.write_bytes(b"{}\n")
+            with self.assertRaises(EventArchiveError):
+                EventArchive(path)
+
+    def test_unavailable_codec_is_rejected(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with self.assertRaises(EventArchiveError):
+                EventArchiveWriter(Path(tmp_dir) / "events.idka", codec="lz4")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from typing import Any
+import unittest
+
+from src.core.event_bus import EventBus
+
+
+def _event(index: int, tool: str = "uart", phase: str = "MONITOR", severity: str = "info") -> dict[str, Any]:
+    return {
+        "event_id": f"run-bus-e{index}",
+        "run_id": "run-bus",
+        "ts_ns": index,
+        "phase": phase,
+        "source": "target",
+        "tool": tool,
+        "target_id": "board-01",
+        "severity": severity,
+        "payload": {},
+    }
+
+
+class EventBusRingBufferTest(unittest.TestCase):
+    def test_ring_buffer_keeps_recent_events_and_counts_overflow(self) -> None:
+        bus = EventBus(capacity=3)
+        for index in range(1, 6):
+            bus.publish(_event(index))
+        self.assertEqual(5, bus.published_count)
+        self.assertEqual(3, bus.retained_count)
+        self.assertEqual(2, bus.dropped_count)
+        self.assertEqual(["run-bus-e3", "run-bus-e4", "run-bus-e5"], [item["event_id"] for item in bus.events])
+
+    def test_cursor_reads_incrementally_and_reports_missed_events(self) -> None:
+        bus = EventBus(capacity=3)
+        cursor = bus.cursor()
+        bus.publish(_event(1))
+        bus.publish(_event(2))
+        self.assertEqual(["run-bus-e1"], [item["event_id"] for item in cursor.read(max_events=1)])
+        self.assertEqual(1, cursor.pending)
+
+        for index in range(3, 7):
+            bus.publish(_event(index))
+        self.assertEqual(["run-bus-e4", "run-bus-e5", "run-bus-e6"], [item["event_id"] for item in cursor])
+        self.assertEqual(2, cursor.missed)
+        self.assertEqual(0, cursor.pending)
+
+        tail = bus.cursor(from_start=False)
+        bus.publish(_event(7))
+        self.assertEqual(["run-bus-e7"], [item["event_id"] for item in tail])
+
+    def test_subscriptions_filter_by_topic_phase_and_severity(self) -> None:
+        bus = EventBus()
+        uart_errors: list[str] = []
+        everything: list[str] = []
+        detect_events: list[str] = []
+        error_id = bus.subscribe(lambda event: uart_errors.append(event["event_id"]), topic="uart", severity=("error", "critical"))
+        bus.subscribe(lambda event: everything.append(event["event_id"]))
+        bus.subscribe(lambda event: detect_events.append(event["event_id"]), phase="DETECT")
+
+        bus.publish(_event(1, severity="error"))
+        bus.publish(_event(2, tool="tracezone", severity="error"))
+        bus.publish(_event(3, phase="DETECT"))
+        bus.unsubscribe(error_id)
+        bus.publish(_event(4, severity="critical"))
+
+        self.assertEqual(["run-bus-e1"], uart_errors)
+        self.assertEqual(["run-bus-e1", "run-bus-e2", "run-bus-e3", "run-bus-e4"], everything)
+        self.assertEqual(["run-bus-e3"], detect_events)
+
+
+if __name__ == "__main__":
+    unittest.main()
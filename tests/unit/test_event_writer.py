@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+import tempfile
+import unittest
+
+from src.core import event_writer
+from src.core.event_writer import EventWriter
+from src.core.event_writer import EventWriterError
+from src.core.event_writer import FsyncPolicy
+
+
+def _event(run_id: str, index: int, phase: str = "MONITOR") -> dict[str, object]:
+    return {
+        "event_id": f"{run_id}-e{index}",
+        "run_id": run_id,
+        "ts_ns": index,
+        "phase": phase,
+        "source": "target",
+        "tool": "uart",
+        "target_id": "board-01",
+        "severity": "info",
+        "payload": {"line": index},
+    }
+
+
+class EventWriterTest(unittest.TestCase):
+    def test_batches_until_size_and_flushes_on_phase_change(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            events_file = Path(tmp_dir) / "assets" / "events.raw.jsonl"
+            seq_file = Path(tmp_dir) / "event-seq.json"
+            writer = EventWriter(events_file, seq_file, "run-w", max_batch_events=3, flush_interval_s=3600)
+            writer.write(_event("run-w", 1))
+            writer.write(_event("run-w", 2))
+            self.assertEqual(0, events_file.stat().st_size)
+            self.assertEqual(2, writer.event_count)
+
+            writer.write(_event("run-w", 3))
+            self.assertEqual(3, len(events_file.read_text(encoding="utf-8").splitlines()))
+
+            writer.write(_event("run-w", 4))
+            writer.write(_event("run-w", 5, phase="DETECT"))
+            self.assertEqual(4, len(events_file.read_text(encoding="utf-8").splitlines()))
+            self.assertEqual(1, writer.pending_count)
+
+            writer.close()
+            self.assertEqual(5, len(events_file.read_text(encoding="utf-8").splitlines()))
+            seq = json.loads(seq_file.read_text(encoding="utf-8"))
+            self.assertEqual(5, seq["event_count"])
+            self.assertEqual(events_file.stat().st_size, seq["byte_offset"])
+
+    def test_per_event_policy_and_time_based_flush(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            now = [0.0]
+            events_file = Path(tmp_dir) / "events.raw.jsonl"
+            seq_file = Path(tmp_dir) / "event-seq.json"
+            with EventWriter(events_file, seq_file, "run-w", fsync_policy=FsyncPolicy.EVENT) as writer:
+                writer.write(_event("run-w", 1))
+                self.assertEqual(0, writer.pending_count)
+
+            timed = EventWriter(events_file, seq_file, "run-w", flush_interval_s=5.0, clock=lambda: now[0])
+            self.assertEqual("run-w-e2", timed.next_event_id())
+            timed.write(_event("run-w", 2))
+            self.assertEqual(1, timed.pending_count)
+            now[0] = 6.0
+            timed.write(_event("run-w", 3))
+            self.assertEqual(0, timed.pending_count)
+            timed.close()
+
+    @unittest.skipIf(event_writer.fcntl is None, "writer lock needs fcntl.flock")
+    def test_second_writer_on_same_run_is_refused(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            events_file = Path(tmp_dir) / "events.raw.jsonl"
+            seq_file = Path(tmp_dir) / "event-seq.json"
+            first = EventWriter(events_file, seq_file, "run-w")
+            first.write(_event("run-w", 1))
+            with self.assertRaises(EventWriterError):
+                EventWriter(events_file, seq_file, "run-w")
+            first.close()
+
+            with EventWriter(events_file, seq_file, "run-w") as second:
+                self.assertEqual("run-w-e2", second.next_event_id())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import unittest
+
+from src.memory.lexicon import CompressionLexicon
+from src.memory.lexicon import CompressionLexiconEntry
+
+
+def _entry(lexicon_id: str, token: str, pattern: str) -> CompressionLexiconEntry:
+    return CompressionLexiconEntry(
+        lexicon_id=lexicon_id,
+        token=token,
+        original_pattern=pattern,
+        reverse_rule="token-replace",
+        tier="semantic",
+        created_at="2026-01-01T00:00:00+00:00",
+    )
+
+
+class CompressionLexiconTest(unittest.TestCase):
+    def test_default_entries_roundtrip(self) -> None:
+        lexicon = CompressionLexicon()
+        line = "workflow run x2; root cause hypothesis accepted"
+        encoded = lexicon.encode_line(line)
+
+        self.assertEqual("[wf_run] x2; [rc_ok]", encoded)
+        self.assertEqual(line, lexicon.decode_line(encoded))
+
+    def test_longest_pattern_wins_regardless_of_entry_order(self) -> None:
+        entries = [
+            _entry("lex-a", "[wf]", "workflow"),
+            _entry("lex-b", "[wf_run]", "workflow run"),
+        ]
+        forward = CompressionLexicon(entries=entries)
+        backward = CompressionLexicon(entries=list(reversed(entries)))
+        line = "workflow run then workflow stop"
+
+        self.assertEqual("[wf_run] then [wf] stop", forward.encode_line(line))
+        self.assertEqual(forward.encode_line(line), backward.encode_line(line))
+        self.assertEqual(line, forward.decode_line(forward.encode_line(line)))
+
+    def test_replaced_text_is_not_rescanned(self) -> None:
+        lexicon = CompressionLexicon(entries=[_entry("lex-a", "[b]", "a"), _entry("lex-b", "[c]", "[b]")])
+
+        self.assertEqual("[b] [c]", lexicon.encode_line("a [b]"))
+
+    def test_recompiles_only_when_entries_change(self) -> None:
+        lexicon = CompressionLexicon()
+        lexicon.encode_line("workflow run")
+        lexicon.decode_line("[wf_run]")
+        self.assertEqual(1, lexicon.compile_count)
+
+        lexicon.add_entries([_entry("lex-100", "[tc]", "trace.captured")])
+        self.assertEqual("[tc] ok", lexicon.encode_line("trace.captured ok"))
+        self.assertEqual(2, lexicon.compile_count)
+
+        lexicon.replace_entries([])
+        self.assertEqual("workflow run", lexicon.encode_line("workflow run"))
+        self.assertEqual(3, lexicon.compile_count)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+import tempfile
+import unittest
+
+from src.memory.link_index import LongMemoryLinkIndex
+
+
+def _link(candidate_id: str, long_id: str, long_run_id: str = "") -> dict[str, object]:
+    entry: dict[str, object] = {
+        "run_id": "run-a",
+        "candidate_memory_id": candidate_id,
+        "long_memory_id": long_id,
+        "linked_at": "2026-01-01T00:00:00+00:00",
+    }
+    if long_run_id:
+        entry["long_run_id"] = long_run_id
+        entry["merged"] = True
+    return entry
+
+
+class LongMemoryLinkIndexTest(unittest.TestCase):
+    def test_lookups_in_both_directions_see_later_appends(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            index_dir = Path(tmp_dir)
+            links = LongMemoryLinkIndex(index_dir)
+            links.append([_link("cand-1", "long-1"), _link("cand-2", "long-9", long_run_id="run-b")])
+            self.assertEqual("long-1", links.long_for("cand-1")["long_memory_id"])
+
+            # A second writer's append is picked up without reloading the maps from scratch.
+            LongMemoryLinkIndex(index_dir).append([_link("cand-3", "long-9", long_run_id="run-b")])
+            merged = links.candidates_for("long-9", "run-b")
+            self.assertEqual(["cand-2", "cand-3"], [item["candidate_memory_id"] for item in merged])
+            self.assertEqual([], links.candidates_for("long-9", "run-a"))
+            self.assertIsNone(links.long_for("cand-missing"))
+
+    def test_legacy_links_file_is_read_as_snapshot(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            index_dir = Path(tmp_dir)
+            (index_dir / "long-memory-links.json").write_text(json.dumps([_link("cand-old", "long-old")]), "utf-8")
+            links = LongMemoryLinkIndex(index_dir)
+            links.append([_link("cand-new", "long-new")])
+
+            self.assertEqual(["cand-old", "cand-new"], [item["candidate_memory_id"] for item in links.links()])
+            self.assertEqual("long-old", links.long_for("cand-old")["long_memory_id"])
+
+    def test_compaction_folds_log_into_snapshot(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            index_dir = Path(tmp_dir)
+            links = LongMemoryLinkIndex(index_dir)
+            links.append([_link("cand-1", "long-1"), _link("cand-1", "long-1"), _link("cand-2", "long-2")])
+            links.compact()
+
+            self.assertEqual(2, len(links))
+            self.assertEqual(0, links.log_path.stat().st_size)
+            snapshot = json.loads(links.snapshot_path.read_text(encoding="utf-8"))
+            self.assertEqual(["cand-1", "cand-2"], [item["candidate_memory_id"] for item in snapshot])
+
+            links.append([_link("cand-3", "long-1")])
+            reloaded = LongMemoryLinkIndex(index_dir)
+            self.assertEqual(3, len(reloaded))
+            back_links = reloaded.candidates_for("long-1", "run-a")
+            self.assertEqual(["cand-1", "cand-3"], [item["candidate_memory_id"] for item in back_links])
+
+    def test_reads_skip_torn_tail_without_modifying_files(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            links = LongMemoryLinkIndex(Path(tmp_dir))
+            links.append([_link("cand-1", "long-1")])
+            with links.log_path.open("a", encoding="utf-8") as file:
+                file.write('{"run_id": "run-a", "candi')
+            before = links.log_path.read_bytes()
+
+            self.assertEqual(1, len(links))
+            self.assertIsNotNone(links.long_for("cand-1"))
+            self.assertEqual(before, links.log_path.read_bytes())
+            self.assertFalse(links.snapshot_path.exists())
+
+            links.append([_link("cand-2", "long-2")])
+            self.assertEqual(["cand-1", "cand-2"], [item["candidate_memory_id"] for item in links.links()])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from pathlib import Path
+import tempfile
+import unittest
+
+from src.memory.long_memory_index import LongMemoryIndex
+from src.memory.long_memory_index import tokenize
+from src.memory.memory_store import MemoryStore
+
+
+def _promote(store: MemoryStore, memory_id: str, content: str, refs: list[str]) -> str:
+    store.create_record(memory_tier="candidate", content=content, evidence_refs=refs, memory_id=memory_id)
+    return store.promote_candidate_to_long(memory_id).memory_id
+
+
+class LongMemoryIndexTest(unittest.TestCase):
+    def test_tokenize_splits_words_and_cjk_bigrams(self) -> None:
+        self.assertEqual({"uart", "timeout", "trace", "captured"}, tokenize("UART timeout: trace.captured"))
+        self.assertTrue({"看門", "門狗", "看門狗"} <= tokenize("看門狗"))
+
+    def test_promotion_updates_index_across_runs(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            run_root = Path(tmp_dir) / "runs"
+            first = MemoryStore(run_root=run_root, run_id="run-a")
+            second = MemoryStore(run_root=run_root, run_id="run-b")
+            long_a = _promote(first, "cand-a", "watchdog reset after uart timeout", ["trace.captured"])
+            long_b = _promote(second, "cand-b", "uart timeout during flash erase", ["gdb.core"])
+
+            index = LongMemoryIndex.for_run_root(run_root)
+            hits = index.search("UART timeout")
+            self.assertEqual({("run-a", long_a), ("run-b", long_b)}, {(hit.run_id, hit.memory_id) for hit in hits})
+            self.assertEqual([long_b], [hit.memory_id for hit in index.search("uart", evidence_refs=["gdb.core"])])
+            self.assertEqual([], index.search("watchdog", evidence_refs=["gdb.core"]))
+            self.assertEqual([], index.search(""))
+
+            _promote(first, "cand-c", "watchdog bite in idle loop", ["trace.captured"])
+            self.assertEqual(2, len(index.search("watchdog")))
+
+    def test_compact_survives_reload(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            run_root = Path(tmp_dir) / "runs"
+            store = MemoryStore(run_root=run_root, run_id="run-a")
+            first = _promote(store, "cand-a", "dma overrun on spi bus", ["trace.captured"])
+
+            index = LongMemoryIndex.for_run_root(run_root)
+            index.compact()
+            self.assertEqual(0, index.log_path.stat().st_size)
+            second = _promote(store, "cand-b", "dma descriptor corruption", ["trace.captured"])
+
+            reloaded = LongMemoryIndex.for_run_root(run_root)
+            self.assertEqual({first, second}, {hit.memory_id for hit in reloaded.search("dma")})
+            self.assertEqual(2, len(reloaded))
+
+    def test_rebuild_indexes_existing_long_records(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            run_root = Path(tmp_dir) / "runs"
+            store = MemoryStore(run_root=run_root, run_id="run-a")
+            store.create_record(memory_tier="long", content="legacy long record", evidence_refs=["e-1"])
+
+            index = LongMemoryIndex.for_run_root(run_root)
+            self.assertEqual([], index.search("legacy"))
+            self.assertEqual(1, index.rebuild(run_root))
+            self.assertEqual(1, len(LongMemoryIndex.for_run_root(run_root).search("legacy", evidence_refs=["e-1"])))
+
+    def test_queries_leave_files_untouched_and_appends_repair_torn_tail(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            run_root = Path(tmp_dir) / "runs"
+            store = MemoryStore(run_root=run_root, run_id="run-a")
+            first = _promote(store, "cand-a", "brownout during flash write", ["trace.captured"])
+            index = LongMemoryIndex.for_run_root(run_root)
+            with index.log_path.open("a", encoding="utf-8") as file:
+                file.write('{"op": "upsert", "rec')
+            before = index.log_path.read_bytes()
+
+            self.assertEqual([first], [hit.memory_id for hit in index.search("brownout")])
+            self.assertIsNotNone(index.find_near_duplicate("brownout during flash write"))
+            self.assertEqual(before, index.log_path.read_bytes())
+            self.assertFalse(index.snapshot_path.exists())
+
+            second = _promote(store, "cand-b", "brownout in deep sleep", ["trace.captured"])
+            self.assertEqual({first, second}, {hit.memory_id for hit in index.search("brownout")})
+            self.assertEqual(2, len(LongMemoryIndex.for_run_root(run_root)))
+
+    def test_records_without_words_never_dedup(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            run_root = Path(tmp_dir) / "runs"
+            store = MemoryStore(run_root=run_root, run_id="run-a")
+            _promote(store, "cand-a", "---", ["trace.captured"])
+            store.create_record("candidate", "!!!", ["uart.log"], memory_id="cand-b")
+            second = store.promote_candidate_to_long("cand-b", dedup_threshold=0.8)
+
+            self.assertEqual("cand-b", second.promoted_from)
+            self.assertEqual(2, len(store.list_records(memory_tier="long")))
+            self.assertIsNone(store.long_index.find_near_duplicate("..."))
+            self.assertEqual(2, len(LongMemoryIndex.for_run_root(run_root)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from datetime import datetime, UTC
+import os
+from pathlib import Path
+import tempfile
+import unittest
+
+from src.memory.lifecycle import MemoryLifecycleManager
+from src.memory.lifecycle import RetentionPolicy
+from src.memory.memory_store import MemoryStore
+
+_NOW = 1_000_000.0
+
+
+def _create(
+    store: MemoryStore,
+    tier: str,
+    memory_id: str,
+    content: str,
+    last_used: float,
+    created: float | None = None,
+) -> None:
+    record = store.create_record(tier, content, ["trace.captured"], memory_id=memory_id)
+    created_at = datetime.fromtimestamp(last_used if created is None else created, UTC).isoformat()
+    path = store._record_path(tier, memory_id)
+    path.write_bytes(store.encode_record(replace(record, created_at=created_at)))
+    os.utime(path, (last_used, last_used))
+
+
+class MemoryLifecycleManagerTest(unittest.TestCase):
+    def test_count_limit_evicts_least_recently_used_first(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = MemoryStore(run_root=Path(tmp_dir), run_id="run-gc")
+            for index, memory_id in enumerate(("w-old", "w-mid", "w-new")):
+                _create(store, "working", memory_id, f"working note {memory_id}", _NOW - 300 + index * 100)
+
+            # Reading bumps recency, so the oldest record is no longer the first to go.
+            store.get_record("w-old")
+            manager = MemoryLifecycleManager(policies={"working": RetentionPolicy(max_count=2)})
+            report = manager.collect(store)
+
+            self.assertEqual(["w-mid"], report.tiers[1].evicted)
+            remaining = {record.memory_id for record in store.list_records(memory_tier="working")}
+            self.assertEqual({"w-old", "w-new"}, remaining)
+            self.assertTrue((Path(tmp_dir) / "run-gc" / "index" / "memory-gc.jsonl").exists())
+
+    def test_age_counts_from_creation_not_last_read(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = MemoryStore(run_root=Path(tmp_dir), run_id="run-gc")
+            _create(store, "working", "w-read-often", "working note", _NOW - 60, created=_NOW - 10 * 86400)
+            _create(store, "working", "w-fresh", "working note", _NOW - 86400, created=_NOW - 86400)
+
+            manager = MemoryLifecycleManager(policies={"working": RetentionPolicy(max_age_s=7 * 86400)})
+            report = manager.collect(store, now=_NOW)
+
+            self.assertEqual(["w-read-often"], report.tiers[1].evicted)
+            self.assertEqual(["w-fresh"], [record.memory_id for record in store.list_records(memory_tier="working")])
+
+    def test_referenced_records_are_protected(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = MemoryStore(run_root=Path(tmp_dir), run_id="run-gc")
+            _create(store, "raw", "raw-kept", "uart timeout trace", _NOW - 10 * 86400)
+            _create(store, "raw", "raw-dropped", "spi idle trace", _NOW - 10 * 86400)
+            store.create_record(memory_tier="candidate", content="uart timeout", evidence_refs=["raw-kept"])
+
+            manager = MemoryLifecycleManager(policies={"raw": RetentionPolicy(max_age_s=86400)})
+            report = manager.collect(store, now=_NOW)
+
+            self.assertEqual(1, report.tiers[0].protected)
+            self.assertEqual(["raw-dropped"], report.tiers[0].evicted)
+            self.assertEqual(["raw-kept"], [record.memory_id for record in store.list_records(memory_tier="raw")])
+
+    def test_evicted_raw_records_compact_into_working_summary(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = MemoryStore(run_root=Path(tmp_dir), run_id="run-gc")
+            for index in range(4):
+                _create(store, "raw", f"raw-{index}", "ERROR uart timeout", _NOW - 10 * 86400)
+
+            manager = MemoryLifecycleManager(policies={"raw": RetentionPolicy(max_age_s=86400)})
+            report = manager.collect(store, now=_NOW)
+
+            self.assertEqual([], store.list_records(memory_tier="raw"))
+            summary = store.get_record(report.summary_memory_id)
+            self.assertEqual("working", summary.memory_tier)
+            self.assertEqual("raw-compaction", summary.promoted_from)
+            self.assertIn("ERROR", summary.content)
+            self.assertEqual(("trace.captured",), summary.evidence_refs)
+            self.assertEqual(report.tiers[0].bytes_reclaimed, report.bytes_reclaimed)
+            self.assertEqual(store.record_size("working", summary.memory_id), report.summary_bytes)
+
+    def test_dry_run_reports_without_deleting(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = MemoryStore(run_root=Path(tmp_dir), run_id="run-gc")
+            for index in range(3):
+                _create(store, "raw", f"raw-{index}", f"trace line {index}", _NOW - 10 * 86400)
+
+            manager = MemoryLifecycleManager(policies={"raw": RetentionPolicy(max_age_s=86400)})
+            report = manager.collect(store, dry_run=True, now=_NOW)
+
+            self.assertEqual(3, len(report.tiers[0].evicted))
+            self.assertEqual("", report.summary_memory_id)
+            self.assertGreater(report.summary_bytes, 0)
+            self.assertEqual(3, len(store.list_records(memory_tier="raw")))
+            self.assertEqual([], store.list_records(memory_tier="working"))
+            self.assertFalse((Path(tmp_dir) / "run-gc" / "index" / "memory-gc.jsonl").exists())
+
+            # The estimate matches what a real run then writes for the same records.
+            self.assertEqual(report.summary_bytes, manager.collect(store, now=_NOW).summary_bytes)
+
+
+if __name__ == "__main__":
+    unittest.main()
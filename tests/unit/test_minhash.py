@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import unittest
+
+from src.memory.minhash import LshIndex
+from src.memory.minhash import MinHasher
+from src.memory.minhash import estimate_jaccard
+from src.memory.minhash import shingles
+
+
+class MinHashTest(unittest.TestCase):
+    def test_shingles_normalize_case_and_punctuation(self) -> None:
+        self.assertEqual(shingles("Watchdog RESET!"), shingles("watchdog   reset"))
+        self.assertEqual({"irq"}, shingles("IRQ"))
+        self.assertEqual(set(), shingles("  "))
+
+    def test_signatures_are_deterministic_and_track_similarity(self) -> None:
+        hasher = MinHasher(num_perm=64)
+        base = hasher.signature("watchdog reset caused by uart rx timeout in boot stage")
+        near = hasher.signature("Watchdog reset caused by UART RX timeout in boot stage.")
+        edited = hasher.signature("watchdog reset caused by uart rx timeout in early boot stage")
+        other = hasher.signature("dma descriptor ring corrupted after spi flash erase")
+
+        text = "watchdog reset caused by uart rx timeout in boot stage"
+        self.assertEqual(base, MinHasher(num_perm=64).signature(text))
+        self.assertEqual(1.0, estimate_jaccard(base, near))
+        self.assertGreater(estimate_jaccard(base, edited), 0.6)
+        self.assertLess(estimate_jaccard(base, other), 0.2)
+        self.assertIsNone(hasher.signature("--- !!!"))
+
+    def test_lsh_returns_only_colliding_keys(self) -> None:
+        hasher = MinHasher(num_perm=64)
+        index = LshIndex(bands=16, rows=4)
+        signature = hasher.signature("null pointer dereference in i2c driver probe")
+        index.add("a", signature)
+        index.add("b", hasher.signature("clock gating glitch during suspend resume"))
+
+        self.assertEqual({"a"}, index.candidates(hasher.signature("null pointer dereference in i2c driver probe()")))
+        index.remove("a", signature)
+        self.assertEqual(set(), index.candidates(signature))
+        with self.assertRaises(ValueError):
+            index.candidates(signature[:8])
+
+
+if __name__ == "__main__":
+    unittest.main()
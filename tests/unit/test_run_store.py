@@ -1,12 +1,21 @@
 from __future__ import annotations
 
+import json
 from pathlib import Path
 import tempfile
 import unittest
 
+from src.core.run_store import append_consensus_record
+from src.core.run_store import close_event_writers
+from src.core.run_store import consensus_record_count
 from src.core.run_store import create_run
+from src.core.run_store import latest_consensus_record
+from src.core.run_store import load_consensus_records
 from src.core.run_store import load_run
+from src.core.run_store import load_transition_audits
+from src.core.run_store import replay_runs
 from src.core.run_store import run_event_count
+from src.core.run_store import run_events_path
 from src.core.run_store import transition_run
 from src.core.state_machine import CorePhase
 
@@ -38,6 +47,129 @@ class RunStoreTest(unittest.TestCase):
             self.assertEqual("REPORT", loaded_payload["state"])
             self.assertGreaterEqual(run_event_count(run_root, "run-test-001"), 2)
 
+    def test_repeated_stop_is_a_no_op(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            run_root = Path(tmp_dir) / "runs"
+            create_run(project_name="IntelliDbgKit", target_id="board-01", run_root=run_root, run_id="run-test-006")
+            first = transition_run(run_root, "run-test-006", CorePhase.REPORT, "unit stop")
+            events_after_first = run_event_count(run_root, "run-test-006")
+
+            second = transition_run(run_root, "run-test-006", CorePhase.REPORT, "unit stop again")
+            self.assertEqual("REPORT", second["state"])
+            self.assertEqual(first["finished_at"], second["finished_at"])
+            self.assertEqual(["unit stop"], [item.reason for item in load_transition_audits(run_root, "run-test-006")])
+            self.assertEqual(events_after_first, run_event_count(run_root, "run-test-006"))
+
+    def test_event_sequence_recovers_after_stale_sidecar_and_torn_line(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            run_root = Path(tmp_dir) / "runs"
+            create_run(
+                project_name="IntelliDbgKit",
+                target_id="board-01",
+                run_root=run_root,
+                run_id="run-test-002",
+            )
+            events_file = run_events_path(run_root, "run-test-002")
+            seq_file = run_root / "run-test-002" / "index" / "event-seq.json"
+            stale_seq = seq_file.read_text(encoding="utf-8")
+
+            transition_run(run_root, "run-test-002", CorePhase.MONITOR, "unit monitor")
+            close_event_writers()
+            seq_file.write_text(stale_seq, encoding="utf-8")
+            with events_file.open("a", encoding="utf-8") as file:
+                file.write('{"event_id": "torn"')
+
+            self.assertEqual(2, run_event_count(run_root, "run-test-002"))
+            # Counting is read-only: the torn tail and the stale sidecar are left for the writer to repair.
+            self.assertTrue(events_file.read_text(encoding="utf-8").endswith('{"event_id": "torn"'))
+            self.assertEqual(stale_seq, seq_file.read_text(encoding="utf-8"))
+            transition_run(run_root, "run-test-002", CorePhase.REPORT, "unit stop")
+            lines = events_file.read_text(encoding="utf-8").splitlines()
+            self.assertEqual(3, len(lines))
+            event_ids = [json.loads(line)["event_id"] for line in lines]
+            self.assertEqual(["run-test-002-e1", "run-test-002-e2", "run-test-002-e3"], event_ids)
+            self.assertEqual(3, run_event_count(run_root, "run-test-002"))
+
+    def test_consensus_log_indexes_latest_non_vetoed_record(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            run_root = Path(tmp_dir) / "runs"
+            index_dir = run_root / "run-test-003" / "index"
+            index_dir.mkdir(parents=True)
+            legacy = [{"consensus_id": "c-legacy", "vetoed": False}]
+            (index_dir / "consensus.json").write_text(json.dumps(legacy), encoding="utf-8")
+            self.assertEqual("c-legacy", latest_consensus_record(run_root, "run-test-003")["consensus_id"])
+
+            append_consensus_record(run_root, "run-test-003", {"consensus_id": "c-1", "vetoed": False})
+            output = append_consensus_record(run_root, "run-test-003", {"consensus_id": "c-2", "vetoed": True})
+            self.assertEqual("consensus.jsonl", output.name)
+            self.assertEqual("c-1", latest_consensus_record(run_root, "run-test-003")["consensus_id"])
+            latest = latest_consensus_record(run_root, "run-test-003", include_vetoed=True)
+            self.assertEqual("c-2", latest["consensus_id"])
+            self.assertEqual(3, consensus_record_count(run_root, "run-test-003"))
+
+            (index_dir / "consensus.idx.json").unlink()
+            with output.open("a", encoding="utf-8") as file:
+                file.write(json.dumps({"consensus_id": "c-3", "vetoed": False}) + "\n")
+                file.write('{"consensus_id": "c-torn"')
+            self.assertEqual("c-3", latest_consensus_record(run_root, "run-test-003")["consensus_id"])
+            records = load_consensus_records(run_root, "run-test-003")
+            self.assertEqual(["c-legacy", "c-1", "c-2", "c-3"], [item["consensus_id"] for item in records])
+            self.assertEqual(4, consensus_record_count(run_root, "run-test-003"))
+            # Readers neither truncate the torn tail nor rewrite the index; the next append repairs both.
+            self.assertTrue(output.read_text(encoding="utf-8").endswith('{"consensus_id": "c-torn"'))
+            self.assertFalse((index_dir / "consensus.idx.json").exists())
+            append_consensus_record(run_root, "run-test-003", {"consensus_id": "c-4", "vetoed": False})
+            records = load_consensus_records(run_root, "run-test-003")
+            self.assertEqual(["c-legacy", "c-1", "c-2", "c-3", "c-4"], [item["consensus_id"] for item in records])
+            self.assertTrue((index_dir / "consensus.idx.json").exists())
+
+    def test_transitions_use_append_log_and_compact_checkpoint(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            run_root = Path(tmp_dir) / "runs"
+            create_run(project_name="IntelliDbgKit", target_id="board-01", run_root=run_root, run_id="run-test-004")
+            for _ in range(3):
+                transition_run(run_root, "run-test-004", CorePhase.MONITOR, "watch")
+                transition_run(run_root, "run-test-004", CorePhase.DETECT, "anomaly")
+            run_path = run_root / "run-test-004" / "index" / "run.json"
+            core_state = json.loads(run_path.read_text(encoding="utf-8"))["core_state"]
+            self.assertNotIn("audits", core_state)
+            self.assertEqual(6, core_state["checkpoint"]["transition_count"])
+            self.assertEqual("DETECT", core_state["checkpoint"]["last_transition"]["to_phase"])
+
+            log_path = run_root / "run-test-004" / "index" / "transitions.jsonl"
+            with log_path.open("a", encoding="utf-8") as file:
+                file.write('{"from_phase": "DETECT", "to_phase": "FAILED", "reason": "uncommitted", "at": ""}\n')
+            self.assertEqual(6, len(load_transition_audits(run_root, "run-test-004")))
+            transition_run(run_root, "run-test-004", CorePhase.REPORT, "done")
+            audits = load_transition_audits(run_root, "run-test-004")
+            self.assertEqual(7, len(audits))
+            self.assertEqual(["watch", "anomaly"], [item.reason for item in audits[:2]])
+            self.assertEqual("done", audits[-1].reason)
+
+            result = replay_runs(run_root)["run-test-004"]
+            self.assertTrue(result.valid, result.error)
+            self.assertEqual(CorePhase.REPORT, result.phase)
+            self.assertEqual(7, result.transition_count)
+
+    def test_legacy_embedded_audits_migrate_to_log(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            run_root = Path(tmp_dir) / "runs"
+            create_run(project_name="IntelliDbgKit", target_id="board-01", run_root=run_root, run_id="run-test-005")
+            run_path = run_root / "run-test-005" / "index" / "run.json"
+            payload = json.loads(run_path.read_text(encoding="utf-8"))
+            payload["state"] = "MONITOR"
+            payload["core_state"] = {
+                "phase": "MONITOR",
+                "audits": [{"from_phase": "BOOTSTRAP", "to_phase": "MONITOR", "reason": "legacy", "at": ""}],
+            }
+            run_path.write_text(json.dumps(payload), encoding="utf-8")
+            self.assertEqual(["legacy"], [item.reason for item in load_transition_audits(run_root, "run-test-005")])
+
+            transition_run(run_root, "run-test-005", CorePhase.REPORT, "done")
+            audits = load_transition_audits(run_root, "run-test-005")
+            self.assertEqual(["legacy", "done"], [item.reason for item in audits])
+            self.assertEqual(2, load_run(run_root, "run-test-005")["core_state"]["checkpoint"]["transition_count"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import unittest
+
+from src.core.state_machine import CorePhase
+from src.core.state_machine import CoreStateMachine
+from src.core.state_machine import DEFAULT_TRANSITION_TABLE
+from src.core.state_machine import InvalidTransitionError
+from src.core.state_machine import TransitionAudit
+from src.core.state_machine import replay_transitions
+
+
+class CoreStateMachineTest(unittest.TestCase):
+    def test_transition_table_rejects_edges_outside_graph(self) -> None:
+        machine = CoreStateMachine()
+        self.assertTrue(machine.can_transition(CorePhase.MONITOR))
+        self.assertFalse(machine.can_transition(CorePhase.ANALYZE))
+        with self.assertRaises(InvalidTransitionError):
+            machine.transition(CorePhase.ANALYZE, "skip ahead")
+        self.assertEqual(CorePhase.BOOTSTRAP, machine.phase)
+        self.assertEqual(0, machine.transition_count)
+
+        machine.transition(CorePhase.REPORT, "stop")
+        self.assertFalse(machine.can_transition(CorePhase.MONITOR))
+        self.assertEqual((), DEFAULT_TRANSITION_TABLE.successors(CorePhase.REPORT))
+
+    def test_reachability_covers_terminal_phases(self) -> None:
+        for phase in CorePhase:
+            if phase in (CorePhase.REPORT, CorePhase.FAILED):
+                continue
+            self.assertTrue(DEFAULT_TRANSITION_TABLE.can_reach(phase, CorePhase.REPORT), phase)
+            self.assertTrue(DEFAULT_TRANSITION_TABLE.can_reach(phase, CorePhase.FAILED), phase)
+        self.assertTrue(DEFAULT_TRANSITION_TABLE.can_reach(CorePhase.MONITOR, CorePhase.RUNTIME_PATCH_TEST))
+        self.assertFalse(DEFAULT_TRANSITION_TABLE.can_reach(CorePhase.REPORT, CorePhase.MONITOR))
+        self.assertFalse(DEFAULT_TRANSITION_TABLE.can_reach(CorePhase.MONITOR, CorePhase.BOOTSTRAP))
+
+    def test_replay_stops_at_first_invalid_record(self) -> None:
+        records = [
+            {"from_phase": "BOOTSTRAP", "to_phase": "MONITOR"},
+            {"from_phase": "MONITOR", "to_phase": "DETECT"},
+            {"from_phase": "DETECT", "to_phase": "REPRODUCE"},
+        ]
+        result = replay_transitions(records)
+        self.assertTrue(result.valid)
+        self.assertEqual(CorePhase.REPRODUCE, result.phase)
+        self.assertEqual(3, result.transition_count)
+
+        broken = replay_transitions(records + [{"from_phase": "MONITOR", "to_phase": "DETECT"}])
+        self.assertFalse(broken.valid)
+        self.assertEqual(CorePhase.REPRODUCE, broken.phase)
+        self.assertIn("record 3", broken.error)
+
+    def test_snapshot_is_constant_size_and_loads_audits_lazily(self) -> None:
+        machine = CoreStateMachine()
+        machine.transition(CorePhase.MONITOR, "watch")
+        snapshot = machine.snapshot()
+        persisted = machine.drain_pending_audits()
+        loads: list[int] = []
+
+        def loader() -> list[TransitionAudit]:
+            loads.append(1)
+            return persisted
+
+        restored = CoreStateMachine.from_snapshot(snapshot, audit_loader=loader)
+        restored.transition(CorePhase.DETECT, "anomaly")
+        self.assertEqual(2, restored.transition_count)
+        self.assertEqual([], loads)
+        self.assertEqual(["watch", "anomaly"], [item.reason for item in restored.audits])
+        self.assertEqual(1, len(loads))
+
+
+if __name__ == "__main__":
+    unittest.main()
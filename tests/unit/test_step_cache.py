@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from pathlib import Path
+import tempfile
+import unittest
+
+from src.core.step_cache import StepCache
+from src.core.step_cache import step_cache_key
+from src.core.workflow_runtime import run_workflow
+
+
+class StepCacheTest(unittest.TestCase):
+    def test_key_depends_on_version_and_inputs(self) -> None:
+        base = step_cache_key("collector.trace", "normalize", "1.0", {"evidence": ["a"], "event_range": [0, 10]})
+        same = step_cache_key("collector.trace", "normalize", "1.0", {"event_range": [0, 10], "evidence": ["a"]})
+        self.assertEqual(base, same)
+        self.assertNotEqual(base, step_cache_key("collector.trace", "normalize", "1.1", {"evidence": ["a"]}))
+        self.assertNotEqual(
+            base,
+            step_cache_key("collector.trace", "normalize", "1.0", {"evidence": ["a"], "event_range": [0, 11]}),
+        )
+
+    def test_lru_eviction_and_persistence(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = StepCache.for_run_root(Path(tmp_dir), max_entries=2)
+            cache.put("k1", {"outputs": ["one"]})
+            cache.put("k2", {"outputs": ["two"]})
+            self.assertEqual({"outputs": ["one"]}, cache.get("k1"))
+            cache.put("k3", {"outputs": ["three"]})
+            self.assertIsNone(cache.get("k2"))
+            self.assertEqual(1, cache.evictions)
+            cache.flush()
+
+            reopened = StepCache.for_run_root(Path(tmp_dir), max_entries=2)
+            self.assertEqual(2, reopened.entry_count)
+            self.assertEqual({"outputs": ["three"]}, reopened.get("k3"))
+            self.assertIsNone(reopened.get("k2"))
+
+    def test_size_bound_evicts_and_rejects_oversized_values(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = StepCache(Path(tmp_dir) / "steps", max_bytes=64)
+            self.assertFalse(cache.put("huge", {"outputs": ["x" * 100]}))
+            cache.put("a", {"outputs": ["a" * 20]})
+            cache.put("b", {"outputs": ["b" * 20]})
+            self.assertLessEqual(cache.total_bytes, 64)
+            self.assertEqual(1, cache.entry_count)
+            self.assertIsNone(cache.get("a"))
+
+    def test_run_workflow_reports_hits_and_misses(self) -> None:
+        definition = {
+            "workflow_id": "cache-flow",
+            "steps": [
+                {"step_id": "norm", "name": "norm", "plugin_ref": "codec.normalize", "action": "normalize"},
+                {"step_id": "rc", "name": "rc", "plugin_ref": "analyzer.root_cause", "action": "analyze"},
+            ],
+        }
+        calls: list[str] = []
+
+        def runner(step: dict, context: dict) -> dict:
+            calls.append(step["step_id"])
+            return {"evidence": [f"{step['step_id']}.done"], "outputs": [f"note:{step['step_id']}"]}
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = StepCache.for_run_root(Path(tmp_dir))
+            options = {"step_runner": runner, "step_cache": cache, "cache_inputs": {"event_range": [0, 42]}}
+            first = run_workflow(definition, "run-1", **options)
+            self.assertEqual(["miss", "miss"], [item["cache"] for item in first["steps"]])
+            second = run_workflow(definition, "run-2", **options)
+            self.assertEqual(["hit", "hit"], [item["cache"] for item in second["steps"]])
+            self.assertEqual(["note:norm"], second["steps"][0]["outputs"])
+            self.assertEqual({"hits": 2, "misses": 0}, second["cache"])
+            self.assertEqual(["norm", "rc"], calls)
+
+            third = run_workflow(definition, "run-3", plugin_versions={"codec.normalize": "2"}, **options)
+            self.assertEqual(["miss", "hit"], [item["cache"] for item in third["steps"]])
+            self.assertEqual(["norm", "rc", "norm"], calls)
+
+    def test_cache_key_ignores_unrelated_sibling_evidence(self) -> None:
+        steps = {
+            step_id: {"step_id": step_id, "name": step_id, "plugin_ref": f"p.{step_id}", "action": "run", **extra}
+            for step_id, extra in (
+                ("collect", {}),
+                ("sibling", {"depends_on": []}),
+                ("analyze", {"depends_on": ["collect"]}),
+            )
+        }
+
+        def runner(step: dict, context: dict) -> dict:
+            return {"evidence": [f"{step['step_id']}.done"]}
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = StepCache.for_run_root(Path(tmp_dir))
+            sibling_first = {"workflow_id": "dag", "steps": [steps["collect"], steps["sibling"], steps["analyze"]]}
+            sibling_last = {"workflow_id": "dag", "steps": [steps["collect"], steps["analyze"], steps["sibling"]]}
+            options = {"step_runner": runner, "step_cache": cache}
+            run_workflow(sibling_first, "run-1", evidence={"trace.captured"}, **options)
+            second = run_workflow(sibling_last, "run-2", evidence={"trace.captured"}, **options)
+            self.assertEqual(["hit", "hit", "hit"], [item["cache"] for item in second["steps"]])
+
+            third = run_workflow(sibling_last, "run-3", evidence={"uart.log"}, **options)
+            self.assertEqual(["miss", "miss", "miss"], [item["cache"] for item in third["steps"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import unittest
+
+from src.core.workflow_guards import GuardContext
+from src.core.workflow_guards import GuardSyntaxError
+from src.core.workflow_guards import _compile_guard_table
+from src.core.workflow_guards import compile_guard
+from src.core.workflow_guards import compile_guards
+from src.core.workflow_runtime import WorkflowError
+from src.core.workflow_runtime import run_workflow
+
+
+class WorkflowGuardTest(unittest.TestCase):
+    def _check(self, expression: str, context: GuardContext) -> bool:
+        return compile_guard("g-test", expression).evaluate(context)
+
+    def test_predicates_and_boolean_operators(self) -> None:
+        context = GuardContext.from_events(
+            [{"tool": "uart", "severity": "error"}, {"tool": "tracezone", "severity": "info"}],
+            evidence={"trace.captured", "trace.normalized", "uart.log"},
+            phase="ANALYZE",
+        )
+        self.assertTrue(self._check("has_evidence:trace.captured", context))
+        self.assertTrue(self._check("has_evidence(uart.log) and not has_evidence:gdb.core", context))
+        self.assertTrue(self._check("count_evidence >= 3", context))
+        self.assertTrue(self._check('count_evidence("trace.") == 2', context))
+        self.assertFalse(self._check("count_evidence > 3", context))
+        self.assertTrue(self._check("phase in (DETECT, ANALYZE)", context))
+        self.assertFalse(self._check("phase not in (ANALYZE)", context))
+        self.assertTrue(self._check("event_seen(tool=uart, severity=error)", context))
+        self.assertFalse(self._check("event_seen(tool=tracezone, severity=error)", context))
+        self.assertTrue(self._check("event_seen(severity=info)", context))
+        self.assertTrue(self._check("false or (phase == ANALYZE and has_evidence:uart.log)", context))
+
+    def test_syntax_errors_name_the_guard(self) -> None:
+        for expression in ("", "has_evidence:", "count_evidence >= many", "phase in (A", "event_seen(pid=1)", "x"):
+            with self.assertRaises(GuardSyntaxError) as raised:
+                compile_guard("g-bad", expression)
+            self.assertIn("g-bad", str(raised.exception))
+
+    def test_guards_compiled_once_per_guard_list(self) -> None:
+        definition = {
+            "workflow_id": "guard-cache-flow",
+            "version": "1.0.0",
+            "guards": [{"guard_id": "g-1", "expression": "has_evidence:a", "reason": "missing a"}],
+        }
+        first = compile_guards(definition)
+        self.assertIs(first, compile_guards(dict(definition)))
+        edited = {**definition, "guards": [{"guard_id": "g-1", "expression": "has_evidence:b"}]}
+        self.assertIsNot(first, compile_guards(edited))
+        reworded = {
+            **definition,
+            "guards": [{"guard_id": "g-1", "expression": "has_evidence:a", "reason": "need a", "on_block": "skip"}],
+        }
+        guard = compile_guards(reworded)["g-1"]
+        self.assertEqual(("need a", "skip"), (guard.reason, guard.on_block))
+
+        for index in range(300):
+            compile_guards({"guards": [{"guard_id": "g-1", "expression": f"has_evidence:e-{index}"}]})
+        self.assertLessEqual(_compile_guard_table.cache_info().currsize, 256)
+
+    def test_run_workflow_uses_phase_and_events(self) -> None:
+        definition = {
+            "workflow_id": "guarded-flow",
+            "version": "1.0.0",
+            "steps": [
+                {"step_id": "s1", "name": "s1", "plugin_ref": "p", "action": "a", "guards": ["g-uart"]},
+            ],
+            "guards": [
+                {
+                    "guard_id": "g-uart",
+                    "expression": "phase in (MONITOR, DETECT) and event_seen(tool=uart)",
+                    "reason": "no uart events",
+                },
+            ],
+        }
+        events = [{"tool": "uart", "severity": "warn"}]
+        self.assertEqual("success", run_workflow(definition, "run-1", phase="DETECT", events=events)["status"])
+        blocked = run_workflow(definition, "run-1", phase="DETECT")
+        self.assertEqual("no uart events", blocked["blocked_reason"])
+
+        broken = {**definition, "version": "2.0.0", "guards": [{"guard_id": "g-uart", "expression": "phase in"}]}
+        with self.assertRaises(WorkflowError):
+            run_workflow(broken, "run-1")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from time import sleep
+import unittest
+
+from src.core.workflow_profile import folded_stacks
+from src.core.workflow_profile import profile_steps
+from src.core.workflow_runtime import run_workflow
+
+
+def _definition() -> dict:
+    return {
+        "workflow_id": "profile-flow",
+        "steps": [
+            {"step_id": "capture", "name": "capture", "plugin_ref": "collector.uart", "action": "capture"},
+            {"step_id": "decode", "name": "decode", "plugin_ref": "codec.trace", "action": "decode"},
+        ],
+    }
+
+
+def _runner(step: dict, context: dict) -> dict:
+    if step["step_id"] == "capture":
+        sleep(0.02)
+        return {}
+    sum(range(20000))
+    return {"io_ms": 0.5}
+
+
+class WorkflowProfileTest(unittest.TestCase):
+    def test_steps_carry_timing_breakdown(self) -> None:
+        output = run_workflow(_definition(), "run-1", step_runner=_runner)
+        capture, decode = output["steps"]
+        self.assertEqual({"wall_ms", "cpu_ms", "guard_ms", "io_ms"}, set(capture["timing"]))
+        self.assertGreaterEqual(capture["timing"]["wall_ms"], 15.0)
+        self.assertGreaterEqual(capture["timing"]["io_ms"], 15.0)
+        self.assertEqual(0.5, decode["timing"]["io_ms"])
+        self.assertGreaterEqual(output["timing"]["wall_ms"], capture["timing"]["wall_ms"])
+
+    def test_profile_ranks_hot_steps_and_exports_folded_stacks(self) -> None:
+        records = [run_workflow(_definition(), f"run-{index}", step_runner=_runner) for index in range(2)]
+        profiles = profile_steps(records)
+        self.assertEqual(["capture", "decode"], [item.step_id for item in profiles])
+        self.assertEqual(2, profiles[0].runs)
+        self.assertGreaterEqual(profiles[0].max_wall_ms, profiles[0].mean_wall_ms)
+
+        lines = folded_stacks(records)
+        stacks = {line.rsplit(" ", 1)[0]: int(line.rsplit(" ", 1)[1]) for line in lines}
+        self.assertIn("profile-flow;capture;collector.uart:capture;io", stacks)
+        self.assertEqual(1000, stacks["profile-flow;decode;codec.trace:decode;io"])
+        self.assertTrue(all(value > 0 for value in stacks.values()))
+
+
+if __name__ == "__main__":
+    unittest.main()
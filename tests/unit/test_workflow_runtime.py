@@ -1,7 +1,16 @@
 from __future__ import annotations
 
+import json
+import os
+from pathlib import Path
+import tempfile
+import threading
 import unittest
 
+from src.core.run_store import append_workflow_checkpoint
+from src.core.run_store import load_workflow_checkpoint
+from src.core.workflow_runtime import WorkflowError
+from src.core.workflow_runtime import WorkflowRegistry
 from src.core.workflow_runtime import list_workflows
 from src.core.workflow_runtime import load_workflow_definition
 from src.core.workflow_runtime import run_workflow
@@ -29,5 +38,173 @@ class WorkflowRuntimeTest(unittest.TestCase):
         self.assertEqual("", output["blocked_reason"])
 
 
+def _dag_definition(steps: list[dict]) -> dict:
+    return {
+        "workflow_id": "dag-flow",
+        "steps": [
+            {"name": item["step_id"], "plugin_ref": "collector.test", "action": "capture", **item} for item in steps
+        ],
+        "guards": [
+            {"guard_id": "g-uart", "expression": "has_evidence:uart.captured", "reason": "missing uart"},
+        ],
+    }
+
+
+class WorkflowDagTest(unittest.TestCase):
+    def test_independent_steps_overlap_and_feed_downstream_guards(self) -> None:
+        definition = _dag_definition(
+            [
+                {"step_id": "uart", "depends_on": []},
+                {"step_id": "trace", "depends_on": []},
+                {"step_id": "merge", "depends_on": ["uart", "trace"], "guards": ["g-uart"]},
+            ]
+        )
+        barrier = threading.Barrier(2, timeout=5)
+
+        def runner(step: dict, context: dict) -> dict:
+            if step["step_id"] in ("uart", "trace"):
+                barrier.wait()
+            return {"evidence": [f"{step['step_id']}.captured"]}
+
+        output = run_workflow(definition, "run-test-001", step_runner=runner, max_workers=4)
+        self.assertEqual("success", output["status"])
+        self.assertEqual(["uart", "trace", "merge"], [item["step_id"] for item in output["steps"]])
+        merge = output["steps"][2]
+        self.assertGreaterEqual(merge["started_at"], output["steps"][0]["finished_at"])
+        self.assertEqual(["uart.captured"], output["steps"][0]["evidence"])
+
+    def test_blocked_step_halts_downstream(self) -> None:
+        definition = _dag_definition(
+            [
+                {"step_id": "trace", "depends_on": []},
+                {"step_id": "merge", "depends_on": ["trace"], "guards": ["g-uart"]},
+                {"step_id": "report", "depends_on": ["merge"]},
+            ]
+        )
+        output = run_workflow(definition, "run-test-001", max_workers=2)
+        self.assertEqual("blocked", output["status"])
+        self.assertEqual("missing uart", output["blocked_reason"])
+        self.assertEqual(["trace", "merge"], [item["step_id"] for item in output["steps"]])
+
+        failed = run_workflow(
+            definition,
+            "run-test-001",
+            evidence={"uart.captured"},
+            step_runner=lambda step, context: 1 / 0,
+        )
+        self.assertEqual("failed", failed["status"])
+        self.assertIn("ZeroDivisionError", failed["blocked_reason"])
+        self.assertEqual(["trace"], [item["step_id"] for item in failed["steps"]])
+
+    def test_invalid_graph_is_rejected(self) -> None:
+        with self.assertRaises(WorkflowError):
+            run_workflow(_dag_definition([{"step_id": "a", "depends_on": ["missing"]}]), "run-test-001")
+        with self.assertRaises(WorkflowError):
+            run_workflow(
+                _dag_definition([{"step_id": "a", "depends_on": ["b"]}, {"step_id": "b", "depends_on": ["a"]}]),
+                "run-test-001",
+            )
+
+
+class WorkflowResumeTest(unittest.TestCase):
+    def test_resume_skips_checkpointed_steps_and_rechecks_guards(self) -> None:
+        definition = _dag_definition(
+            [
+                {"step_id": "uart", "depends_on": []},
+                {"step_id": "trace", "depends_on": ["uart"], "guards": ["g-uart"]},
+                {"step_id": "merge", "depends_on": ["trace"]},
+            ]
+        )
+        calls: list[str] = []
+        fail_merge = True
+
+        def runner(step: dict, context: dict) -> dict:
+            calls.append(step["step_id"])
+            if step["step_id"] == "merge" and fail_merge:
+                raise RuntimeError("collector lost")
+            return {"evidence": [f"{step['step_id']}.captured"]}
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            run_root = Path(tmp_dir) / "runs"
+
+            def checkpoint(workflow_run: dict, record: dict) -> None:
+                append_workflow_checkpoint(run_root, "run-test-001", workflow_run, record)
+
+            first = run_workflow(definition, "run-test-001", step_runner=runner, on_step=checkpoint)
+            self.assertEqual("failed", first["status"])
+            self.assertEqual(["uart", "trace", "merge"], calls)
+
+            previous = load_workflow_checkpoint(run_root, first["workflow_run_id"])
+            self.assertEqual(["success", "success", "failed"], [item["status"] for item in previous["steps"]])
+            calls.clear()
+            fail_merge = False
+            resumed = run_workflow(
+                definition,
+                "run-test-001",
+                step_runner=runner,
+                on_step=checkpoint,
+                resume_from=previous,
+            )
+            self.assertEqual("success", resumed["status"])
+            self.assertEqual(first["workflow_run_id"], resumed["workflow_run_id"])
+            self.assertEqual(["merge"], calls)
+            self.assertEqual([True, True, None], [item.get("reused") for item in resumed["steps"]])
+
+            latest = load_workflow_checkpoint(run_root, first["workflow_run_id"])
+            self.assertEqual(["success"] * 3, [item["status"] for item in latest["steps"]])
+
+    def test_resume_blocks_when_guard_no_longer_holds(self) -> None:
+        definition = _dag_definition([{"step_id": "trace", "guards": ["g-uart"]}])
+        first = run_workflow(definition, "run-test-001", evidence={"uart.captured"})
+        self.assertEqual("success", first["status"])
+        resumed = run_workflow(definition, "run-test-001", resume_from=first)
+        self.assertEqual("blocked", resumed["status"])
+        self.assertEqual("missing uart", resumed["blocked_reason"])
+
+
+class WorkflowRegistryTest(unittest.TestCase):
+    def _write(self, path: Path, workflow_id: str, name: str) -> None:
+        payload = {"workflow_id": workflow_id, "name": name, "version": "1.0.0", "steps": []}
+        path.write_text(json.dumps(payload), encoding="utf-8")
+
+    def test_extra_dir_overrides_and_revalidates_by_mtime(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            project_dir = Path(tmp_dir) / "workflows"
+            project_dir.mkdir()
+            override = project_dir / "trace.json"
+            self._write(override, "trace-capture-flow", "project trace")
+            self._write(project_dir / "local.json", "local-flow", "local")
+
+            registry = WorkflowRegistry(extra_dirs=[project_dir])
+            self.assertEqual("project trace", registry.get("trace-capture-flow")["name"])
+            self.assertIn("root-cause-flow", registry.workflow_ids())
+            self.assertIn("local-flow", registry.workflow_ids())
+            parsed = registry.parse_count
+            registry.get("local-flow")
+            self.assertEqual(parsed, registry.parse_count)
+
+            self._write(override, "trace-capture-flow", "edited trace")
+            stat = override.stat()
+            os.utime(override, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+            self.assertEqual("edited trace", registry.get("trace-capture-flow")["name"])
+            self.assertEqual(parsed + 1, registry.parse_count)
+
+            (project_dir / "local.json").unlink()
+            with self.assertRaises(WorkflowError):
+                registry.get("local-flow")
+
+    def test_persisted_cache_skips_parsing(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_path = Path(tmp_dir) / "cache" / "workflows.json"
+            first = WorkflowRegistry(cache_path=cache_path)
+            first_ids = first.workflow_ids()
+            self.assertGreater(first.parse_count, 0)
+            self.assertTrue(cache_path.exists())
+
+            second = WorkflowRegistry(cache_path=cache_path)
+            self.assertEqual(first_ids, second.workflow_ids())
+            self.assertEqual(0, second.parse_count)
+
+
 if __name__ == "__main__":
     unittest.main()